@@ -0,0 +1,225 @@
+"""
+Admission Control
+Per-route-class concurrency limits with a bounded, deadline-aware priority
+queue in front of the app, so cheap metadata calls never wait behind
+expensive batch work and overload fails fast instead of timing out.
+
+  metadata (priority 0) -- /, /api/drivers, /api/circuits, /api/model/info, docs, /admin,
+                           the OpenF1 proxy (cached, and waits on I/O rather than CPU)
+  predict  (priority 1) -- POST /api/predict, live race-weekend updates
+  batch    (priority 2) -- 2026 prediction tables, simulation, standings
+
+A request runs when its class and the global limit both have a free slot;
+otherwise it queues. Freed slots go to the highest-priority waiter first
+(FIFO within a class). Excess work is rejected with Retry-After:
+
+  429 -- the class queue is full
+  503 -- the expected queue wait already exceeds the class deadline, or the
+         request waited out its deadline
+
+    F1_API_ADMISSION=0                            disable (every request admitted)
+    F1_API_MAX_CONCURRENCY=32                     global in-flight limit
+    F1_API_ADMISSION_LIMITS=metadata=32,predict=8,batch=2
+"""
+
+import asyncio
+import heapq
+import itertools
+import math
+import os
+import time
+
+from starlette.responses import JSONResponse
+
+from profiling import record
+
+ENABLED = os.getenv('F1_API_ADMISSION', '1') != '0'
+MAX_CONCURRENCY = int(os.getenv('F1_API_MAX_CONCURRENCY', '32'))
+
+# name -> (priority, concurrency limit, queue size, max queue wait in seconds)
+ROUTE_CLASSES = {
+    'metadata': (0, 32, 64, 1.0),
+    'predict': (1, 8, 32, 2.0),
+    'batch': (2, 2, 8, 5.0),
+}
+METADATA_PATHS = {'/', '/api/drivers', '/api/circuits', '/api/model/info', '/api/admission'}
+METADATA_PREFIXES = ('/docs', '/redoc', '/openapi', '/admin', '/api/openf1')
+EWMA_ALPHA = 0.2
+
+
+def classify(method, path):
+    """Route class of a request."""
+    if path in METADATA_PATHS or path.startswith(METADATA_PREFIXES):
+        return 'metadata'
+    if path == '/api/predict' or path.startswith('/api/live'):
+        return 'predict'
+    return 'batch'
+
+
+def _parse_limits(spec):
+    """'metadata=32,predict=8' -> {'metadata': 32, 'predict': 8}."""
+    limits = {}
+    for item in filter(None, (part.strip() for part in (spec or '').split(','))):
+        name, _, value = item.partition('=')
+        limits[name.strip()] = int(value)
+    return limits
+
+
+class Rejected(Exception):
+    def __init__(self, status_code, detail, retry_after):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class RouteClass:
+    def __init__(self, name, priority, limit, queue_size, max_wait_s):
+        self.name = name
+        self.priority = priority
+        self.limit = limit
+        self.queue_size = queue_size
+        self.max_wait_s = max_wait_s
+        self.active = 0
+        self.queued = 0
+        self.service_s = 0.0  # EWMA of admitted request durations
+        self.admitted = 0
+        self.rejected = 0
+
+    def expected_wait(self, ahead):
+        """Rough seconds until a request with `ahead` queued before it gets a slot."""
+        return math.ceil((ahead + 1) / max(self.limit, 1)) * self.service_s
+
+
+class _Waiter:
+    __slots__ = ('route_class', 'future')
+
+    def __init__(self, route_class, future):
+        self.route_class = route_class
+        self.future = future
+
+
+class AdmissionController:
+    """Slot accounting and the priority queue; used from the event loop only."""
+
+    def __init__(self, classes=None, max_concurrency=MAX_CONCURRENCY):
+        self.classes = {name: RouteClass(name, *spec) for name, spec in (classes or ROUTE_CLASSES).items()}
+        self.max_concurrency = max_concurrency
+        self.active = 0
+        self._heap = []
+        self._order = itertools.count()
+
+    @classmethod
+    def from_env(cls):
+        limits = _parse_limits(os.getenv('F1_API_ADMISSION_LIMITS'))
+        classes = {name: (priority, limits.get(name, limit), queue_size, max_wait)
+                   for name, (priority, limit, queue_size, max_wait) in ROUTE_CLASSES.items()}
+        return cls(classes, MAX_CONCURRENCY)
+
+    def _has_slot(self, route_class):
+        return route_class.active < route_class.limit and self.active < self.max_concurrency
+
+    def _grant(self, route_class):
+        route_class.active += 1
+        route_class.admitted += 1
+        self.active += 1
+
+    def _retry_after(self, route_class, wait):
+        return max(1, math.ceil(max(wait, route_class.service_s)))
+
+    async def acquire(self, name):
+        """Wait for a slot of class `name`; raises Rejected when it cannot be had in time."""
+        route_class = self.classes[name]
+        # Earlier requests of the class keep their place (other classes only
+        # queue while their own class or the global limit is full, and every
+        # release hands freed slots out by priority)
+        if not route_class.queued and self._has_slot(route_class):
+            self._grant(route_class)
+            return route_class
+
+        if route_class.queued >= route_class.queue_size:
+            route_class.rejected += 1
+            raise Rejected(429, f"Too many queued {name} requests",
+                           self._retry_after(route_class, route_class.expected_wait(route_class.queued)))
+        wait = route_class.expected_wait(route_class.queued)
+        if wait > route_class.max_wait_s:
+            route_class.rejected += 1
+            raise Rejected(503, f"{name} queue wait over {route_class.max_wait_s:g}s",
+                           self._retry_after(route_class, wait))
+
+        waiter = _Waiter(route_class, asyncio.get_running_loop().create_future())
+        heapq.heappush(self._heap, (route_class.priority, next(self._order), waiter))
+        route_class.queued += 1
+        try:
+            await asyncio.wait_for(waiter.future, route_class.max_wait_s)
+        except asyncio.TimeoutError:
+            route_class.rejected += 1
+            raise Rejected(503, f"{name} request waited over {route_class.max_wait_s:g}s",
+                           self._retry_after(route_class, route_class.expected_wait(route_class.queued)))
+        except asyncio.CancelledError:
+            # Client went away; hand back a slot granted in the meantime
+            if waiter.future.done() and not waiter.future.cancelled():
+                self.release(route_class, 0.0)
+            raise
+        finally:
+            route_class.queued -= 1
+        return route_class
+
+    def release(self, route_class, duration):
+        route_class.active -= 1
+        self.active -= 1
+        route_class.service_s += EWMA_ALPHA * (duration - route_class.service_s)
+        self._dispatch()
+
+    def _dispatch(self):
+        """Hand free slots to queued requests, highest priority first."""
+        skipped = []
+        while self._heap and self.active < self.max_concurrency:
+            entry = heapq.heappop(self._heap)
+            waiter = entry[2]
+            if waiter.future.done():
+                continue  # timed out / cancelled
+            if self._has_slot(waiter.route_class):
+                self._grant(waiter.route_class)
+                waiter.future.set_result(True)
+            else:
+                skipped.append(entry)  # its class is full; lower classes may still run
+        for entry in skipped:
+            heapq.heappush(self._heap, entry)
+
+    def snapshot(self):
+        return {
+            'max_concurrency': self.max_concurrency,
+            'active': self.active,
+            'classes': {name: {'priority': c.priority, 'limit': c.limit, 'active': c.active,
+                               'queued': c.queued, 'queue_size': c.queue_size,
+                               'max_wait_s': c.max_wait_s, 'service_ms': 1000 * c.service_s,
+                               'admitted': c.admitted, 'rejected': c.rejected}
+                        for name, c in self.classes.items()},
+        }
+
+
+class AdmissionMiddleware:
+    """ASGI middleware admitting, queueing or rejecting every HTTP request."""
+
+    def __init__(self, app, controller):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope['method'] == 'OPTIONS':
+            return await self.app(scope, receive, send)
+        start = time.perf_counter()
+        try:
+            route_class = await self.controller.acquire(classify(scope['method'], scope['path']))
+        except Rejected as e:
+            response = JSONResponse({'detail': e.detail}, status_code=e.status_code,
+                                    headers={'Retry-After': str(e.retry_after)})
+            return await response(scope, receive, send)
+        record('queue', time.perf_counter() - start)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(route_class, time.perf_counter() - start)
@@ -0,0 +1,157 @@
+"""
+Live Race Weekend Hub
+Serves live_session.LiveSession over the API: grid updates from POST
+requests, WebSocket clients or a replay file are applied on the event loop
+and pushed to every subscriber of the round as two messages:
+
+  {"type": "scores", ...}      -- podium probabilities, straight after the
+                                  changed rows are rescored (a few ms)
+  {"type": "simulation", ...}  -- race odds from LIVE_SIM_DRAWS simulated
+                                  races, run in a worker thread; updates
+                                  arriving meanwhile are folded into one
+                                  follow-up run on the newest grid
+
+Each message carries the grid `version` it reflects. Subscribers that fall
+behind lose their oldest queued messages, never the newest.
+
+    F1_LIVE_SIM_DRAWS=10000      simulated races per simulation push
+"""
+
+import asyncio
+import os
+import time
+
+from live_session import REPLAY_DIR, SIM_DRAWS, LiveSession, read_replay
+
+LIVE_SIM_DRAWS = int(os.getenv('F1_LIVE_SIM_DRAWS', str(SIM_DRAWS)))
+QUEUE_SIZE = 32
+
+
+class LiveHub:
+    """Live sessions by round and their subscribers; used from the event loop only."""
+
+    def __init__(self, n_draws=LIVE_SIM_DRAWS):
+        self.n_draws = n_draws
+        self.sessions = {}
+        self.subscribers = {}   # round -> set of queues
+        self.odds = {}          # round -> latest simulation message
+        self._simulating = {}   # round -> Task
+        self._stale = set()     # rounds updated during their running simulation
+        self._replays = {}      # round -> Task
+        self._lock = asyncio.Lock()
+
+    async def session(self, round_number):
+        """The round's LiveSession, built on first use (ValueError for an unknown round)."""
+        if round_number not in self.sessions:
+            async with self._lock:
+                if round_number not in self.sessions:
+                    # Loads models and features: keep it off the event loop
+                    self.sessions[round_number] = await asyncio.to_thread(LiveSession, round_number)
+                    self._simulate(round_number)
+        return self.sessions[round_number]
+
+    # ----- messages -----
+
+    def scores_message(self, session, changed=None, rescore_s=None):
+        message = {'type': 'scores', 'round': session.round, 'circuit': session.circuit,
+                   'version': session.version, 'predictions': session.rows()}
+        if changed is not None:
+            message['changed'] = changed
+            message['rescore_ms'] = round(1000 * rescore_s, 3)
+        return message
+
+    def snapshot(self, round_number):
+        """Current scores and the latest race odds of a started session."""
+        session = self.sessions[round_number]
+        return {**self.scores_message(session), 'odds': self.odds.get(round_number)}
+
+    # ----- updates -----
+
+    async def update(self, round_number, grid):
+        """Apply {driverId: grid position}, push the new scores, queue a simulation."""
+        session = await self.session(round_number)
+        start = time.perf_counter()
+        changed = session.update(grid)
+        message = self.scores_message(session, changed, time.perf_counter() - start)
+        if changed:
+            self.publish(round_number, message)
+            self._simulate(round_number)
+        return message
+
+    async def reset(self, round_number):
+        session = await self.session(round_number)
+        return await self.update(round_number, {d: int(p) for d, p in
+                                                zip(session.drivers, session.estimated_grid)})
+
+    def _simulate(self, round_number):
+        if round_number in self._simulating:
+            self._stale.add(round_number)
+            return
+        self._simulating[round_number] = asyncio.ensure_future(self._run_simulations(round_number))
+
+    async def _run_simulations(self, round_number):
+        session = self.sessions[round_number]
+        try:
+            while True:
+                self._stale.discard(round_number)
+                version, grid = session.version, session.grid.copy()
+                start = time.perf_counter()
+                odds = await asyncio.to_thread(session.simulate, self.n_draws, grid=grid)
+                message = {'type': 'simulation', 'round': round_number, 'version': version,
+                           'n_draws': self.n_draws,
+                           'simulate_ms': round(1000 * (time.perf_counter() - start), 1),
+                           'odds': odds}
+                self.odds[round_number] = message
+                self.publish(round_number, message)
+                if round_number not in self._stale:
+                    return
+        finally:
+            # In the same step as the return: an update after this starts a new run
+            self._simulating.pop(round_number, None)
+
+    # ----- subscribers -----
+
+    def subscribe(self, round_number):
+        queue = asyncio.Queue(QUEUE_SIZE)
+        self.subscribers.setdefault(round_number, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, round_number, queue):
+        self.subscribers.get(round_number, set()).discard(queue)
+
+    def publish(self, round_number, message):
+        for queue in self.subscribers.get(round_number, ()):
+            if queue.full():
+                queue.get_nowait()  # slow consumer: drop its oldest message
+            queue.put_nowait(message)
+
+    # ----- replays -----
+
+    @staticmethod
+    def replay_files():
+        return sorted(p.stem for p in REPLAY_DIR.glob('*.jsonl'))
+
+    async def start_replay(self, round_number, name, speed=None):
+        """Feed REPLAY_DIR/<name>.jsonl into the round in the background; returns the event count."""
+        if name not in self.replay_files():
+            raise FileNotFoundError(name)
+        events = read_replay(REPLAY_DIR / f'{name}.jsonl')
+        await self.session(round_number)
+        previous = self._replays.pop(round_number, None)
+        if previous is not None:
+            previous.cancel()
+        self._replays[round_number] = asyncio.ensure_future(
+            self._replay(round_number, events, speed))
+        return len(events)
+
+    async def _replay(self, round_number, events, speed):
+        last = None
+        for event in events:
+            if speed and last is not None:
+                await asyncio.sleep(max(event.get('t', 0) - last, 0) / speed)
+            last = event.get('t', 0)
+            try:
+                await self.update(round_number, {event['driver']: event['grid_position']})
+            except (KeyError, ValueError) as e:
+                print(f"❌ Skipped replay event {event}: {e!r}")
+            await asyncio.sleep(0)  # let subscribers drain between events
@@ -0,0 +1,224 @@
+"""
+API Load Test
+Runs a closed loop of concurrent clients against the API and sweeps
+concurrency levels x request mixes. The API runs either in process (httpx
+ASGI transport, no server needed) or as a running server (--url, e.g. a
+local uvicorn). For every (mix, concurrency) it reports throughput,
+p50/p95/p99 latency and error rate as a table plus JSON, so every deploy has
+a repeatable capacity number.
+
+Mixes:
+  predict   -- POST /api/predict over drivers x grid positions x forms
+  batch     -- GET /api/predictions/2026/rounds/{n}, a whole scored grid
+  metadata  -- GET /api/drivers, /api/circuits and /
+  mixed     -- 60% metadata, 30% predict, 10% batch
+
+In process, the clients share the interpreter with the app, so absolute
+numbers are conservative; use --url against uvicorn for deploy figures.
+
+Usage:
+    python loadtest.py                                     # in process, every mix
+    python loadtest.py --mixes predict --concurrency 1 8 32 --duration 5
+    python loadtest.py --url http://127.0.0.1:8000         # running server
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+import httpx
+import numpy as np
+
+API_DIR = Path(__file__).parent
+REPORT_PATH = API_DIR / 'models/loadtest.json'
+CONCURRENCY = [1, 4, 16, 64]
+DURATION_S = 3.0
+
+FORMS = ['Excellent', 'Good', 'Average', 'Poor']
+WEATHER = ['Dry', 'Wet']
+
+# Mix -> {request kind: weight}
+MIXES = {
+    'predict': {'predict': 1.0},
+    'batch': {'batch': 1.0},
+    'metadata': {'drivers': 0.4, 'circuits': 0.4, 'health': 0.2},
+    'mixed': {'drivers': 0.25, 'circuits': 0.25, 'health': 0.1, 'predict': 0.3, 'batch': 0.1},
+}
+
+
+def make_request(kind, rng, drivers, circuits):
+    """(method, path, json body) of one request of `kind`."""
+    if kind == 'predict':
+        return 'POST', '/api/predict', {
+            'driver': rng.choice(drivers),
+            'circuit': rng.choice(circuits),
+            'grid_position': rng.randint(1, 20),
+            'recent_form': rng.choice(FORMS),
+            'weather': rng.choice(WEATHER),
+        }
+    if kind == 'batch':
+        return 'GET', f'/api/predictions/2026/rounds/{rng.randint(1, 24)}', None
+    if kind == 'health':
+        return 'GET', '/', None
+    return 'GET', f'/api/{kind}', None
+
+
+def request_stream(mix, drivers, circuits, seed=42):
+    """Endless (kind, method, path, json body) requests drawn from a mix's weights."""
+    rng = random.Random(seed)
+    kinds, weights = zip(*MIXES[mix].items())
+    while True:
+        kind = rng.choices(kinds, weights)[0]
+        yield (kind, *make_request(kind, rng, drivers, circuits))
+
+
+def summarize(latencies, failures, elapsed):
+    """
+    Throughput, goodput (successful requests / s), latency percentiles (ms)
+    and error rate of one run.
+    """
+    n = len(latencies)
+    ms = np.asarray(latencies) * 1000 if n else np.zeros(1)
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return {
+        'requests': n,
+        'throughput_rps': n / elapsed if elapsed else 0.0,
+        'goodput_rps': (n - failures) / elapsed if elapsed else 0.0,
+        'p50_ms': float(p50),
+        'p95_ms': float(p95),
+        'p99_ms': float(p99),
+        'max_ms': float(ms.max()),
+        'error_rate': failures / n if n else 0.0,
+    }
+
+
+async def run_level(client, stream, concurrency, duration):
+    """
+    `concurrency` clients each sending their next request as soon as the
+    previous one returns, for `duration` seconds.
+    """
+    latencies, kinds, outcomes = [], [], Counter()
+    deadline = time.perf_counter() + duration
+
+    async def client_loop():
+        while time.perf_counter() < deadline:
+            kind, method, path, body = next(stream)
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=body)
+                outcome = response.status_code
+            except httpx.HTTPError as e:
+                outcome = type(e).__name__
+            latencies.append(time.perf_counter() - start)
+            kinds.append(kind)
+            outcomes[outcome] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    failed = [not (isinstance(o, int) and o < 400) for o in outcomes.elements()]
+    result = summarize(latencies, sum(failed), elapsed)
+    result['status'] = {str(k): v for k, v in outcomes.items()}
+    per_kind = {}
+    for kind in sorted(set(kinds)):
+        times = [t for t, k in zip(latencies, kinds) if k == kind]
+        per_kind[kind] = {'requests': len(times),
+                          'p50_ms': float(np.percentile(times, 50) * 1000),
+                          'p99_ms': float(np.percentile(times, 99) * 1000)}
+    result['per_kind'] = per_kind
+    return result
+
+
+def make_client(url, timeout):
+    """AsyncClient against a running server, or the app itself in process."""
+    if url:
+        limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+        return httpx.AsyncClient(base_url=url, timeout=timeout, limits=limits), None
+    os.environ.setdefault('F1_API_WARMUP', '0')
+    # Synthetic requests stay out of the prediction history, and repeated
+    # keys time inference rather than SQLite lookups
+    os.environ.setdefault('F1_PREDICTION_STORE', '0')
+    sys.path.insert(0, str(API_DIR))
+    import main
+    transport = httpx.ASGITransport(app=main.app)
+    return httpx.AsyncClient(transport=transport, base_url='http://loadtest', timeout=timeout), main
+
+
+async def sweep(args):
+    client, app_module = make_client(args.url, args.timeout)
+    async with client:
+        if app_module is not None:
+            drivers, circuits = app_module.DRIVERS, app_module.CIRCUITS
+        else:
+            drivers = (await client.get('/api/drivers')).json()['drivers']
+            circuits = (await client.get('/api/circuits')).json()['circuits']
+
+        # One request of every kind first, so lazy model / table loading is
+        # not charged to the first concurrency level
+        start = time.perf_counter()
+        rng = random.Random(args.seed)
+        for kind in sorted({kind for mix in args.mixes for kind in MIXES[mix]}):
+            method, path, body = make_request(kind, rng, drivers, circuits)
+            await client.request(method, path, json=body)
+        print(f"   Warm-up: {time.perf_counter() - start:.2f}s")
+
+        results = []
+        for mix in args.mixes:
+            stream = request_stream(mix, drivers, circuits, seed=args.seed)
+            for concurrency in args.concurrency:
+                result = await run_level(client, stream, concurrency, args.duration)
+                results.append({'mix': mix, 'concurrency': concurrency, **result})
+                print(f"   {mix:9s} c={concurrency:<4d} {result['throughput_rps']:8.1f} req/s "
+                      f"({result['goodput_rps']:7.1f} ok)  p50 {result['p50_ms']:7.1f}ms  "
+                      f"p95 {result['p95_ms']:7.1f}ms  p99 {result['p99_ms']:7.1f}ms  "
+                      f"errors {100 * result['error_rate']:5.1f}%")
+        return results
+
+
+def peak(results, mix):
+    """Highest-goodput level of a mix: where more concurrency stops paying."""
+    return max((r for r in results if r['mix'] == mix), key=lambda r: r['goodput_rps'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrency sweep load test for the API")
+    parser.add_argument('--url', help="running server, e.g. http://127.0.0.1:8000 "
+                                      "(default: the app in process)")
+    parser.add_argument('--mixes', nargs='+', choices=list(MIXES), default=list(MIXES))
+    parser.add_argument('--concurrency', nargs='+', type=int, default=CONCURRENCY)
+    parser.add_argument('--duration', type=float, default=DURATION_S,
+                        help="seconds per (mix, concurrency) level")
+    parser.add_argument('--timeout', type=float, default=30.0, help="per-request timeout (s)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default=str(REPORT_PATH))
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print(f"🚦 API LOAD TEST ({args.url or 'in process'})")
+    print("=" * 70)
+
+    results = asyncio.run(sweep(args))
+
+    print("\n🏁 PEAK GOODPUT PER MIX:")
+    for mix in args.mixes:
+        best = peak(results, mix)
+        print(f"   {mix:9s} {best['goodput_rps']:8.1f} ok req/s at concurrency {best['concurrency']} "
+              f"(p99 {best['p99_ms']:.1f}ms)")
+
+    Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump({'target': args.url or 'asgi', 'duration_s': args.duration,
+                   'mixes': {mix: MIXES[mix] for mix in args.mixes}, 'results': results}, f, indent=2)
+    print(f"\n💾 Saved: {args.output}")
+    print("=" * 70)
+
+
+if __name__ == '__main__':
+    main()
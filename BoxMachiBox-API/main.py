@@ -3,20 +3,83 @@ BoxMachiBox F1 Prediction API
 FastAPI backend for podium predictions
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException, Header, Response, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from typing import List, Dict
-import pickle
-import numpy as np
+from typing import List, Dict, Optional
+from pathlib import Path
+from contextlib import asynccontextmanager
+from functools import lru_cache
+import asyncio
+import hmac
+import httpx
+import os
+import sys
+import threading
+import unicodedata
+
+API_DIR = Path(__file__).parent
+PREDICTOR_DIR = API_DIR.parent / 'f1-predictor-v3-main'
+FEATURES_PATH = PREDICTOR_DIR / 'data/processed/f1_v3_complete_features.csv'
+
+# Distilled student / ensemble pickles reference classes defined with the
+# training code
+sys.path.insert(0, str(PREDICTOR_DIR))
+from model_registry import file_sha256, registry  # noqa: E402
+import admission  # noqa: E402
+import openf1  # noqa: E402
+import profiling  # noqa: E402
+from profiling import span  # noqa: E402
+
+# Models, pandas and the boosters load on first use, so the process answers
+# straight after import; a background thread warms them up at startup
+# unless F1_API_WARMUP=0
+WARMUP = os.getenv('F1_API_WARMUP', '1') != '0'
+
+
+def warm_up():
+    get_model()
+    get_driver_features()
+    for name in SERVING_MODELS:
+        get_serving_model(name)
+    get_prediction_table()
+    get_simulation()
+    get_standings_index()
+    get_prediction_store()
+    for driver in DRIVERS:
+        model_prediction(DEFAULT_SERVING_MODEL, driver, 1)
+    print("🔥 Warm-up complete")
+
+
+@asynccontextmanager
+async def lifespan(app):
+    if WARMUP:
+        threading.Thread(target=warm_up, daemon=True).start()
+    yield
+    await openf1_client.aclose()
+
 
 # Initialize FastAPI
 app = FastAPI(
     title="BoxMachiBox F1 API",
     description="AI-powered F1 podium predictions with 93.89% accuracy",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+# Admission control: per-route-class concurrency limits and a priority
+# queue; overload is rejected with 429/503 + Retry-After (F1_API_ADMISSION=0
+# turns it off)
+admission_controller = admission.AdmissionController.from_env()
+if admission.ENABLED:
+    app.add_middleware(admission.AdmissionMiddleware, controller=admission_controller)
+
+# Request profiling (F1_API_PROFILE=1): Server-Timing headers, sampled
+# cProfile and /admin/profile. Off by default, with nothing installed
+if profiling.ENABLED:
+    app.router.route_class = profiling.TimedRoute
+    app.add_middleware(profiling.ProfilingMiddleware)
+
 # Enable CORS
 app.add_middleware(
     CORSMiddleware,
@@ -26,15 +89,50 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Load model at startup
-print("🏎️ Loading F1 prediction model...")
-try:
-    with open('models/f1_model.pkl', 'rb') as f:
-        model = pickle.load(f)
-    print("✅ Model loaded successfully")
-except Exception as e:
-    print(f"❌ Error loading model: {e}")
-    model = None
+# Writes to state every client shares (the live grid) and /admin/profile need
+# this token as X-Admin-Token (?token= on WebSockets); they are refused while
+# it is unset
+ADMIN_TOKEN = os.getenv('F1_API_ADMIN_TOKEN')
+
+
+def is_admin(token):
+    return bool(ADMIN_TOKEN) and token is not None \
+        and hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode())
+
+
+def require_admin(x_admin_token: Optional[str] = Header(default=None)):
+    if not is_admin(x_admin_token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+# Models (resolved through the shared model registry, loaded once on first use)
+def load_artifact(name):
+    try:
+        obj = registry.load(name)
+        print(f"✅ Loaded {registry.version_key(name)}")
+        return obj
+    except Exception as e:
+        print(f"❌ Error loading {name}: {e}")
+        return None
+
+
+SERVING_MODELS = {
+    'student': 'podium-student',
+    'ensemble': 'podium-ensemble',
+    'production': 'production',
+}
+
+
+@lru_cache(maxsize=None)
+def get_model():
+    return load_artifact('production')
+
+
+@lru_cache(maxsize=None)
+def get_serving_model(name):
+    return load_artifact(SERVING_MODELS[name])
+
+DEFAULT_SERVING_MODEL = 'student'
 
 # Data
 DRIVERS = [
@@ -50,6 +148,164 @@ CIRCUITS = [
     "Singapore", "USA", "Mexico", "Brazil", "Las Vegas", "Qatar", "Abu Dhabi"
 ]
 
+
+def _normalize_name(name):
+    name = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode()
+    return name.lower().strip()
+
+
+@lru_cache(maxsize=None)
+def get_driver_features():
+    """Latest engineered feature row per driver, keyed by normalized full name."""
+    import pandas as pd
+    try:
+        df = pd.read_csv(FEATURES_PATH)
+    except Exception as e:
+        print(f"❌ Error loading driver features: {e}")
+        return {}
+    df = df.sort_values(['season', 'round']).groupby('driverId').tail(1)
+    names = (df['givenName'] + ' ' + df['familyName']).map(_normalize_name)
+    return {name: row for name, (_, row) in zip(names, df.iterrows())}
+
+
+@lru_cache(maxsize=None)
+def get_prediction_table():
+    """2026 driver-round predictions precomputed by batch_score.py, or None."""
+    from batch_score import REGISTRY_NAME, PredictionTable
+    try:
+        table = PredictionTable.load(REGISTRY_NAME)
+        print(f"✅ Loaded {registry.version_key(REGISTRY_NAME)}")
+        return table
+    except Exception as e:
+        print(f"❌ Error loading 2026 predictions: {e}")
+        return None
+
+
+def prediction_table():
+    table = get_prediction_table()
+    if table is None:
+        raise HTTPException(status_code=503, detail="2026 predictions not generated (run batch_score.py)")
+    return table
+
+
+@lru_cache(maxsize=None)
+def get_simulation():
+    """Memory-mapped 2026 outcome distributions saved by simulator.py, or None."""
+    from simulator import DISTRIBUTIONS_DIR, SimulationDistributions
+    try:
+        simulation = SimulationDistributions.load(DISTRIBUTIONS_DIR)
+        print(f"✅ Loaded simulation distributions ({simulation.n_seasons:,} seasons)")
+        return simulation
+    except Exception as e:
+        print(f"❌ Error loading simulation distributions: {e}")
+        return None
+
+
+def simulation_distributions(*driver_ids, round_number=None):
+    """Loaded distributions, after checking the requested drivers / round exist."""
+    simulation = get_simulation()
+    if simulation is None:
+        raise HTTPException(status_code=503, detail="Simulation not run (run simulator.py)")
+    if any(driver_id not in simulation.position for driver_id in driver_ids):
+        raise HTTPException(status_code=404, detail="Unknown driver")
+    if round_number is not None and round_number not in simulation.round_index:
+        raise HTTPException(status_code=404, detail="Unknown round")
+    return simulation
+
+
+@lru_cache(maxsize=None)
+def get_standings_index():
+    """Cumulative championship standings for every (season, round) of the race results."""
+    from standings_index import StandingsIndex
+    return StandingsIndex.build()
+
+
+@lru_cache(maxsize=None)
+def get_prediction_store():
+    """SQLite prediction history (prediction_store.py), or None when disabled / unavailable."""
+    from prediction_store import PredictionStore
+    try:
+        store = PredictionStore.open()
+        if store is not None:
+            print(f"✅ Prediction store: {store.path}")
+        return store
+    except Exception as e:
+        print(f"❌ Error opening prediction store: {e}")
+        return None
+
+
+def prediction_model_version(model_name):
+    """
+    Models a /api/predict answer depends on: the serving model when it is
+    deployed, and the production model (fallback scorer and explainer).
+    """
+    refs = dict.fromkeys(ref for ref in (SERVING_MODELS[model_name], 'production')
+                         if registry.exists(ref))
+    return ' + '.join(registry.version_key(ref) for ref in refs)
+
+
+@lru_cache(maxsize=None)
+def features_sha256():
+    """Hash of the feature rows get_driver_features() serves (both are read once per process)."""
+    return file_sha256(FEATURES_PATH)
+
+
+# Grid slots precomputed per (model, driver); requests outside are clamped
+GRID_SLOTS = 22
+
+
+@lru_cache(maxsize=256)
+def driver_outlook(model_name, driver_key):
+    """
+    Podium probability and factor impacts of a driver's latest form from
+    every grid slot, scored and explained in one batch, or None when the
+    driver has no feature history. Impacts are None when the model has no
+    native contributions; they then come from the production model.
+    """
+    import numpy as np
+    from explain import Explainer
+    from preprocessing import F1Preprocessor, grid_overrides
+
+    model = get_model() if model_name == 'production' else get_serving_model(model_name)
+    with span('features'):
+        row = get_driver_features().get(driver_key)
+        if model is None or row is None:
+            return None
+        explainer = Explainer(model)
+        X = F1Preprocessor(explainer.features).transform_frame(
+            [row] * GRID_SLOTS, overrides=grid_overrides(np.arange(1, GRID_SLOTS + 1)))
+    with span('predict'):
+        proba = model.predict_proba(X)[:, 1]
+    try:
+        with span('explain'):
+            impacts = explainer.explain(X)
+    except TypeError:
+        if model_name == 'production':
+            raise
+        fallback = driver_outlook('production', driver_key)
+        impacts = fallback[2] if fallback is not None else None
+    return proba, explainer, impacts
+
+
+def model_prediction(model_name, driver, grid_position):
+    """
+    (model used, podium probability, model-derived factors) for a driver
+    starting from grid_position. A serving model without an artifact falls
+    back to the production model; (None, None, None) when neither can score.
+    """
+    for name in dict.fromkeys((model_name, 'production')):
+        with span('outlook'):
+            outlook = driver_outlook(name, _normalize_name(driver))
+        if outlook is not None:
+            break
+    else:
+        return None, None, None
+    proba, explainer, impacts = outlook
+    slot = min(max(grid_position, 1), GRID_SLOTS) - 1
+    factors = explainer.factors_for(impacts.iloc[slot]) if impacts is not None else []
+    return name, float(proba[slot]), factors
+
+
 # Models
 class PredictionRequest(BaseModel):
     driver: str
@@ -57,6 +313,7 @@ class PredictionRequest(BaseModel):
     grid_position: int
     recent_form: str
     weather: str
+    model: str = DEFAULT_SERVING_MODEL  # 'student' (fast), 'ensemble' (full) or 'production'
 
 class PredictionResponse(BaseModel):
     driver: str
@@ -65,37 +322,33 @@ class PredictionResponse(BaseModel):
     predicted_position: int
     confidence: str
     contributing_factors: List[Dict[str, str]]
+    model: str
 
-# Endpoints
-@app.get("/")
-def root():
-    return {
-        "status": "online",
-        "service": "BoxMachiBox F1 API",
-        "version": "1.0.0",
-        "model_loaded": model is not None
-    }
+class LiveGridUpdate(BaseModel):
+    grid: Dict[str, int]  # driverId -> grid position
 
-@app.post("/api/predict", response_model=PredictionResponse)
-def predict_podium(request: PredictionRequest):
-    if model is None:
-        raise HTTPException(status_code=503, detail="Model not loaded")
-    
-    # Validate
-    if request.driver not in DRIVERS:
-        raise HTTPException(status_code=400, detail="Invalid driver")
-    if request.circuit not in CIRCUITS:
-        raise HTTPException(status_code=400, detail="Invalid circuit")
-    
-    # Simple prediction logic
-    podium_prob = max(0.1, min(0.95, 1 - (request.grid_position - 1) * 0.05))
+def compute_prediction(request):
+    """PredictionResponse for a validated request."""
+    # Model probability and factors (student by default, full ensemble on
+    # request, the production model when neither is deployed); falls back to
+    # the grid heuristic when no model/driver data is available
+    model_used, podium_prob, factors = model_prediction(request.model, request.driver,
+                                                        request.grid_position)
+    if podium_prob is None:
+        model_used = 'heuristic'
+        podium_prob = max(0.1, min(0.95, 1 - (request.grid_position - 1) * 0.05))
+        factors = [{"factor": "Qualifying Position", "impact": f"{100 * podium_prob:+.1f}%", "icon": "🏁"}]
     
+    model_prob = podium_prob
     if request.recent_form == 'Excellent':
         podium_prob *= 1.2
     elif request.recent_form == 'Poor':
         podium_prob *= 0.7
     
     podium_prob = min(podium_prob, 0.99)
+    if podium_prob != model_prob:
+        factors = factors + [{"factor": "Reported Form",
+                              "impact": f"{100 * (podium_prob - model_prob):+.1f}%", "icon": "📝"}]
     
     # Predicted position
     if podium_prob > 0.75:
@@ -108,24 +361,58 @@ def predict_podium(request: PredictionRequest):
     # Confidence
     confidence = "High" if podium_prob > 0.8 else "Medium" if podium_prob > 0.5 else "Low"
     
-    # Contributing factors
-    form_impact = {'Excellent': 15, 'Good': 8, 'Average': 3, 'Poor': -5}
-    factors = [
-        {"factor": "Qualifying Position", "impact": f"+{(21-request.grid_position)*2}%", "icon": "🏁"},
-        {"factor": "Recent Form", "impact": f"+{form_impact[request.recent_form]}%", "icon": "📈"},
-        {"factor": "Circuit Mastery", "impact": "+12%", "icon": "🏟️"},
-        {"factor": "Weather", "impact": "+5%" if request.weather == "Dry" else "-3%", "icon": "🌤️"}
-    ]
-    
     return PredictionResponse(
         driver=request.driver,
         circuit=request.circuit,
         podium_probability=round(podium_prob, 3),
         predicted_position=predicted_pos,
         confidence=confidence,
-        contributing_factors=factors
+        contributing_factors=factors,
+        model=model_used
     )
 
+# Endpoints
+@app.get("/")
+def root():
+    return {
+        "status": "online",
+        "service": "BoxMachiBox F1 API",
+        "version": "1.0.0",
+        "model_loaded": registry.is_loaded('production'),
+        "serving_models": [name for name, ref in SERVING_MODELS.items() if registry.exists(ref)]
+    }
+
+@app.post("/api/predict", response_model=PredictionResponse)
+def predict_podium(request: PredictionRequest):
+    if get_model() is None:
+        raise HTTPException(status_code=503, detail="Model not loaded")
+    
+    # Validate
+    if request.driver not in DRIVERS:
+        raise HTTPException(status_code=400, detail="Invalid driver")
+    if request.circuit not in CIRCUITS:
+        raise HTTPException(status_code=400, detail="Invalid circuit")
+    if request.model not in SERVING_MODELS:
+        raise HTTPException(status_code=400, detail="Invalid model")
+
+    # Model answers are recorded in the prediction store and repeated
+    # requests are served from it, until the models or the features change
+    store = get_prediction_store()
+    if store is None:
+        return compute_prediction(request)
+    inputs = request.model_dump()
+    key = {**inputs, 'features_sha256': features_sha256()}
+    model_version = prediction_model_version(request.model)
+    rows = store.lookup('api:predict', model_version, key)
+    if rows is not None:
+        return PredictionResponse(**rows[0])
+    response = compute_prediction(request)
+    # Heuristic fallbacks are not model predictions: served, never recorded.
+    # Stored rows keep the request fields too, for history views
+    if response.model != 'heuristic':
+        store.record('api:predict', model_version, key, [{**inputs, **response.model_dump()}])
+    return response
+
 @app.get("/api/drivers")
 def get_drivers():
     return {"count": len(DRIVERS), "drivers": DRIVERS}
@@ -134,15 +421,260 @@ def get_drivers():
 def get_circuits():
     return {"count": len(CIRCUITS), "circuits": CIRCUITS}
 
+@app.get("/api/predictions/history")
+def get_prediction_history(driver: Optional[str] = None, season: Optional[int] = None,
+                           round_number: Optional[int] = None, model_version: Optional[str] = None,
+                           source: Optional[str] = None, limit: int = 50,
+                           cursor: Optional[int] = None):
+    store = get_prediction_store()
+    if store is None:
+        raise HTTPException(status_code=503, detail="Prediction store disabled")
+    return store.history(driver, season, round_number, model_version, source, limit, cursor)
+
+@app.get("/api/predictions/batches")
+def get_prediction_batches(source: Optional[str] = None, model_version: Optional[str] = None,
+                           limit: int = 50, cursor: Optional[int] = None):
+    store = get_prediction_store()
+    if store is None:
+        raise HTTPException(status_code=503, detail="Prediction store disabled")
+    return store.batches(source, model_version, limit, cursor)
+
+# Precomputed 2026 predictions (no inference per request)
+@app.get("/api/predictions/2026")
+def get_season_predictions():
+    table = prediction_table()
+    return {
+        "season": 2026,
+        "models": table.models,
+        "rounds": table.podiums().to_dict('records'),
+    }
+
+@app.get("/api/predictions/2026/rounds/{round_number}")
+def get_round_predictions(round_number: int, limit: Optional[int] = None):
+    table = prediction_table()
+    if round_number not in table.rounds:
+        raise HTTPException(status_code=404, detail="Unknown round")
+    with span('table'):
+        rows = table.round(round_number, limit)
+        records = rows.to_dict('records')
+    return {
+        "round": round_number,
+        "circuit": rows['circuit_name'].iloc[0],
+        "predictions": records,
+    }
+
+@app.get("/api/predictions/2026/drivers/{driver_id}")
+def get_driver_predictions(driver_id: str):
+    table = prediction_table()
+    if driver_id not in table.drivers:
+        raise HTTPException(status_code=404, detail="Unknown driver")
+    rows = table.driver(driver_id)
+    return {
+        "driverId": driver_id,
+        "driver": rows['driver'].iloc[0],
+        "predicted_podiums": int(rows['predicted_podium'].sum()),
+        "predictions": rows.to_dict('records'),
+    }
+
+# Simulated 2026 outcome distributions (read from the saved tensors)
+@app.get("/api/simulation/2026/drivers/{driver_id}/rounds/{round_number}")
+def get_finish_distribution(driver_id: str, round_number: int, top: int = 3):
+    simulation = simulation_distributions(driver_id, round_number=round_number)
+    distribution = simulation.position_distribution(driver_id, round_number)
+    if not 1 <= top < len(distribution):
+        raise HTTPException(status_code=400, detail="Invalid top")
+    return {
+        "driverId": driver_id,
+        "round": round_number,
+        "top": top,
+        "probability": round(float(distribution[:top].sum()), 4),
+        "position_probabilities": [round(float(p), 4) for p in distribution[:-1]],
+        "dnf_probability": round(float(distribution[-1]), 4),
+        "n_seasons": simulation.n_seasons,
+    }
+
+@app.get("/api/simulation/2026/head-to-head")
+def get_head_to_head(driver_a: str, driver_b: str, round_number: Optional[int] = None):
+    simulation = simulation_distributions(driver_a, driver_b, round_number=round_number)
+    return {
+        "driver_a": driver_a,
+        "driver_b": driver_b,
+        "round": round_number,
+        "scope": "season points" if round_number is None else "race finish",
+        "probability_a_ahead": round(simulation.beat_probability(driver_a, driver_b, round_number), 4),
+        "probability_b_ahead": round(simulation.beat_probability(driver_b, driver_a, round_number), 4),
+        "n_seasons": simulation.n_seasons,
+    }
+
+@app.get("/api/standings/{season}")
+def get_standings(season: int, round_number: Optional[int] = None, kind: str = 'driver',
+                  top: Optional[int] = None):
+    index = get_standings_index()
+    if kind not in index.seasons:
+        raise HTTPException(status_code=400, detail="Invalid kind")
+    if season not in index.seasons[kind]:
+        raise HTTPException(status_code=404, detail="Unknown season")
+    n_rounds = index.season(season, kind).n_rounds
+    round_number = n_rounds if round_number is None else round_number
+    if not 0 <= round_number <= n_rounds:
+        raise HTTPException(status_code=404, detail="Unknown round")
+    table = index.standings(season, round_number, kind)
+    return {
+        "season": season,
+        "round": round_number,
+        "rounds": n_rounds,
+        "kind": kind,
+        "standings": table.head(top).to_dict('records') if top else table.to_dict('records'),
+    }
+
+# OpenF1 proxy for the standings / driver pages: pooled, coalesced, cached
+# upstream calls (OPENF1_BASE_URL points it at a stub in tests)
+openf1_client = openf1.OpenF1Client()
+
+@app.get("/api/openf1/standings")
+async def get_openf1_standings():
+    try:
+        return await openf1_client.standings()
+    except (httpx.HTTPError, ValueError):
+        raise HTTPException(status_code=502, detail="OpenF1 unavailable")
+
+@app.get("/api/openf1/drivers/{driver_number}")
+async def get_openf1_driver(driver_number: int):
+    try:
+        profile = await openf1_client.driver_profile(driver_number)
+    except (httpx.HTTPError, ValueError):
+        raise HTTPException(status_code=502, detail="OpenF1 unavailable")
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Unknown driver")
+    return profile
+
+@app.get("/api/openf1/cache")
+def get_openf1_cache():
+    return openf1_client.snapshot()
+
+# Live race weekend: incremental rescoring as qualifying results arrive,
+# pushed to WebSocket subscribers (scores first, simulation odds after)
+@lru_cache(maxsize=None)
+def get_live_hub():
+    """Built on first use: live sessions import pandas, the simulator and the models."""
+    import live
+    return live.LiveHub()
+
+async def live_session(round_number):
+    try:
+        return await get_live_hub().session(round_number)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Unknown round")
+
+async def live_update(round_number, grid):
+    await live_session(round_number)
+    try:
+        return await get_live_hub().update(round_number, grid)
+    except KeyError as e:
+        raise HTTPException(status_code=400, detail=f"Driver {e.args[0]} not on the round's grid")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/api/live/{round_number}")
+async def get_live(round_number: int):
+    await live_session(round_number)
+    return get_live_hub().snapshot(round_number)
+
+@app.post("/api/live/{round_number}/grid", dependencies=[Depends(require_admin)])
+async def post_live_grid(round_number: int, update: LiveGridUpdate):
+    return await live_update(round_number, update.grid)
+
+@app.post("/api/live/{round_number}/reset", dependencies=[Depends(require_admin)])
+async def post_live_reset(round_number: int):
+    await live_session(round_number)
+    return await get_live_hub().reset(round_number)
+
+@app.post("/api/live/{round_number}/replay", dependencies=[Depends(require_admin)])
+async def post_live_replay(round_number: int, name: str, speed: Optional[float] = None):
+    await live_session(round_number)
+    live_hub = get_live_hub()
+    try:
+        events = await live_hub.start_replay(round_number, name, speed)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=f"Unknown replay (have {live_hub.replay_files()})")
+    return {"round": round_number, "replay": name, "events": events, "speed": speed}
+
+@app.websocket("/api/live/{round_number}/ws")
+async def live_socket(websocket: WebSocket, round_number: int):
+    """
+    Pushes the round's snapshot, then every scores / simulation message.
+    Clients connected with the admin token may send {"grid": {driverId:
+    position}} updates on the socket.
+    """
+    live_hub = get_live_hub()
+    try:
+        await live_hub.session(round_number)
+    except ValueError:
+        await websocket.close(code=4404)
+        return
+    await websocket.accept()
+    writer = is_admin(websocket.headers.get('x-admin-token') or websocket.query_params.get('token'))
+    queue = live_hub.subscribe(round_number)
+
+    async def push():
+        await websocket.send_json({**live_hub.snapshot(round_number), 'type': 'snapshot'})
+        while True:
+            await websocket.send_json(await queue.get())
+
+    async def receive():
+        while True:
+            message = await websocket.receive_json()
+            if not writer:
+                await websocket.send_json({'type': 'error', 'detail': "Invalid admin token"})
+                continue
+            try:
+                await live_hub.update(round_number, message.get('grid') or {})
+            except (KeyError, ValueError, AttributeError) as e:
+                await websocket.send_json({'type': 'error', 'detail': repr(e)})
+
+    tasks = [asyncio.ensure_future(push()), asyncio.ensure_future(receive())]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            if not isinstance(task.exception(), WebSocketDisconnect):
+                print(f"❌ Live socket closed: {task.exception()!r}")
+    finally:
+        live_hub.unsubscribe(round_number, queue)
+        for task in tasks:
+            task.cancel()
+
+@app.get("/api/admission")
+def get_admission():
+    return {"enabled": admission.ENABLED, **admission_controller.snapshot()}
+
 @app.get("/api/model/info")
 def get_model_info():
     return {
         "model_type": "XGBoost",
         "accuracy": 93.89,
         "training_samples": 1838,
-        "version": "1.0.0"
+        "version": "1.0.0",
+        "artifact": registry.version_key('production'),
     }
 
+# Aggregated sampled profiles (only routed when profiling is enabled, and
+# refused while F1_API_ADMIN_TOKEN is unset)
+if profiling.ENABLED:
+    @app.get("/admin/profile", dependencies=[Depends(require_admin)])
+    def get_profile(minutes: float = profiling.WINDOW_MINUTES, format: str = 'text',
+                    limit: int = 30, sort: str = 'cumulative'):
+        if format not in ('text', 'json', 'pstats'):
+            raise HTTPException(status_code=400, detail="Invalid format")
+        if sort not in ('cumulative', 'tottime', 'ncalls'):
+            raise HTTPException(status_code=400, detail="Invalid sort")
+        report = profiling.report(minutes, format, limit, sort)
+        if format == 'json':
+            return report
+        if format == 'pstats':
+            return Response(report, media_type='application/octet-stream', headers={
+                'Content-Disposition': 'attachment; filename="api.pstats"'})
+        return Response(report, media_type='text/plain')
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -0,0 +1,259 @@
+"""
+OpenF1 Proxy
+Server-side access to the OpenF1 API for the standings and driver pages:
+one pooled HTTP client, identical in-flight requests coalesced into one
+upstream fetch, and a TTL cache in memory and on disk. Entries past their
+TTL are served stale while a background fetch revalidates them, and any
+cached copy is served when the upstream fails.
+
+    OPENF1_BASE_URL=https://api.openf1.org/v1   upstream (point at a local stub in tests)
+    OPENF1_CACHE_DIR=BoxMachiBox-API/cache/openf1
+    OPENF1_TIMEOUT=10                           seconds per upstream request
+
+    client = OpenF1Client()
+    await client.standings()                    # drivers + constructors, latest race
+    await client.driver_profile(4)              # standing + recent race positions
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from urllib.parse import urlencode
+
+import httpx
+
+API_DIR = Path(__file__).parent
+BASE_URL = os.getenv('OPENF1_BASE_URL', 'https://api.openf1.org/v1').rstrip('/')
+CACHE_DIR = Path(os.getenv('OPENF1_CACHE_DIR', API_DIR / 'cache/openf1'))
+TIMEOUT_S = float(os.getenv('OPENF1_TIMEOUT', '10'))
+
+# Seconds an upstream response stays fresh, per endpoint
+TTLS = {
+    'sessions': 3600,
+    'drivers': 3600,
+    'position': 3600,
+    'championship_drivers': 300,
+}
+DEFAULT_TTL = 300
+# How long past its TTL an entry may still be served while revalidating
+STALE_S = 24 * 3600
+
+SEASONS = (2025, 2024)  # latest race: first season with races
+FALLBACK_SESSION_KEY = 9472  # Bahrain 2024
+HISTORY_RACES = 8
+
+# Backup team colours when the roster has none
+TEAM_COLOR_MAP = {
+    "Red Bull Racing": "#3671C6",
+    "Ferrari": "#E8002D",
+    "Mercedes": "#27F4D2",
+    "McLaren": "#FF8000",
+    "Aston Martin": "#225941",
+    "Alpine": "#0093CC",
+    "Williams": "#64C4FF",
+    "RB": "#6692FF",
+    "Kick Sauber": "#52E252",
+    "Haas F1 Team": "#B6BABD",
+    "Haas": "#B6BABD",
+    "Sauber": "#52E252",
+}
+
+
+class OpenF1Client:
+    """Cached, coalescing OpenF1 fetches; use from one event loop."""
+
+    def __init__(self, base_url=BASE_URL, cache_dir=CACHE_DIR, timeout=TIMEOUT_S, transport=None):
+        self.base_url = base_url
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.timeout = timeout
+        self.transport = transport
+        self._client = None
+        self._loop = None
+        self._memory = {}    # key -> (fetched_at, data)
+        self._inflight = {}  # key -> Task
+        self.stats = {'fresh': 0, 'stale': 0, 'fetched': 0, 'coalesced': 0, 'errors': 0}
+
+    # ----- transport -----
+
+    def _http(self):
+        # The pooled client belongs to the loop that created it
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url, timeout=self.timeout, transport=self.transport,
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10))
+            self._loop = loop
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    # ----- cache -----
+
+    @staticmethod
+    def _key(path, params):
+        return f"{path}?{urlencode(sorted((params or {}).items()))}"
+
+    def _disk_path(self, key):
+        return self.cache_dir / f"{hashlib.sha1(key.encode()).hexdigest()}.json"
+
+    def _cached(self, key):
+        entry = self._memory.get(key)
+        if entry is None and self.cache_dir is not None:
+            path = self._disk_path(key)
+            try:
+                with open(path) as f:
+                    stored = json.load(f)
+                entry = self._memory[key] = (stored['fetched_at'], stored['data'])
+            except (OSError, ValueError, KeyError):
+                return None
+        return entry
+
+    def _store(self, key, data):
+        fetched_at = time.time()
+        self._memory[key] = (fetched_at, data)
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self._disk_path(key)
+            tmp = path.with_suffix('.tmp')
+            with open(tmp, 'w') as f:
+                json.dump({'key': key, 'fetched_at': fetched_at, 'data': data}, f)
+            os.replace(tmp, path)
+
+    # ----- fetching -----
+
+    async def _fetch_and_store(self, key, path, params):
+        response = await self._http().get(f"/{path}", params=params)
+        response.raise_for_status()
+        data = response.json()
+        self._store(key, data)
+        self.stats['fetched'] += 1
+        return data
+
+    def _fetch(self, key, path, params):
+        """Shared task for `key`: concurrent callers wait on one upstream request."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_and_store(key, path, params))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.stats['coalesced'] += 1
+        return task
+
+    def _revalidate(self, key, path, params):
+        self._fetch(key, path, params).add_done_callback(self._background_done)
+
+    def _background_done(self, task):
+        # A failed revalidation keeps serving the stale copy
+        if not task.cancelled() and task.exception() is not None:
+            self.stats['errors'] += 1
+
+    async def get(self, path, **params):
+        """JSON for GET /{path}?{params}, through the cache."""
+        key = self._key(path, params)
+        entry = self._cached(key)
+        age = time.time() - entry[0] if entry is not None else None
+        ttl = TTLS.get(path, DEFAULT_TTL)
+
+        if entry is not None and age < ttl:
+            self.stats['fresh'] += 1
+            return entry[1]
+        if entry is not None and age < ttl + STALE_S:
+            self.stats['stale'] += 1
+            self._revalidate(key, path, params)
+            return entry[1]
+        try:
+            return await asyncio.shield(self._fetch(key, path, params))
+        except (httpx.HTTPError, ValueError):
+            self.stats['errors'] += 1
+            if entry is not None:
+                return entry[1]  # expired, but better than nothing
+            raise
+
+    def snapshot(self):
+        return {'base_url': self.base_url, 'entries': len(self._memory),
+                'in_flight': len(self._inflight), **self.stats}
+
+    # ----- standings / driver pages -----
+
+    async def latest_race_session(self):
+        """Latest race session of the first season in SEASONS that has races."""
+        results = await asyncio.gather(
+            *(self.get('sessions', year=year, session_type='Race') for year in SEASONS),
+            return_exceptions=True)
+        for sessions in results:
+            if isinstance(sessions, list) and sessions:
+                return sessions[-1]
+        return {'session_key': FALLBACK_SESSION_KEY}
+
+    async def standings(self):
+        """Driver and constructor standings after the latest race (the pages' table rows)."""
+        session = await self.latest_race_session()
+        session_key = session['session_key']
+        roster, championship = await asyncio.gather(
+            self.get('drivers', session_key=session_key),
+            self.get('championship_drivers', session_key=session_key))
+
+        info = {}
+        for d in roster:
+            colour = f"#{d['team_colour']}" if d.get('team_colour') \
+                else TEAM_COLOR_MAP.get(d.get('team_name'), "#FFFFFF")
+            info[d['driver_number']] = {'name': d.get('full_name'), 'team': d.get('team_name'),
+                                        'color': colour, 'headshot': d.get('headshot_url')}
+
+        unknown = {'name': "Unknown", 'team': "Unknown", 'color': "#FFF", 'headshot': None}
+        drivers = []
+        for c in championship:
+            d = info.get(c['driver_number'], unknown)
+            drivers.append({
+                'position': c.get('position_current'),
+                'driver_number': c['driver_number'],
+                'driver_name': d['name'],
+                'team_name': d['team'],
+                'points': c.get('points_current') or 0,
+                'wins': 0,
+                'podiums': 0,
+                'team_colour': d['color'],
+                'headshot_url': d['headshot'],
+            })
+        drivers.sort(key=lambda d: -d['points'])
+        teams = {}
+        for position, d in enumerate(drivers, 1):
+            d['position'] = position
+            team = teams.setdefault(d['team_name'], {
+                'position': 0, 'team_name': d['team_name'], 'points': 0, 'wins': 0,
+                'podiums': 0, 'team_colour': d['team_colour']})
+            team['points'] += d['points']
+        teams = sorted(teams.values(), key=lambda t: -t['points'])
+        for position, team in enumerate(teams, 1):
+            team['position'] = position
+        return {'session_key': session_key, 'drivers': drivers, 'teams': teams}
+
+    async def driver_profile(self, driver_number, year=SEASONS[-1], races=HISTORY_RACES):
+        """A driver's standing plus final positions in the season's last `races` races."""
+        standings, sessions = await asyncio.gather(
+            self.standings(), self.get('sessions', year=year, session_type='Race'))
+        driver = next((d for d in standings['drivers'] if d['driver_number'] == driver_number), None)
+        if driver is None:
+            return None
+
+        recent = list(reversed(sessions[-races:]))
+        positions = await asyncio.gather(
+            *(self.get('position', session_key=s['session_key'], driver_number=driver_number)
+              for s in recent),
+            return_exceptions=True)
+        history = [{
+            'meeting_key': s.get('meeting_key'),
+            'session_key': s['session_key'],
+            'date': s.get('date_start'),
+            'location': s.get('location'),
+            'position': rows[-1].get('position'),
+            'points': 0,
+        } for s, rows in zip(recent, positions) if isinstance(rows, list) and rows]
+        return {**driver, 'history': history}
@@ -0,0 +1,272 @@
+"""
+Request Profiling (opt-in)
+Per-request timing breakdown as a Server-Timing header, plus deterministic
+cProfile runs on a sampled fraction of requests, aggregated for the admin
+endpoint. Everything is off unless F1_API_PROFILE=1; disabled, the app has
+no extra middleware or route wrapping and span() is one contextvar read.
+
+    F1_API_PROFILE=1              Server-Timing on every response
+    F1_API_PROFILE_SAMPLE=0.05    ...and cProfile 5% of requests
+    F1_API_PROFILE_WINDOW=15      minutes of sampled profiles kept
+    F1_API_ADMIN_TOKEN=...        X-Admin-Token required by /admin/profile (no
+                                  token set: the endpoint answers 403)
+
+Server-Timing entries (milliseconds):
+  validate  -- request parsing + pydantic validation (and threadpool dispatch)
+  endpoint  -- the endpoint function, with its span()s listed separately
+  encode    -- response model validation + JSON encoding
+  app       -- total time until the response headers were sent
+
+    with span('predict'):
+        proba = model.predict_proba(X)
+"""
+
+import asyncio
+import cProfile
+import functools
+import io
+import marshal
+import os
+import pstats
+import random
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+
+from fastapi.routing import APIRoute
+from starlette.datastructures import MutableHeaders
+
+ENABLED = os.getenv('F1_API_PROFILE', '0') == '1'
+SAMPLE_RATE = float(os.getenv('F1_API_PROFILE_SAMPLE', '0'))
+WINDOW_MINUTES = float(os.getenv('F1_API_PROFILE_WINDOW', '15'))
+MAX_PROFILES = 1000
+
+_timings = ContextVar('request_timings', default=None)
+
+
+class RequestTimings:
+    """Phase marks and named spans of one request (seconds)."""
+
+    def __init__(self, sampled=False):
+        self.sampled = sampled
+        self.marks = {}
+        self.spans = []
+
+    def header(self):
+        marks = self.marks
+        entries = []
+        if 'route_start' in marks and 'endpoint_start' in marks:
+            entries.append(('validate', marks['endpoint_start'] - marks['route_start']))
+        if 'endpoint_start' in marks and 'endpoint_end' in marks:
+            entries.append(('endpoint', marks['endpoint_end'] - marks['endpoint_start']))
+        if 'endpoint_end' in marks and 'route_end' in marks:
+            entries.append(('encode', marks['route_end'] - marks['endpoint_end']))
+        entries += self.spans
+        if 'app' in marks:
+            entries.append(('app', marks['app']))
+        header = ', '.join(f'{name};dur={1000 * seconds:.3f}' for name, seconds in entries)
+        return header + (', profiled' if 'profiled' in marks else '')
+
+
+class _Span:
+    __slots__ = ('timings', 'name', 'start')
+
+    def __init__(self, timings, name):
+        self.timings, self.name = timings, name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.timings.spans.append((self.name, time.perf_counter() - self.start))
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc):
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+
+def span(name):
+    """Time a block under `name` in the current request's Server-Timing (no-op when off)."""
+    timings = _timings.get()
+    return _NO_SPAN if timings is None else _Span(timings, name)
+
+
+def record(name, seconds):
+    """Add an already measured duration to the current request's Server-Timing."""
+    timings = _timings.get()
+    if timings is not None:
+        timings.spans.append((name, seconds))
+
+
+# ----- sampled profiles -----
+
+class ProfileStore:
+    """cProfile stats of sampled requests, kept for `window_minutes`."""
+
+    def __init__(self, window_minutes=WINDOW_MINUTES, max_profiles=MAX_PROFILES):
+        self.window_s = window_minutes * 60
+        self.profiles = deque(maxlen=max_profiles)
+        # One profiler at a time: cProfile does not nest, and on Python 3.12+
+        # only one can be active per process
+        self.lock = threading.Lock()
+
+    def run(self, fn, *args, **kwargs):
+        """fn(*args, **kwargs) under cProfile, or plainly when another profile is running."""
+        if not self.lock.acquire(blocking=False):
+            return fn(*args, **kwargs), False
+        try:
+            profile = cProfile.Profile()
+            result = profile.runcall(fn, *args, **kwargs)
+            profile.create_stats()
+            self.profiles.append((time.time(), profile))
+            return result, True
+        finally:
+            self.lock.release()
+
+    def recent(self, minutes=None):
+        cutoff = time.time() - 60 * (minutes if minutes is not None else self.window_s / 60)
+        return [profile for stamp, profile in list(self.profiles) if stamp >= cutoff]
+
+    def stats(self, minutes=None):
+        """Merged pstats.Stats of the last `minutes`, or None when nothing was sampled."""
+        profiles = self.recent(minutes)
+        if not profiles:
+            return None
+        stats = pstats.Stats(profiles[0], stream=io.StringIO())
+        for profile in profiles[1:]:
+            stats.add(profile)
+        return stats
+
+
+store = ProfileStore()
+
+
+def report(minutes, fmt='text', limit=30, sort='cumulative'):
+    """
+    Aggregated profile of the last `minutes`: pstats text, top functions as
+    JSON, or the marshalled stats dict (`pstats.Stats(path)` / snakeviz).
+    """
+    profiles = store.recent(minutes)
+    stats = store.stats(minutes)
+    if fmt == 'pstats':
+        return marshal.dumps(stats.stats if stats is not None else {})
+    if stats is None:
+        return {'profiles': 0, 'minutes': minutes, 'functions': []} if fmt == 'json' \
+            else f"No sampled profiles in the last {minutes:g} minutes\n"
+    stats.sort_stats(sort)
+    if fmt == 'json':
+        functions = []
+        for func in stats.fcn_list[:limit]:
+            calls, primitive, tottime, cumtime, _ = stats.stats[func]
+            functions.append({'function': pstats.func_std_string(func), 'ncalls': calls,
+                              'primitive_calls': primitive, 'tottime_s': tottime,
+                              'cumtime_s': cumtime})
+        return {'profiles': len(profiles), 'minutes': minutes,
+                'total_time_s': stats.total_tt, 'functions': functions}
+    stream = io.StringIO()
+    stats.stream = stream
+    stream.write(f"{len(profiles)} sampled requests in the last {minutes:g} minutes\n")
+    stats.print_stats(limit)
+    return stream.getvalue()
+
+
+# ----- app integration -----
+
+def _timed_endpoint(endpoint):
+    """Endpoint wrapper marking its start / end and running sampled requests under cProfile."""
+    def before():
+        timings = _timings.get()
+        if timings is not None:
+            timings.marks['endpoint_start'] = time.perf_counter()
+        return timings
+
+    def after(timings, profiled=False):
+        timings.marks['endpoint_end'] = time.perf_counter()
+        if profiled:
+            timings.marks['profiled'] = True
+
+    if asyncio.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def async_wrapper(*args, **kwargs):
+            timings = before()
+            if timings is None:
+                return await endpoint(*args, **kwargs)
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                after(timings)
+        return async_wrapper
+
+    @functools.wraps(endpoint)
+    def wrapper(*args, **kwargs):
+        # Sync endpoints run in a worker thread, so the profile covers the
+        # endpoint itself (cProfile only sees its own thread)
+        timings = before()
+        if timings is None:
+            return endpoint(*args, **kwargs)
+        profiled = False
+        try:
+            if timings.sampled:
+                result, profiled = store.run(endpoint, *args, **kwargs)
+                return result
+            return endpoint(*args, **kwargs)
+        finally:
+            after(timings, profiled)
+    return wrapper
+
+
+class TimedRoute(APIRoute):
+    """APIRoute whose handler marks the validate / endpoint / encode phases."""
+
+    def __init__(self, path, endpoint, **kwargs):
+        super().__init__(path, _timed_endpoint(endpoint), **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def timed_handler(request):
+            timings = _timings.get()
+            if timings is not None:
+                timings.marks['route_start'] = time.perf_counter()
+            try:
+                return await handler(request)
+            finally:
+                if timings is not None:
+                    timings.marks['route_end'] = time.perf_counter()
+        return timed_handler
+
+
+class ProfilingMiddleware:
+    """ASGI middleware: per-request RequestTimings and the Server-Timing header."""
+
+    def __init__(self, app, sample_rate=SAMPLE_RATE):
+        self.app = app
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+        timings = RequestTimings(sampled=self.sample_rate > 0 and random.random() < self.sample_rate)
+        token = _timings.set(timings)
+        start = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message['type'] == 'http.response.start':
+                timings.marks['app'] = time.perf_counter() - start
+                MutableHeaders(scope=message).append('Server-Timing', timings.header())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _timings.reset(token)
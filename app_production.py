@@ -1,9 +1,22 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import pickle
-import plotly.graph_objects as go
-import plotly.express as px
+import sys
+from pathlib import Path
+
+# Model artifacts may be F1Ensemble pickles, whose class lives with the
+# training code in f1-predictor-v3-main/
+ROOT = Path(__file__).parent
+sys.path.insert(0, str(ROOT / 'f1-predictor-v3-main'))
+from preprocessing import F1Preprocessor, grid_overrides  # noqa: E402
+from training_data import MODEL_FEATURES, load_latest_driver_features, model_features  # noqa: E402
+from simulator import SeasonSimulator, SeasonTally  # noqa: E402
+from driver_index import DriverStatsIndex  # noqa: E402
+from model_registry import registry  # noqa: E402
+from batch_score import REGISTRY_NAME as PREDICTIONS_2026, PredictionTable  # noqa: E402
+
+GRID_POSITIONS = np.arange(1, 21)
+SIM_CHUNK_SIZE = 500
 
 # Page config
 st.set_page_config(
@@ -29,23 +42,75 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # Load models and data
-@st.cache_resource
 def load_production_model():
-    with open('f1_PRODUCTION_READY.pkl', 'rb') as f:
-        return pickle.load(f)
+    return registry.load('production')
+
+def model_version():
+    return registry.version_key('production')
 
 @st.cache_data
 def load_driver_data():
     return pd.read_csv('2025_final_standings.csv')
 
+@st.cache_data
+def load_driver_lookup():
+    """driverId -> 2025 standings row (drivers listed per team keep their best row)."""
+    standings = load_driver_data().drop_duplicates('driverId')
+    return standings.set_index('driverId').to_dict('index')
+
+@st.cache_resource
+def load_driver_index():
+    return DriverStatsIndex.build()
+
 @st.cache_data
 def load_momentum_data():
     return pd.read_csv('2026_driver_momentum.csv')
 
+@st.cache_data(show_spinner="Scoring production model for every driver and grid slot...")
+def compute_probability_surface(_model, driver_ids, version):
+    """
+    Podium probability for every driver x grid position 1-20, scored by the
+    production model in one batch. Rows: driverId, columns: grid position.
+    `version` is only part of the cache key.
+    """
+    preprocessor = getattr(_model, 'preprocessor', None) \
+        or F1Preprocessor(model_features(_model, default=MODEL_FEATURES))
+    latest = load_latest_driver_features().reindex(list(driver_ids))
+
+    n = len(driver_ids)
+    rows = latest.iloc[np.repeat(np.arange(n), len(GRID_POSITIONS))]
+    X = preprocessor.transform_frame(rows, grid_overrides(np.tile(GRID_POSITIONS, n)))
+    proba = _model.predict_proba(X)[:, 1].reshape(n, len(GRID_POSITIONS))
+    return pd.DataFrame(proba, index=list(driver_ids), columns=GRID_POSITIONS)
+
+@st.cache_resource
+def load_season_simulator():
+    standings = load_driver_data()
+    return SeasonSimulator.from_csv(
+        dnf_rates=dict(zip(standings['driverId'], standings['dnf_rate']))
+    )
+
+@st.cache_resource
+def load_race_predictions():
+    """Per-round 2026 predictions precomputed by batch_score.py (None until it has run)."""
+    if not registry.exists(PREDICTIONS_2026):
+        return None
+    return PredictionTable.load(PREDICTIONS_2026)
+
+@st.cache_data(show_spinner=False)
+def simulate_chunk(n_seasons, randomness, seed):
+    """One chunk of simulated seasons; cached per (size, randomness, seed)."""
+    return load_season_simulator().simulate(n_seasons, randomness, seed)
+
 try:
     model_package = load_production_model()
     drivers_data = load_driver_data()
     momentum_data = load_momentum_data()
+    driver_lookup = load_driver_lookup()
+    driver_index = load_driver_index()
+    probability_surface = compute_probability_surface(
+        model_package, tuple(drivers_data['driverId'].drop_duplicates()), model_version()
+    )
 except Exception as e:
     st.error("⚠️ Required files not found. Please check file paths.")
     st.stop()
@@ -82,8 +147,6 @@ tab1, tab2, tab3, tab4 = st.tabs(
     ["🔮 Predict Race", "📊 Driver Analysis", "🏆 2026 Outlook", "📈 Model Info"]
 )
 
-st.info("⚠️ Demo Mode: Simplified prediction logic.")
-
 # ---------------- TAB 1 ----------------
 with tab1:
     st.header("Predict Podium Finish")
@@ -91,12 +154,12 @@ with tab1:
     col1, col2 = st.columns(2)
 
     with col1:
-        driver_names = drivers_data['givenName'] + ' ' + drivers_data['familyName']
-        selected_driver = st.selectbox("Select Driver", driver_names.tolist())
-
-        driver_info = drivers_data.loc[
-            driver_names == selected_driver
-        ].iloc[0]
+        selected_id = st.selectbox(
+            "Select Driver", list(driver_lookup),
+            format_func=lambda d: f"{driver_lookup[d]['givenName']} {driver_lookup[d]['familyName']}"
+        )
+        driver_info = driver_lookup[selected_id]
+        selected_driver = f"{driver_info['givenName']} {driver_info['familyName']}"
 
         st.metric("Team", driver_info['constructorName'])
         st.metric("2025 Points", int(driver_info['total_points']))
@@ -106,45 +169,145 @@ with tab1:
     with col2:
         if st.button("🎯 Predict Podium"):
 
-            base_prob = 0.5
-            grid_factor = (21 - grid_position) / 20
-            form_factor = driver_info['total_points'] / drivers_data['total_points'].max()
+            if selected_id not in probability_surface.index:
+                st.error(f"No prediction available for {selected_driver}.")
+            else:
+                # Lookup into the precomputed driver x grid surface
+                curve = probability_surface.loc[selected_id]
+                final_prob = float(curve[grid_position])
+                confidence = abs(final_prob - 0.5) * 200
 
-            final_prob = min(0.98, base_prob + grid_factor * 0.3 + form_factor * 0.2)
-            confidence = abs(final_prob - 0.5) * 200
+                if final_prob > 0.5:
+                    st.success("🏆 Podium Likely")
+                else:
+                    st.warning("❌ Podium Unlikely")
 
-            if final_prob > 0.5:
-                st.success("🏆 Podium Likely")
-            else:
-                st.warning("❌ Podium Unlikely")
+                st.metric("Probability", f"{final_prob * 100:.1f}%")
+                st.metric("Confidence", f"{confidence:.1f}%")
 
-            st.metric("Probability", f"{final_prob * 100:.1f}%")
-            st.metric("Confidence", f"{confidence:.1f}%")
+                # plotly is only imported once a chart is actually drawn
+                import plotly.graph_objects as go
 
-            fig = go.Figure(go.Indicator(
-                mode="gauge+number",
-                value=final_prob * 100,
-                gauge={'axis': {'range': [0, 100]}}
-            ))
-            st.plotly_chart(fig, use_column_width=True)
+                fig = go.Figure(go.Indicator(
+                    mode="gauge+number",
+                    value=final_prob * 100,
+                    gauge={'axis': {'range': [0, 100]}}
+                ))
+                st.plotly_chart(fig, use_column_width=True)
+
+                # Full probability-vs-grid curve for this driver
+                fig = go.Figure(go.Scatter(
+                    x=curve.index, y=curve.values * 100, mode='lines+markers', name=selected_driver
+                ))
+                fig.add_trace(go.Scatter(
+                    x=[grid_position], y=[final_prob * 100], mode='markers',
+                    marker={'size': 14, 'color': '#E10600'}, name=f"P{grid_position}"
+                ))
+                fig.update_layout(
+                    xaxis_title="Grid Position", yaxis_title="Podium Probability (%)",
+                    yaxis_range=[0, 100], height=300
+                )
+                st.plotly_chart(fig, use_column_width=True)
 
 # ---------------- TAB 2 ----------------
 with tab2:
     st.header("Driver Analysis")
     top_10 = drivers_data.nlargest(10, 'total_points')
 
-    fig = px.bar(
-        top_10,
-        x='givenName',
-        y='total_points',
-        color='constructorName'
-    )
-    st.plotly_chart(fig, use_column_width=True)
+    # Native chart: this tab renders on every cold start, plotly doesn't need to
+    st.bar_chart(top_10, x='givenName', y='total_points', color='constructorName')
+
+    st.subheader("Head-to-Head")
+    col1, col2 = st.columns(2)
+    with col1:
+        driver1 = st.selectbox("Driver 1", driver_index.drivers,
+                               format_func=driver_index.name, key='h2h_1')
+    with col2:
+        driver2 = st.selectbox("Driver 2", driver_index.drivers, index=1,
+                               format_func=driver_index.name, key='h2h_2')
+
+    if driver1 != driver2:
+        comparison = driver_index.compare(driver1, driver2)
+        st.dataframe(
+            comparison.drop(columns=['edge']),
+            hide_index=True
+        )
+
+        # How often each driver out-ranks the rest of the grid, stat by stat
+        edges = pd.DataFrame({
+            driver_index.name(driver1): driver_index.edge_counts(driver1),
+            driver_index.name(driver2): driver_index.edge_counts(driver2),
+        })
+        edges.index = [driver_index.name(d) for d in edges.index]
+        st.bar_chart(edges.drop(index=[driver_index.name(driver1), driver_index.name(driver2)]))
+    else:
+        st.info("Pick two different drivers to compare.")
 
 # ---------------- TAB 3 ----------------
 with tab3:
     st.header("2026 Outlook")
-    st.info("Momentum-based championship outlook.")
+
+    with st.form("simulation_form"):
+        col1, col2 = st.columns(2)
+        with col1:
+            n_seasons = st.slider("Simulated Seasons", 500, 20000, 5000, step=SIM_CHUNK_SIZE)
+        with col2:
+            randomness = st.slider("Race-day Randomness", 0.0, 0.5, 0.15, step=0.05)
+        if st.form_submit_button("🎲 Simulate 2026 Season"):
+            st.session_state['simulation_params'] = (n_seasons, randomness)
+
+    if 'simulation_params' in st.session_state:
+        import plotly.express as px
+
+        n_seasons, randomness = st.session_state['simulation_params']
+        simulator = load_season_simulator()
+        progress = st.progress(0.0)
+        chart = st.empty()
+        table = st.empty()
+
+        # Chunks are cached individually, so a repeated parameter set
+        # replays instantly and a new one renders as each chunk lands
+        tally = SeasonTally.empty(simulator.n_rounds, len(simulator.drivers))
+        for i, start in enumerate(range(0, n_seasons, SIM_CHUNK_SIZE)):
+            tally = tally + simulate_chunk(
+                min(SIM_CHUNK_SIZE, n_seasons - start), randomness, i
+            )
+            summary = simulator.summary(tally).head(10)
+
+            progress.progress(tally.n / n_seasons, text=f"{tally.n:,} / {n_seasons:,} seasons")
+            fig = px.bar(
+                summary, x='championship_probability', y='driver', orientation='h',
+                labels={'championship_probability': 'Championship Probability', 'driver': ''}
+            )
+            fig.update_layout(yaxis={'autorange': 'reversed'}, xaxis_tickformat='.0%', height=400)
+            chart.plotly_chart(fig, use_column_width=True, key=f"outlook_chart_{i}")
+            table.dataframe(
+                summary[['position', 'driver', 'championship_probability',
+                         'expected_points', 'win_rate', 'podium_rate']],
+                hide_index=True
+            )
+    else:
+        st.info("Pick a simulation size and randomness, then run the 2026 season.")
+
+    st.markdown("---")
+    st.subheader("Race-by-Race Predictions")
+    race_predictions = load_race_predictions()
+    if race_predictions is None:
+        st.info("Run `python batch_score.py` to precompute the 2026 round predictions.")
+    else:
+        podiums = race_predictions.podiums()
+        selected_round = st.selectbox(
+            "Round", podiums['round'],
+            format_func=lambda r: f"R{r} · {podiums.set_index('round').at[r, 'circuit_name']}"
+        )
+        st.dataframe(
+            race_predictions.round(selected_round, limit=10)[
+                ['round_rank', 'driver', 'team', 'grid_position', 'podium_probability']
+            ],
+            hide_index=True
+        )
+        with st.expander("Predicted podium for every round"):
+            st.dataframe(podiums, hide_index=True)
 
 # ---------------- TAB 4 ----------------
 with tab4:
@@ -1,9 +1,6 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import pickle
-import plotly.graph_objects as go
-import plotly.express as px
 
 # Page config
 st.set_page_config(
@@ -18,23 +15,85 @@ st.markdown("### AI-Powered Formula 1 Predictions | 93.40% Accuracy")
 st.markdown("---")
 
 from pathlib import Path
+from driver_index import DriverStatsIndex
+from ensemble import F1Ensemble
+from model_registry import registry
+from preprocessing import grid_overrides
 
-# Load model (use absolute path relative to this script so Streamlit can be
-# launched from any working directory)
+GRID_POSITIONS = np.arange(1, 21)
+
+# How easily each circuit type lets drivers recover from their grid slot;
+# grid_position is scaled towards P1 by this factor, as in app_v3
+CIRCUIT_TYPE_OVERTAKING = {
+    "Street Circuit": 0.3,
+    "Permanent Circuit": 0.5,
+    "High Speed": 0.7,
+}
+
+
+def race_overrides(grid, circuit_types):
+    """Grid feature columns for start slots (scalar or array) on the given circuit type(s)."""
+    grid = np.asarray(grid)
+    overtaking = np.vectorize(CIRCUIT_TYPE_OVERTAKING.get)(circuit_types)
+    overrides = grid_overrides(grid)
+    overrides['grid_position'] = 1 + (grid - 1) * (1 - overtaking)
+    return overrides
+
+# Load model and standings through the shared registry (each artifact is
+# unpickled at most once per process)
 ROOT = Path(__file__).parent
 
-@st.cache_resource
 def load_model():
-    with open(ROOT / 'my_f1_model_FINAL_OPTIMIZED.pkl', 'rb') as f:
-        return pickle.load(f)
+    return registry.load('ensemble-optimized')
+
+@st.cache_resource
+def load_ensemble():
+    return F1Ensemble.from_package(load_model())
 
 @st.cache_data
 def load_2025_data():
-    with open(ROOT / '2025_final_standings.pkl', 'rb') as f:
-        return pickle.load(f)
+    return registry.load('standings-2025')
+
+@st.cache_data
+def load_driver_positions():
+    """Display name -> row position in the 2025 standings frame."""
+    data = load_2025_data()
+    names = data['givenName'] + ' ' + data['familyName']
+    return {name: i for i, name in enumerate(names)}
+
+@st.cache_resource
+def load_driver_index():
+    return DriverStatsIndex.build(ROOT / 'data/processed/f1_v3_complete_features.csv')
+
+@st.cache_data(show_spinner=False)
+def sweep_grid(driver_positions, circuit_types):
+    """
+    Probability for every (driver, circuit type, grid slot 1-20) combination,
+    scored in a single batched pass through the ensemble.
+    """
+    ensemble = load_ensemble()
+    drivers = load_2025_data().iloc[list(driver_positions)]
+    n_drivers, n_types, n_grid = len(drivers), len(circuit_types), len(GRID_POSITIONS)
+
+    rows = drivers.iloc[np.repeat(np.arange(n_drivers), n_types * n_grid)]
+    types = np.tile(np.repeat(list(circuit_types), n_grid), n_drivers)
+    grid = np.tile(GRID_POSITIONS, n_drivers * n_types)
+
+    X = ensemble.preprocessor.transform_frame(rows, race_overrides(grid, types))
+    proba = ensemble.predict_proba(X)[:, 1]
+
+    return pd.DataFrame({
+        'Driver': (rows['givenName'] + ' ' + rows['familyName']).to_numpy(),
+        'Circuit Type': types,
+        'Grid': grid,
+        'Probability': proba,
+    })
 
 model_package = load_model()
+ensemble = load_ensemble()
 driver_data_2025 = load_2025_data()
+driver_positions = load_driver_positions()
+driver_index = load_driver_index()
 
 # Sidebar - Model Info
 with st.sidebar:
@@ -62,12 +121,10 @@ with tab1:
     
     with col1:
         # Driver selection
-        driver_names = driver_data_2025['givenName'] + ' ' + driver_data_2025['familyName']
-        selected_driver = st.selectbox("Select Driver", driver_names.tolist())
+        selected_driver = st.selectbox("Select Driver", list(driver_positions))
         
         # Get driver data
-        driver_idx = driver_names[driver_names == selected_driver].index[0]
-        driver_info = driver_data_2025.iloc[driver_idx]
+        driver_info = driver_data_2025.iloc[driver_positions[selected_driver]]
         
         st.markdown(f"**Team:** {driver_info['constructorName']}")
         st.markdown(f"**2025 Points:** {driver_info['driver_season_points']:.0f}")
@@ -82,50 +139,15 @@ with tab1:
         st.markdown("### Prediction")
         
         if st.button("🎯 Predict Podium Finish", type="primary"):
-            # Prepare features for prediction
-            # (You'll need to construct this properly based on your features)
-            prediction_data = driver_info.to_dict()
-            prediction_data['grid_position'] = grid_position
-
             try:
-                # Construct feature dictionary from driver data
-                feature_dict = {}
-
-                for feature in model_package['features']:
-                    if feature in prediction_data:
-                        feature_dict[feature] = prediction_data[feature]
-                    else:
-                        # Set defaults for missing features
-                        feature_dict[feature] = 0
-
-                # Override with race-specific parameters
-                feature_dict['grid_position'] = grid_position
-
-                # Create DataFrame
-                X_pred = pd.DataFrame([feature_dict])
-
-                # Encode categorical columns
-                for col in model_package.get('categorical_cols', []):
-                    if col in X_pred.columns:
-                        le = model_package['label_encoders'].get(col)
-                        if le:
-                            try:
-                                X_pred[col] = le.transform(X_pred[col].astype(str))
-                            except Exception:
-                                X_pred[col] = -1
-
-                # Ensure correct column order
-                X_pred = X_pred.reindex(columns=model_package['features'], fill_value=0)
-
-                # Get predictions from ensemble
-                all_probas = []
-                for name, model, weight in model_package['models']:
-                    proba = model.predict_proba(X_pred)[:, 1][0]
-                    all_probas.append(proba)
-
-                # Weighted average
-                weights = model_package.get('weights', [1/len(all_probas)]*len(all_probas))
-                final_proba = np.average(all_probas, weights=weights)
+                # Raw driver row -> encoded float32 feature matrix in one call
+                X_pred = ensemble.preprocessor.transform_frame(
+                    [driver_info.to_dict()],
+                    overrides=race_overrides(grid_position, circuit_type)
+                )
+
+                # Weighted ensemble probability (all members in one batched call)
+                final_proba = ensemble.predict_proba(X_pred)[:, 1][0]
 
                 # Make prediction
                 prediction = 1 if final_proba >= model_package.get('threshold', 0.5) else 0
@@ -151,7 +173,9 @@ with tab1:
                     st.metric("Probability", f"{result['probability']:.1f}%")
                     st.metric("Confidence", f"{result['confidence']:.1f}%")
 
-                # Probability gauge
+                # Probability gauge (plotly is only imported once a chart is drawn)
+                import plotly.graph_objects as go
+
                 fig = go.Figure(go.Indicator(
                     mode = "gauge+number",
                     value = result['probability'],
@@ -177,32 +201,84 @@ with tab1:
             except Exception as e:
                 st.error(f"Prediction error: {e}")
 
+    # What-if sweep: every grid slot for several drivers / circuit types at once
+    st.markdown("---")
+    st.subheader("📈 What-if Grid Sweep")
+    st.markdown("*Podium probability from every starting slot, P1 to P20*")
+
+    with st.form("sweep_form"):
+        sweep_col1, sweep_col2 = st.columns(2)
+        with sweep_col1:
+            sweep_drivers = st.multiselect("Drivers", list(driver_positions),
+                                           default=[selected_driver])
+        with sweep_col2:
+            sweep_types = st.multiselect("Circuit Types", list(CIRCUIT_TYPE_OVERTAKING),
+                                         default=[circuit_type])
+        run_sweep = st.form_submit_button("📊 Run Sweep")
+
+    if run_sweep and sweep_drivers and sweep_types:
+        positions = tuple(driver_positions[name] for name in sweep_drivers)
+        sweep = sweep_grid(positions, tuple(sweep_types))
+
+        import plotly.express as px
+
+        fig = px.line(
+            sweep.assign(Probability=sweep['Probability'] * 100),
+            x='Grid', y='Probability', color='Driver',
+            line_dash='Circuit Type' if len(sweep_types) > 1 else None,
+            markers=True,
+            labels={'Probability': 'Podium Probability (%)', 'Grid': 'Grid Position'}
+        )
+        fig.update_layout(yaxis_range=[0, 100], height=400)
+        st.plotly_chart(fig, width='stretch')
+
+        table = sweep.pivot_table(index=['Driver', 'Circuit Type'], columns='Grid',
+                                  values='Probability')
+        table.columns = [f"P{g}" for g in table.columns]
+        st.dataframe(table.style.format("{:.1%}"), width='stretch')
+
 with tab2:
     st.header("📈 Driver Performance Analysis")
     
     # Top performers
     top_10 = driver_data_2025.nlargest(10, 'driver_season_points')
     
-    fig = px.bar(
-        top_10,
-        x='givenName',
-        y='driver_season_points',
-        color='constructorName',
-        title="Top 10 Drivers - 2025 Season Points"
-    )
-    st.plotly_chart(fig, width='stretch')
+    # Native chart: this tab renders on every cold start, plotly doesn't need to
+    st.markdown("**Top 10 Drivers - 2025 Season Points**")
+    st.bar_chart(top_10, x='givenName', y='driver_season_points', color='constructorName')
     
-    # Driver comparison
+    # Driver comparison (lookups into the precomputed stats index)
     st.subheader("Compare Drivers")
     col1, col2 = st.columns(2)
     
     with col1:
-        driver1 = st.selectbox("Driver 1", driver_names.tolist(), key='d1')
+        driver1 = st.selectbox("Driver 1", driver_index.drivers,
+                               format_func=driver_index.name, key='d1')
     with col2:
-        driver2 = st.selectbox("Driver 2", driver_names.tolist(), key='d2')
+        driver2 = st.selectbox("Driver 2", driver_index.drivers, index=1,
+                               format_func=driver_index.name, key='d2')
     
-    # Show comparison metrics
-    # (Add comparison logic here)
+    if driver1 == driver2:
+        st.info("Pick two different drivers to compare.")
+    else:
+        comparison = driver_index.compare(driver1, driver2)
+        name1, name2 = driver_index.name(driver1), driver_index.name(driver2)
+
+        col1, col2, col3 = st.columns(3)
+        col1.metric(f"{name1} leads", f"{(comparison['edge'] > 0).sum()} stats",
+                    help=driver_index.team(driver1))
+        col2.metric(f"{name2} leads", f"{(comparison['edge'] < 0).sum()} stats",
+                    help=driver_index.team(driver2))
+        col3.metric("Level", f"{(comparison['edge'] == 0).sum()} stats")
+
+        for section, rows in comparison.groupby('section', sort=False):
+            st.markdown(f"**{section}**")
+            leader = np.where(rows['edge'] > 0, name1, np.where(rows['edge'] < 0, name2, "—"))
+            st.dataframe(
+                rows.drop(columns=['section', 'edge']).assign(Better=leader)
+                    .style.format({name1: "{:.2f}", name2: "{:.2f}", 'delta': "{:+.2f}"}),
+                hide_index=True, width='stretch'
+            )
 
 with tab3:
     st.header("ℹ️ About This Project")
@@ -1,7 +1,11 @@
 import streamlit as st
 import pandas as pd
-import pickle
 import numpy as np
+from training_data import model_features
+from preprocessing import F1Preprocessor, grid_overrides
+from model_registry import file_sha256, registry
+from prediction_store import PredictionStore
+from standings_index import StandingsIndex
 
 # Page config
 st.set_page_config(
@@ -11,12 +15,17 @@ st.set_page_config(
 )
 
 
-# Load model
-@st.cache_resource
+MODEL_NAME = 'podium-catboost'
+
+
+# Load model (once per process, via the shared registry)
 def load_model():
-    with open('models/ensemble/cat_model.pkl', 'rb') as f:
-        model = pickle.load(f)
-    return model
+    return registry.load(MODEL_NAME)
+
+
+def model_version():
+    """Changes whenever a new model version is registered (part of the prediction cache key)."""
+    return registry.version_key(MODEL_NAME)
 
 
 # Load historical data
@@ -26,6 +35,28 @@ def load_data():
     return df
 
 
+@st.cache_data
+def features_sha256():
+    """Hash of the feature file load_data() reads (part of the prediction store key)."""
+    return file_sha256('data/processed/f1_v3_complete_features.csv')
+
+
+@st.cache_data
+def load_latest_driver_rows():
+    """Most recent feature row per driver code (replaces per-click filtering)."""
+    return load_data().groupby('driverCode').tail(1).set_index('driverCode')
+
+
+@st.cache_resource
+def load_standings_index():
+    return StandingsIndex.build()
+
+
+@st.cache_resource
+def load_prediction_store():
+    return PredictionStore.open()
+
+
 # Feature columns (47 features)
 FEATURE_COLUMNS = [
     'grid_position', 'front_row_start', 'quali_made_q3', 'quali_made_q2',
@@ -95,24 +126,23 @@ with st.sidebar:
 
     st.markdown("---")
 
-    # Championship Standings
-    st.markdown("### 🏆 2025 Championship")
-    st.markdown("*After Mexico GP (R20/24)*")
+    # Championship Standings (latest round in the race results)
+    standings_index = load_standings_index()
+    season = standings_index.latest_season
+    n_rounds = standings_index.season(season).n_rounds
+    st.markdown(f"### 🏆 {season} Championship")
+    st.markdown(f"*After Round {n_rounds}/{n_rounds}*")
 
-    standings_data = {
-        'Driver': ['NOR', 'PIA', 'VER', 'RUS', 'LEC'],
-        'Points': [357, 356, 321, 258, 210]
-    }
-    standings_df = pd.DataFrame(standings_data)
+    standings_df = standings_index.standings(season).head(5)
 
     for idx, row in standings_df.iterrows():
+        points, gap = int(row['points']), int(row['gap_to_leader'])
         if idx == 0:
-            st.markdown(f"**🥇 {row['Driver']} - {row['Points']}** 🔥")
+            st.markdown(f"**🥇 {row['code']} - {points}** 🔥")
         elif idx == 1:
-            st.markdown(f"**🥈 {row['Driver']} - {row['Points']}** (-1)")
+            st.markdown(f"**🥈 {row['code']} - {points}** (-{gap})")
         else:
-            gap = standings_df.iloc[0]['Points'] - row['Points']
-            st.markdown(f"{idx + 1}. {row['Driver']} - {row['Points']} (-{gap})")
+            st.markdown(f"{idx + 1}. {row['code']} - {points} (-{gap})")
 
     st.markdown("---")
     st.markdown("### ⚙️ Circuit Adjustments")
@@ -127,108 +157,114 @@ with st.sidebar:
 st.header("🏁 Quick Prediction")
 st.markdown("*Circuit-aware predictions with overtaking probability*")
 
-col1, col2 = st.columns([3, 2])
-
-with col1:
-    st.subheader("📋 Qualifying Grid (Top 10)")
-
-    subcol1, subcol2 = st.columns(2)
-
-    quali_grid = {}
-    for i in range(1, 11):
-        col = subcol1 if i <= 5 else subcol2
-        with col:
-            driver = st.selectbox(
-                f"P{i}",
-                options=DRIVERS,
-                key=f"p{i}",
-                index=min(i - 1, len(DRIVERS) - 1)
-            )
-            quali_grid[i] = driver
-
-with col2:
-    st.subheader("🏁 Race Selection")
-
-    selected_race = st.selectbox(
-        "Select Race",
-        options=REMAINING_RACES,
-        index=0
-    )
-
-    # Get circuit characteristics
-    circuit_char = CIRCUIT_CHARACTERISTICS[selected_race]
-
-    # Display circuit info
-    st.info(f"**Overtaking Factor:** {circuit_char['overtaking_factor']:.0%}\n\n"
-            f"**Grid Importance:** {circuit_char['grid_importance']:.0%}")
-
-    st.markdown("---")
-
-    predict_button = st.button("🚀 Predict Podium", type="primary", use_container_width=True)
+# Every row of the grid is scored in a single predict_proba call; results
+# are cached per (grid, race, model version) and recorded in the prediction
+# store, which answers grids already predicted in earlier sessions
+@st.cache_data(show_spinner=False)
+def predict_grid(grid, race, version):
+    store = load_prediction_store()
+    if store is None:
+        return score_grid(grid, race)
+    inputs = {'grid': list(grid), 'race': race, 'features_sha256': features_sha256()}
+    return pd.DataFrame(store.get_or_compute('app_v3', version, inputs,
+                                             lambda: score_grid(grid, race), circuit=race))
+
+
+def score_grid(grid, race):
+    model = load_model()
+    latest = load_latest_driver_rows()
+    circuit_char = CIRCUIT_CHARACTERISTICS[race]
+
+    # Only build the columns the model was trained on (selected schema)
+    model_columns = model_features(model, default=FEATURE_COLUMNS)
+    preprocessor = F1Preprocessor(model_columns)
+
+    positions = np.arange(1, len(grid) + 1)
+    known = np.isin(grid, latest.index)
+    rows = latest.reindex(list(grid))
+
+    # ADJUSTED: Reduce grid position impact based on circuit
+    adjusted_grid = 1 + (positions - 1) * (1 - circuit_char['overtaking_factor'])
+    overrides = grid_overrides(positions)
+    overrides['grid_position'] = adjusted_grid  # CIRCUIT-ADJUSTED!
+
+    # Boost driver form for high-overtaking circuits
+    if circuit_char['overtaking_factor'] > 0.6:
+        for col, boost in [('driver_last5_avg_points', 1.3),
+                           ('circuit_driver_win_rate', 1.5)]:
+            if col in rows.columns:
+                rows[col] = rows[col] * boost
+
+    X = preprocessor.transform_frame(rows, overrides)
+    prob = model.predict_proba(X)[:, 1]
+
+    # Apply circuit-specific adjustment to probability
+    # (boost lower grid positions on overtaking circuits)
+    prob = np.where(positions > 3, prob * (1 + circuit_char['overtaking_factor'] * 0.3), prob)
+
+    # Drivers without history fall back to a flat prior
+    prob = np.where(known, prob, np.where(positions <= 10, 0.15, 0.05))
+    adjusted_grid = np.where(known, adjusted_grid, positions)
+
+    return pd.DataFrame({
+        'Position': positions,
+        'Driver': list(grid),
+        'Actual_Grid': positions,
+        'Adjusted_Grid': adjusted_grid,
+        'Podium_Probability': prob
+    })
+
+
+# Inputs live in a form so changing a selectbox doesn't rerun the page
+with st.form("grid_form"):
+    col1, col2 = st.columns([3, 2])
+
+    with col1:
+        st.subheader("📋 Qualifying Grid (Top 10)")
+
+        subcol1, subcol2 = st.columns(2)
+
+        quali_grid = {}
+        for i in range(1, 11):
+            col = subcol1 if i <= 5 else subcol2
+            with col:
+                driver = st.selectbox(
+                    f"P{i}",
+                    options=DRIVERS,
+                    key=f"p{i}",
+                    index=min(i - 1, len(DRIVERS) - 1)
+                )
+                quali_grid[i] = driver
+
+    with col2:
+        st.subheader("🏁 Race Selection")
+
+        selected_race = st.selectbox(
+            "Select Race",
+            options=REMAINING_RACES,
+            index=0
+        )
+
+        st.markdown("---")
+
+        predict_button = st.form_submit_button("🚀 Predict Podium", type="primary",
+                                               use_container_width=True)
+
+# Get circuit characteristics
+circuit_char = CIRCUIT_CHARACTERISTICS[selected_race]
+
+# Display circuit info
+st.info(f"**{selected_race}** — **Overtaking Factor:** {circuit_char['overtaking_factor']:.0%} · "
+        f"**Grid Importance:** {circuit_char['grid_importance']:.0%}")
 
 # Prediction
 if predict_button:
     with st.spinner("🤖 Running circuit-aware prediction..."):
         try:
-            model = load_model()
-            df_hist = load_data()
-
-            results = []
-
-            for pos in range(1, 11):
-                driver = quali_grid[pos]
-                driver_data = df_hist[df_hist['driverCode'] == driver]
-
-                if len(driver_data) > 0:
-                    features = {}
-
-                    # ADJUSTED: Reduce grid position impact based on circuit
-                    grid_penalty = (pos - 1) * (1 - circuit_char['overtaking_factor'])
-                    adjusted_grid = 1 + grid_penalty
-
-                    features['grid_position'] = adjusted_grid  # CIRCUIT-ADJUSTED!
-                    features['front_row_start'] = 1 if pos <= 2 else 0
-                    features['quali_made_q3'] = 1 if pos <= 10 else 0
-                    features['quali_made_q2'] = 1 if pos <= 15 else 0
-
-                    recent = driver_data.tail(1).iloc[0]
-
-                    for col in FEATURE_COLUMNS:
-                        if col not in features:
-                            if col in recent.index:
-                                features[col] = recent[col]
-                            else:
-                                features[col] = 0
-
-                    # Boost driver form for high-overtaking circuits
-                    if circuit_char['overtaking_factor'] > 0.6:
-                        features['driver_last5_avg_points'] *= 1.3
-                        features['circuit_driver_win_rate'] *= 1.5
-
-                    X = pd.DataFrame([features])[FEATURE_COLUMNS].fillna(0)
-                    prob = model.predict_proba(X)[0][1]
-
-                    # Apply circuit-specific adjustment to probability
-                    if pos > 3:  # Boost lower grid positions on overtaking circuits
-                        prob *= (1 + circuit_char['overtaking_factor'] * 0.3)
-
-                    results.append({
-                        'Position': pos,
-                        'Driver': driver,
-                        'Actual_Grid': pos,
-                        'Adjusted_Grid': adjusted_grid,
-                        'Podium_Probability': prob
-                    })
-                else:
-                    results.append({
-                        'Position': pos,
-                        'Driver': driver,
-                        'Actual_Grid': pos,
-                        'Adjusted_Grid': pos,
-                        'Podium_Probability': 0.15 if pos <= 10 else 0.05
-                    })
-
-            results_df = pd.DataFrame(results).sort_values('Podium_Probability', ascending=False)
+            grid = tuple(quali_grid[pos] for pos in range(1, 11))
+            results = predict_grid(grid, selected_race, model_version())
+
+            results_df = results.sort_values('Podium_Probability', ascending=False)
 
             # Display results
             st.markdown("---")
@@ -0,0 +1,263 @@
+"""
+Walk-Forward Backtest
+For every round from 2023 on, trains each model on all earlier rounds and
+predicts that round, then scores every race with evaluate.py's metrics.
+Rounds run in parallel in a process pool. The feature matrix and every
+fitted (model, round) are cached under models/backtest/, keyed by content
+hashes, so a rerun only fits rounds whose training data or parameters
+changed (normally just the newly added ones).
+
+The per-round table (one row per model x race) replaces the 4-race
+holdout as the basis for choosing a model: the summary reports each
+metric's mean and standard error, and paired per-round differences against
+the best model.
+
+Usage:
+    python backtest.py                                     # all models, 2023 on
+    python backtest.py --models XGBoost LightGBM --workers 4
+    python backtest.py --n-estimators 200 --start 2024 1   # quick comparison
+"""
+
+import argparse
+import hashlib
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from evaluate import race_metrics
+from preprocessing import F1Preprocessor
+from training_data import ROOT, MODEL_FEATURES, default_dataset_path, load_dataset, new_models
+
+CACHE_DIR = ROOT / 'models/backtest'
+REPORT_PATH = CACHE_DIR / 'backtest_metrics.csv'
+START = (2023, 1)
+METRICS = ['winner_hit', 'podium_overlap', 'top5_recall', 'log_loss', 'brier']
+
+# Each worker fits one model at a time, so the boosters run single-threaded
+# (and CatBoost's training logs stay out of the working directory)
+SINGLE_THREAD = {
+    'CatBoost': {'thread_count': 1, 'allow_writing_files': False},
+    'XGBoost': {'n_jobs': 1},
+    'LightGBM': {'n_jobs': 1},
+}
+N_ESTIMATORS_PARAM = {'CatBoost': 'iterations', 'XGBoost': 'n_estimators',
+                      'LightGBM': 'n_estimators'}
+
+
+def _digest(*parts):
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else repr(part).encode())
+    return digest.hexdigest()[:16]
+
+
+def feature_matrix(df, features, cache_dir=CACHE_DIR):
+    """float32 (rows, features) matrix for `df`, cached as .npy keyed by content."""
+    key = _digest(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes(), features)
+    path = cache_dir / 'features' / f'{key}.npy'
+    if path.exists():
+        return np.load(path), True
+    X = F1Preprocessor(features).transform(df)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.save(path, X)
+    return X, False
+
+
+def make_model(name, n_estimators=None):
+    params = dict(SINGLE_THREAD[name])
+    if n_estimators:
+        params[N_ESTIMATORS_PARAM[name]] = n_estimators
+    return new_models()[name].set_params(**params)
+
+
+def round_spans(df, start=START):
+    """
+    (season, round, first row, end row) for every round from `start` on;
+    `df` is sorted by (season, round), so a round's training rows are the
+    prefix [0, first row).
+    """
+    keys = df['season'].to_numpy() * 100 + df['round'].to_numpy()
+    bounds = np.flatnonzero(np.r_[True, np.diff(keys) != 0, True])
+    spans = []
+    for first, end in zip(bounds[:-1], bounds[1:]):
+        season, race_round = divmod(int(keys[first]), 100)
+        if (season, race_round) >= start and first > 0:
+            spans.append((season, race_round, int(first), int(end)))
+    return spans
+
+
+# ----- worker side -----
+
+_shared = {}
+
+
+def _init_worker(X, y):
+    _shared['X'], _shared['y'] = X, y
+
+
+def fit_round(name, n_estimators, first, end, path):
+    """Fit on rows [0, first), predict rows [first, end), cache model + predictions at `path`."""
+    X, y = _shared['X'], _shared['y']
+    start = time.perf_counter()
+    model = make_model(name, n_estimators)
+    model.fit(X[:first], y[:first])
+    proba = model.predict_proba(X[first:end])[:, 1]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'wb') as f:
+        pickle.dump({'model': model, 'proba': proba}, f)
+    return proba, time.perf_counter() - start
+
+
+# ----- driver side -----
+
+def run(df, X, y, names, n_estimators=None, start=START, workers=None, cache_dir=CACHE_DIR):
+    """
+    Walk-forward predictions for every (model, round): a DataFrame with
+    model, season, round, position and proba per test row.
+    """
+    spans = round_spans(df, start)
+    cached, pending = {}, []
+    for name in names:
+        params = make_model(name, n_estimators).get_params()
+        for season, race_round, first, end in spans:
+            key = _digest(name, sorted(params.items(), key=lambda kv: kv[0]),
+                          X[:end].tobytes(), y[:first].tobytes())
+            path = cache_dir / 'fits' / name / f'{season}_{race_round:02d}_{key}.pkl'
+            if path.exists():
+                with open(path, 'rb') as f:
+                    cached[(name, season, race_round)] = pickle.load(f)['proba']
+            else:
+                pending.append((name, season, race_round, first, end, path))
+
+    print(f"   {len(cached)} (model, round) fits cached, {len(pending)} to compute")
+    results = dict(cached)
+    if pending:
+        fit_seconds = 0.0
+        start_time = time.perf_counter()
+        if workers == 1:
+            _init_worker(X, y)
+            for name, season, race_round, first, end, path in pending:
+                proba, seconds = fit_round(name, n_estimators, first, end, path)
+                results[(name, season, race_round)] = proba
+                fit_seconds += seconds
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(X, y)) as pool:
+                futures = {pool.submit(fit_round, name, n_estimators, first, end, path):
+                           (name, season, race_round)
+                           for name, season, race_round, first, end, path in pending}
+                for done, future in enumerate(as_completed(futures), 1):
+                    proba, seconds = future.result()
+                    results[futures[future]] = proba
+                    fit_seconds += seconds
+                    if done % 10 == 0 or done == len(futures):
+                        print(f"   Fitted {done}/{len(futures)}...")
+        print(f"   ⚡ {len(pending)} fits: {fit_seconds:.1f}s of fitting in "
+              f"{time.perf_counter() - start_time:.1f}s wall time")
+
+    frames = []
+    for name in names:
+        for season, race_round, first, end in spans:
+            rows = df.iloc[first:end]
+            frames.append(pd.DataFrame({
+                'model': name,
+                'season': season,
+                'round': race_round,
+                'position': rows['position'].to_numpy(),
+                'proba': results[(name, season, race_round)],
+            }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def round_metrics(predictions):
+    """Per-round metrics table: one row per (model, season, round)."""
+    tables = []
+    for name, rows in predictions.groupby('model', sort=False):
+        races = rows.groupby(['season', 'round'], sort=True).ngroup().to_numpy()
+        table = race_metrics(races, rows['position'], rows['proba'])
+        y = (rows['position'].to_numpy() <= 3).astype(float)
+        table['brier'] = (np.bincount(races, weights=(rows['proba'].to_numpy() - y) ** 2)
+                          / np.bincount(races))
+        keys = rows[['season', 'round']].drop_duplicates().sort_values(['season', 'round'])
+        table.insert(0, 'model', name)
+        table.insert(1, 'season', keys['season'].to_numpy())
+        table.insert(2, 'round', keys['round'].to_numpy())
+        tables.append(table)
+    return pd.concat(tables, ignore_index=True)
+
+
+def summarize(metrics):
+    """Mean and standard error of every metric per model."""
+    grouped = metrics.groupby('model', sort=False)[METRICS]
+    summary = grouped.mean().add_suffix('_mean').join(grouped.sem().add_suffix('_se'))
+    return summary[[f'{m}_{s}' for m in METRICS for s in ('mean', 'se')]]
+
+
+def paired_comparison(metrics, reference, metric='log_loss'):
+    """Per-round `metric` differences of every model against `reference` (mean, se, t)."""
+    wide = metrics.pivot_table(index=['season', 'round'], columns='model', values=metric)
+    rows = []
+    for name in wide.columns.drop(reference):
+        diff = wide[name] - wide[reference]
+        se = diff.std(ddof=1) / np.sqrt(len(diff))
+        rows.append({'model': name, 'vs': reference, f'{metric}_diff': diff.mean(),
+                     'se': se, 't': diff.mean() / se if se > 0 else np.nan, 'rounds': len(diff)})
+    return pd.DataFrame(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Walk-forward backtest across seasons and rounds")
+    parser.add_argument('--models', nargs='+', choices=list(SINGLE_THREAD),
+                        default=list(SINGLE_THREAD))
+    parser.add_argument('--start', nargs=2, type=int, default=list(START),
+                        metavar=('SEASON', 'ROUND'), help="first predicted round")
+    parser.add_argument('--n-estimators', type=int,
+                        help="override the production tree count (faster, less faithful)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help="processes fitting rounds in parallel")
+    parser.add_argument('--data', help="feature CSV (default: complete dataset or feature store)")
+    parser.add_argument('--output', default=str(REPORT_PATH))
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("🔁 WALK-FORWARD BACKTEST")
+    print("=" * 70)
+
+    df = load_dataset(args.data or default_dataset_path())
+    df = df.sort_values(['season', 'round'], kind='stable').reset_index(drop=True)
+    features = [c for c in MODEL_FEATURES if c in df.columns]
+    X, from_cache = feature_matrix(df, features)
+    y = df['podium'].to_numpy()
+    spans = round_spans(df, tuple(args.start))
+    print(f"\n📊 {len(df):,} rows, {len(features)} features "
+          f"({'cached' if from_cache else 'built'} matrix)")
+    print(f"   {len(spans)} rounds from {args.start[0]} R{args.start[1]} x {len(args.models)} models, "
+          f"{args.workers} workers")
+
+    predictions = run(df, X, y, args.models, args.n_estimators, tuple(args.start), args.workers)
+    metrics = round_metrics(predictions)
+
+    summary = summarize(metrics)
+    print("\n🏁 PER-MODEL SUMMARY (mean ± standard error over rounds):")
+    for name, row in summary.iterrows():
+        cells = "  ".join(f"{m} {row[f'{m}_mean']:.3f}±{row[f'{m}_se']:.3f}" for m in METRICS)
+        print(f"   {name:9s} {cells}")
+
+    if len(args.models) > 1:
+        best = summary['log_loss_mean'].idxmin()
+        print(f"\n⚖️  PAIRED LOG-LOSS DIFFERENCES vs {best} (positive = worse):")
+        print(paired_comparison(metrics, best).to_string(index=False, float_format=lambda v: f"{v:.4f}"))
+
+    Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+    metrics.to_csv(args.output, index=False)
+    print(f"\n💾 Saved: {args.output}")
+    print("=" * 70)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,220 @@
+"""
+2026 Batch Scoring
+Scores every driver-round of 2026_race_grids.csv with each available podium
+model in one vectorized pass per model and writes the prediction table the
+apps and API serve, keyed on (round, driverId). Pages read this table
+instead of running inference.
+
+Each row is the driver's latest engineered feature row with the grid
+columns set from the round's estimated grid position; drivers with no
+history (2026 rookies) score on the preprocessor defaults. Alongside the
+probabilities the table stores each row's contributing factors (explain.py
+factor groups, in probability points, averaged over the models).
+Each run is recorded in the prediction store (prediction_store.py); a
+rerun on unchanged grids, features and models reads its table back.
+
+    table = PredictionTable.load()
+    table.round(5)              # one round, best first
+    table.driver('norris')      # one driver, every round
+
+Usage:
+    python batch_score.py
+    python batch_score.py --models podium-xgb podium-catboost
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from explain import Explainer
+from model_registry import file_sha256, registry
+from prediction_store import PredictionStore
+from preprocessing import F1Preprocessor, grid_overrides
+from training_data import (FEATURES_PATH, MODEL_FEATURES, ROOT, load_latest_driver_features,
+                           model_features)
+
+GRIDS_PATH = ROOT / '2026_race_grids.csv'
+OUTPUT_PATH = ROOT / '2026_race_predictions.csv'
+REGISTRY_NAME = 'predictions-2026'
+FACTOR_PREFIX = 'factor_'
+
+# Table column suffix -> registry name; models not on disk are skipped
+SCORING_MODELS = {
+    'xgb': 'podium-xgb',
+    'catboost': 'podium-catboost',
+    'lightgbm': 'podium-lightgbm',
+    'ensemble': 'podium-ensemble',
+    'student': 'podium-student',
+}
+
+
+def load_grid_rows(path=GRIDS_PATH):
+    """One row per (round, driverId); mid-season team switches list a driver twice."""
+    grids = pd.read_csv(path).drop_duplicates(['round', 'driverId'])
+    return grids.sort_values(['round', 'estimated_grid_position']).reset_index(drop=True)
+
+
+def score(grids, models):
+    """
+    Podium probability of every grid row under each model, as a
+    {suffix: (rows,) array}, and the factor impacts of every model with
+    native contributions, as {suffix: (rows, factors) DataFrame}. Models
+    sharing a feature list share one matrix.
+    """
+    latest = load_latest_driver_features().reindex(grids['driverId'])
+    overrides = grid_overrides(grids['estimated_grid_position'].to_numpy())
+
+    matrices, scores, impacts = {}, {}, {}
+    for suffix, model in models.items():
+        preprocessor = getattr(model, 'preprocessor', None) \
+            or F1Preprocessor(model_features(model, default=MODEL_FEATURES))
+        key = tuple(preprocessor.features)
+        if key not in matrices:
+            matrices[key] = preprocessor.transform_frame(latest, overrides)
+        scores[suffix] = model.predict_proba(matrices[key])[:, 1]
+        try:
+            impacts[suffix] = Explainer(model, preprocessor.features).explain(matrices[key])
+        except TypeError:
+            pass  # e.g. the lookup-table student: no trees to attribute
+    return scores, impacts
+
+
+def factor_column(factor):
+    return FACTOR_PREFIX + factor.lower().replace(' & ', '_').replace(' ', '_')
+
+
+def build_table(grids, scores, impacts=None):
+    """
+    Prediction table: one row per driver-round, per-model and consensus
+    probability, and the consensus contributing factors.
+    """
+    table = pd.DataFrame({
+        'season': grids['season'],
+        'round': grids['round'],
+        'circuit_name': grids['circuit_name'],
+        'circuit_type': grids['circuit_type'],
+        'driverId': grids['driverId'],
+        'driver': grids['givenName'] + ' ' + grids['familyName'],
+        'team': grids['constructorName'],
+        'grid_position': grids['estimated_grid_position'],
+    })
+    for suffix, proba in scores.items():
+        table[f'p_{suffix}'] = np.asarray(proba, dtype=float).round(4)
+    table['podium_probability'] = np.mean(list(scores.values()), axis=0).round(4)
+    if impacts:
+        factors = list(dict.fromkeys(f for frame in impacts.values() for f in frame.columns))
+        consensus = sum(frame.reindex(columns=factors, fill_value=0).to_numpy()
+                        for frame in impacts.values()) / len(impacts)
+        for i, factor in enumerate(factors):
+            table[factor_column(factor)] = consensus[:, i].round(4)
+    table['round_rank'] = (table.groupby('round')['podium_probability']
+                           .rank(method='first', ascending=False).astype(int))
+    table['predicted_podium'] = table['round_rank'] <= 3
+    return table.sort_values(['round', 'round_rank']).reset_index(drop=True)
+
+
+class PredictionTable:
+    """
+    Scored 2026 driver-rounds, sorted by (round, round_rank). `rounds` and
+    `drivers` map a round number / driverId to its row positions, so a
+    filtered read is one iloc rather than a scan.
+    """
+
+    def __init__(self, frame):
+        self.frame = frame.sort_values(['round', 'round_rank']).reset_index(drop=True)
+        self.rounds = {int(r): rows for r, rows in self.frame.groupby('round').indices.items()}
+        self.drivers = self.frame.groupby('driverId').indices
+
+    @classmethod
+    def load(cls, ref=REGISTRY_NAME):
+        return cls(registry.load(ref))
+
+    @property
+    def models(self):
+        return [col[2:] for col in self.frame.columns if col.startswith('p_')]
+
+    def round(self, round_number, limit=None):
+        rows = self.frame.iloc[self.rounds[round_number]]
+        return rows if limit is None else rows.head(limit)
+
+    def driver(self, driver_id):
+        return self.frame.iloc[self.drivers[driver_id]]
+
+    @property
+    def factor_columns(self):
+        return [col for col in self.frame.columns if col.startswith(FACTOR_PREFIX)]
+
+    def podiums(self):
+        """Predicted top three of every round, one row per round."""
+        top = self.frame[self.frame['predicted_podium']]
+        wide = top.pivot(index='round', columns='round_rank', values=['driver', 'podium_probability'])
+        circuits = self.frame.groupby('round')['circuit_name'].first()
+        return pd.DataFrame({
+            'round': wide.index,
+            'circuit_name': circuits.loc[wide.index].to_numpy(),
+            **{f'p{rank}': wide[('driver', rank)].to_numpy() for rank in (1, 2, 3)},
+            **{f'p{rank}_probability': wide[('podium_probability', rank)].to_numpy()
+               for rank in (1, 2, 3)},
+        })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score every 2026 round into the prediction table")
+    parser.add_argument('--models', nargs='+', choices=sorted(SCORING_MODELS.values()),
+                        help="registry names to score with (default: every one on disk)")
+    parser.add_argument('--output', default=str(OUTPUT_PATH))
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("📦 2026 BATCH SCORING")
+    print("=" * 70)
+
+    grids = load_grid_rows()
+    print(f"\n📊 {len(grids)} driver-rounds over {grids['round'].nunique()} rounds")
+
+    wanted = set(args.models or SCORING_MODELS.values())
+    models = {}
+    for suffix, name in SCORING_MODELS.items():
+        if name not in wanted:
+            continue
+        if not registry.exists(name):
+            print(f"   ⏭️  {name}: not on disk, skipped")
+            continue
+        models[suffix] = registry.load(name)
+        print(f"   ✅ {registry.version_key(name)}")
+    if not models:
+        raise SystemExit("❌ No podium model available to score with")
+
+    # Every run is recorded in the prediction store; a run with the same
+    # grids, features and model versions reuses the recorded table
+    store = PredictionStore.open()
+    model_version = ' + '.join(registry.version_key(SCORING_MODELS[s]) for s in models)
+    inputs = {'grids_sha256': file_sha256(GRIDS_PATH), 'features_sha256': file_sha256(FEATURES_PATH)}
+    recorded = store.lookup('batch_score', model_version, inputs) if store else None
+    start = time.perf_counter()
+    if recorded is not None:
+        table = pd.DataFrame(recorded)
+        print(f"\n♻️  Same grids, features and models as a recorded run: {len(table)} rows "
+              f"read from {store.path.name} in {time.perf_counter() - start:.2f}s")
+    else:
+        table = build_table(grids, *score(grids, models))
+        print(f"\n⚡ Scored {len(table)} rows x {len(models)} models in "
+              f"{time.perf_counter() - start:.2f}s")
+        if store:
+            batch_id = store.record('batch_score', model_version, inputs, table)
+            print(f"🗄️  Recorded as batch #{batch_id} in {store.path.name}")
+
+    print("\n🏁 PREDICTED WINNERS (first 5 rounds):")
+    print(PredictionTable(table).podiums().head()[['round', 'circuit_name', 'p1', 'p1_probability']]
+          .to_string(index=False))
+
+    table.to_csv(args.output, index=False)
+    info = registry.register(REGISTRY_NAME, args.output)
+    print(f"\n💾 Saved: {args.output} ({REGISTRY_NAME}:{info['version']})")
+    print("=" * 70)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,299 @@
+"""
+Microbenchmark Suite
+Times the pipeline's hot paths and compares them with a stored baseline:
+
+  load/<artifact>           -- unpickling / reading every registered artifact on disk
+  predict/<model>/single    -- predict_proba on one row
+  predict/<model>/batch     -- predict_proba on BATCH_ROWS rows
+  features/notebook_build   -- the master notebook's feature engineering (cells
+                               FEATURE_CELLS) over merged_race_quali_2022_2025.csv
+  simulation/race_10k       -- one race x 10k Monte Carlo draws
+  simulation/season_1k      -- a 1k-season championship simulation
+
+Each benchmark is auto-ranged like timeit (enough calls per sample for
+~0.2s) and the median of --repeat samples is kept. Baselines are saved as
+numbered versions under models/benchmarks/ with the git commit and machine
+they ran on; a run compared with a baseline fails (exit code 1) when any
+benchmark is slower by more than --threshold percent. Timings only compare
+on the same hardware: against a baseline whose machine block (Python,
+platform, CPU model and count, where recorded) differs from this host,
+regressions are reported as warnings unless --strict is given.
+
+Usage:
+    python benchmarks.py                        # run, compare with the latest baseline
+    python benchmarks.py --save-baseline        # ...and store the run as a new version
+    python benchmarks.py --only predict --baseline 2 --threshold 15
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import timeit
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from model_registry import REPO_ROOT, _load_file, registry
+from preprocessing import F1Preprocessor
+from training_data import ROOT, MODEL_FEATURES, default_dataset_path, load_dataset, model_features
+
+BASELINE_DIR = ROOT / 'models/benchmarks'
+NOTEBOOK_PATH = ROOT / 'notebooks/f1_predictor_v3_master.ipynb'
+MERGED_PATH = ROOT / 'data/processed/merged_race_quali_2022_2025.csv'
+FEATURE_CELLS = range(7, 12)  # "FEATURE ENGINEERING - PART 1" .. "PART 5"
+PREDICT_MODELS = ['podium-xgb', 'podium-catboost', 'podium-lightgbm', 'podium-ensemble',
+                  'podium-student']
+BATCH_ROWS = 1000
+THRESHOLD_PCT = 10.0
+MIN_SAMPLE_S = 0.2
+
+
+# ========================================
+# Benchmarks: name -> zero-argument callable
+# ========================================
+
+def load_benchmarks():
+    benchmarks = {}
+    for name in registry.names():
+        if registry.exists(name):
+            path = registry.path(name)
+            benchmarks[f'load/{name}'] = lambda path=path: _load_file(path)
+    return benchmarks
+
+
+def predict_benchmarks():
+    df = load_dataset(default_dataset_path())
+    rows = df.sample(BATCH_ROWS, replace=len(df) < BATCH_ROWS, random_state=0)
+    benchmarks = {}
+    for name in PREDICT_MODELS:
+        if not registry.exists(name):
+            continue
+        model = registry.load(name)
+        preprocessor = getattr(model, 'preprocessor', None) \
+            or F1Preprocessor(model_features(model, default=MODEL_FEATURES))
+        X = preprocessor.transform_frame(rows)
+        single = X.iloc[:1]
+        benchmarks[f'predict/{name}/single'] = lambda m=model, x=single: m.predict_proba(x)
+        benchmarks[f'predict/{name}/batch'] = lambda m=model, x=X: m.predict_proba(x)
+    return benchmarks
+
+
+def feature_build():
+    """The notebook's feature engineering cells, run in a scratch directory (they save a CSV)."""
+    with open(NOTEBOOK_PATH, encoding='utf-8') as f:
+        cells = [''.join(c['source']) for c in json.load(f)['cells'] if c['cell_type'] == 'code']
+    code = [compile(cells[i], f'{NOTEBOOK_PATH.name}[{i}]', 'exec') for i in FEATURE_CELLS]
+    merged = pd.read_csv(MERGED_PATH)
+    for col in ('Q1', 'Q2', 'Q3'):
+        merged[col] = pd.to_timedelta(merged[col])
+
+    def build():
+        namespace = {'pd': pd, 'np': np, 'merged_df': merged}
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp:
+            os.makedirs(os.path.join(tmp, 'notebooks'))
+            os.makedirs(os.path.join(tmp, 'data/processed'))
+            os.chdir(os.path.join(tmp, 'notebooks'))
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    for cell in code:
+                        exec(cell, namespace)
+            finally:
+                os.chdir(cwd)
+        return namespace['df']
+
+    return {'features/notebook_build': build}
+
+
+def simulation_benchmarks():
+    from simulator import SeasonSimulator
+    season = SeasonSimulator.from_csv()
+    race = SeasonSimulator(season.drivers, season.names, season.strength, season.grid[:1],
+                           season.dnf_rate, rounds=season.rounds[:1])
+
+    def championship():
+        for tally in season.run(1000):
+            pass
+        return tally
+
+    return {
+        'simulation/race_10k': lambda: race.simulate(10_000, seed=0),
+        'simulation/season_1k': championship,
+    }
+
+
+GROUPS = {
+    'load': load_benchmarks,
+    'predict': predict_benchmarks,
+    'features': feature_build,
+    'simulation': simulation_benchmarks,
+}
+
+
+def measure(fn, repeat):
+    """Median / min seconds per call over `repeat` auto-ranged samples."""
+    timer = timeit.Timer(fn)
+    number, elapsed = timer.autorange()
+    number = max(1, int(np.ceil(number * MIN_SAMPLE_S / max(elapsed, 1e-9))))
+    samples = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return {'median_s': statistics.median(samples), 'min_s': min(samples),
+            'number': number, 'repeat': repeat}
+
+
+# ========================================
+# Baselines
+# ========================================
+
+def baseline_versions(directory=BASELINE_DIR):
+    return sorted(int(p.stem[1:]) for p in directory.glob('v*.json') if p.stem[1:].isdigit())
+
+
+def load_baseline(version=None, directory=BASELINE_DIR):
+    versions = baseline_versions(directory)
+    if not versions:
+        return None
+    version = versions[-1] if version is None else version
+    if version not in versions:
+        raise SystemExit(f"❌ No baseline v{version} (have {', '.join(f'v{v}' for v in versions)})")
+    with open(directory / f'v{version}.json') as f:
+        return json.load(f)
+
+
+def _cpu_model():
+    try:
+        with open('/proc/cpuinfo') as f:
+            for line in f:
+                if line.startswith('model name'):
+                    return line.split(':', 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or None
+
+
+def machine_info():
+    """What timings depend on besides the code (the host name is left out: CI hosts change)."""
+    return {'python': platform.python_version(), 'platform': platform.platform(),
+            'cpus': os.cpu_count(), 'cpu': _cpu_model()}
+
+
+def machine_differences(recorded, current):
+    """
+    Fields the baseline's machine block records differently from `current`.
+    Fields it never recorded (older baselines have no cpu) are not compared.
+    """
+    recorded = recorded or {}
+    return {key: (recorded[key], value) for key, value in current.items()
+            if key in recorded and recorded[key] != value}
+
+
+def save_baseline(results, directory=BASELINE_DIR):
+    versions = baseline_versions(directory)
+    version = versions[-1] + 1 if versions else 1
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                                capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f'v{version}.json'
+    with open(path, 'w') as f:
+        json.dump({
+            'version': version,
+            'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'commit': commit,
+            'machine': machine_info(),
+            'results': results,
+        }, f, indent=2)
+    return version, path
+
+
+def compare(results, baseline, threshold=THRESHOLD_PCT):
+    """Per-benchmark change against the baseline median; regressions flagged."""
+    rows = []
+    for name, result in results.items():
+        before = baseline['results'].get(name, {}).get('median_s') if baseline else None
+        change = None if before is None else 100 * (result['median_s'] / before - 1)
+        rows.append({'benchmark': name, 'median_ms': 1000 * result['median_s'],
+                     'baseline_ms': None if before is None else 1000 * before,
+                     'change_pct': change,
+                     'regression': change is not None and change > threshold})
+    return pd.DataFrame(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmarks with versioned baselines")
+    parser.add_argument('--only', nargs='+', metavar='PREFIX',
+                        help="benchmarks whose name starts with any prefix (e.g. predict load/podium)")
+    parser.add_argument('--repeat', type=int, default=5, help="samples per benchmark (median kept)")
+    parser.add_argument('--baseline', type=int, help="baseline version to compare with (default: latest)")
+    parser.add_argument('--threshold', type=float, default=THRESHOLD_PCT,
+                        help="percent slowdown that counts as a regression")
+    parser.add_argument('--save-baseline', action='store_true', help="store this run as a new version")
+    parser.add_argument('--strict', action='store_true',
+                        help="fail on regressions even against a baseline from another machine")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("⏱️  MICROBENCHMARKS")
+    print("=" * 70)
+
+    prefixes = tuple(args.only or ())
+    results = {}
+    for group, factory in GROUPS.items():
+        if prefixes and not any(group.startswith(p.split('/')[0]) for p in prefixes):
+            continue
+        for name, fn in factory().items():
+            if prefixes and not name.startswith(prefixes):
+                continue
+            results[name] = measure(fn, args.repeat)
+            print(f"   {name:42s} {1000 * results[name]['median_s']:10.3f} ms")
+    if not results:
+        raise SystemExit("❌ No benchmark matched --only")
+
+    baseline = load_baseline(args.baseline)
+    table = compare(results, baseline, args.threshold)
+    regressions = table[table['regression']]
+    if baseline is not None:
+        print(f"\n📏 vs baseline v{baseline['version']} ({baseline['commit'] or 'no commit'}, "
+              f"{baseline['created']}), threshold +{args.threshold:g}%:")
+        for _, row in table.iterrows():
+            if row['change_pct'] is None or pd.isna(row['change_pct']):
+                status, change = "🆕", "     new"
+            else:
+                status = "❌" if row['regression'] else "🚀" if row['change_pct'] < -args.threshold else "✅"
+                change = f"{row['change_pct']:+7.1f}%"
+            print(f"   {status} {row['benchmark']:42s} {change}")
+    else:
+        print("\n📏 No baseline yet (run with --save-baseline)")
+
+    if args.save_baseline:
+        version, path = save_baseline(results)
+        print(f"\n💾 Saved baseline v{version}: {path}")
+
+    if len(regressions):
+        differences = machine_differences(baseline.get('machine'), machine_info())
+        gate = args.strict or not differences
+        print(f"\n{'❌' if gate else '⚠️ '} {len(regressions)} REGRESSION(S) beyond +{args.threshold:g}%:")
+        for _, row in regressions.iterrows():
+            print(f"   {row['benchmark']}: {row['baseline_ms']:.3f} -> {row['median_ms']:.3f} ms "
+                  f"({row['change_pct']:+.1f}%)")
+        if not gate:
+            print(f"\n⚠️  Baseline v{baseline['version']} was recorded on another machine; not failing:")
+            for key, (recorded, current) in differences.items():
+                print(f"   {key}: {recorded} -> {current}")
+            print("   Record a baseline on this host with --save-baseline (or pass --strict)")
+        else:
+            sys.exit(1)
+    print("=" * 70)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,230 @@
+"""
+Distill the F1 Ensemble into a Low-Latency Student
+Trains a compact model on the ensemble's soft probabilities and reports
+how closely it tracks the teacher, plus latency and artifact size.
+
+Usage:
+    python distill.py                    # shallow GBM student (default)
+    python distill.py --student table    # grid x driver-form lookup table
+"""
+
+import argparse
+import json
+import pickle
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+
+from model_registry import registry
+from preprocessing import grid_overrides
+from training_data import ROOT, default_dataset_path, load_dataset, select_rounds
+
+STUDENT_DIR = ROOT / 'models/student'
+API_MODEL_DIR = ROOT.parent / 'BoxMachiBox-API/models'
+
+
+# ========================================
+# Students
+# ========================================
+
+class DistilledGBM:
+    """Shallow LightGBM trained with a cross-entropy objective on soft labels."""
+
+    def __init__(self, features, threshold=0.5, n_estimators=150, max_depth=3):
+        self.features = list(features)
+        self.threshold = threshold
+        self.params = dict(objective='cross_entropy', n_estimators=n_estimators,
+                           max_depth=max_depth, num_leaves=2 ** max_depth,
+                           learning_rate=0.1, random_state=42, verbose=-1)
+        self.model = None
+
+    def fit(self, X, soft_labels):
+        from lightgbm import LGBMRegressor
+        self.model = LGBMRegressor(**self.params)
+        self.model.fit(X.reindex(columns=self.features, fill_value=0), soft_labels)
+        return self
+
+    def predict_proba(self, X):
+        if isinstance(X, pd.DataFrame):
+            X = X.reindex(columns=self.features, fill_value=0)
+        p = np.clip(self.model.predict(X), 0, 1)
+        return np.column_stack([1 - p, p])
+
+
+class GridFormTable:
+    """
+    Lookup table of teacher probability over grid position x driver form.
+
+    Cells are shrunk towards the grid-position marginal with `prior_weight`
+    pseudo-rows, so sparse (grid, form) combinations stay sensible.
+    """
+
+    def __init__(self, features, threshold=0.5, form_col='driver_last5_avg_points',
+                 form_bins=6, prior_weight=5.0):
+        self.features = list(features)
+        self.threshold = threshold
+        self.form_col = form_col
+        self.form_bins = form_bins
+        self.prior_weight = prior_weight
+        self.form_edges_ = None
+        self.table_ = None
+
+    def _cells(self, X):
+        grid = X['grid_position'].to_numpy(dtype=float) if isinstance(X, pd.DataFrame) \
+            else X[:, self.features.index('grid_position')]
+        form = X[self.form_col].to_numpy(dtype=float) if isinstance(X, pd.DataFrame) \
+            else X[:, self.features.index(self.form_col)]
+        g = np.clip(np.nan_to_num(grid, nan=20).round().astype(int), 1, 20) - 1
+        f = np.searchsorted(self.form_edges_, np.nan_to_num(form), side='right')
+        return g, f
+
+    def fit(self, X, soft_labels):
+        form = np.nan_to_num(X[self.form_col].to_numpy(dtype=float))
+        quantiles = np.linspace(0, 1, self.form_bins + 1)[1:-1]
+        self.form_edges_ = np.unique(np.quantile(form, quantiles))
+        g, f = self._cells(X)
+        n_form = len(self.form_edges_) + 1
+
+        sums = np.zeros((20, n_form))
+        counts = np.zeros((20, n_form))
+        np.add.at(sums, (g, f), soft_labels)
+        np.add.at(counts, (g, f), 1)
+
+        grid_sums, grid_counts = sums.sum(axis=1), counts.sum(axis=1)
+        overall = soft_labels.mean()
+        grid_prior = (grid_sums + self.prior_weight * overall) / (grid_counts + self.prior_weight)
+        self.table_ = ((sums + self.prior_weight * grid_prior[:, None])
+                       / (counts + self.prior_weight)).astype(np.float32)
+        return self
+
+    def predict_proba(self, X):
+        g, f = self._cells(X)
+        p = self.table_[g, f].astype(float)
+        return np.column_stack([1 - p, p])
+
+
+STUDENTS = {'gbm': DistilledGBM, 'table': GridFormTable}
+
+
+def grid_transfer_set(X):
+    """
+    Training rows replayed at every grid slot 1-20 (plus the originals), so
+    the student learns the teacher's grid response it will be queried on.
+    """
+    copies = [X]
+    for grid in range(1, 21):
+        overrides = {col: value for col, value in grid_overrides(grid).items() if col in X.columns}
+        copies.append(X.assign(**overrides))
+    return pd.concat(copies, ignore_index=True)
+
+
+# ========================================
+# Report helpers
+# ========================================
+
+def _latency_ms(fn, X, repeats=50):
+    fn(X)  # warm-up
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(X)
+        times.append(time.perf_counter() - start)
+    return float(np.median(times) * 1000)
+
+
+def compare(teacher, student, X, y):
+    """Fidelity, accuracy, latency and size of student vs teacher on X."""
+    p_t = teacher.predict_proba(X)[:, 1]
+    p_s = student.predict_proba(X)[:, 1]
+    single = X.iloc[[0]]
+    return {
+        'rows': int(len(X)),
+        'teacher_accuracy': float(((p_t >= teacher.threshold) == y).mean()),
+        'student_accuracy': float(((p_s >= student.threshold) == y).mean()),
+        'decision_agreement': float(((p_t >= teacher.threshold) == (p_s >= student.threshold)).mean()),
+        'prob_mae': float(np.abs(p_t - p_s).mean()),
+        'prob_max_abs_diff': float(np.abs(p_t - p_s).max()),
+        'prob_correlation': float(np.corrcoef(p_t, p_s)[0, 1]) if len(X) > 1 else 1.0,
+        'teacher_single_row_ms': _latency_ms(teacher.predict_proba, single),
+        'student_single_row_ms': _latency_ms(student.predict_proba, single),
+        'teacher_batch_ms': _latency_ms(teacher.predict_proba, X, repeats=10),
+        'student_batch_ms': _latency_ms(student.predict_proba, X, repeats=10),
+        'teacher_bytes': len(pickle.dumps(teacher)),
+        'student_bytes': len(pickle.dumps(student)),
+    }
+
+
+# ========================================
+# Main
+# ========================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Distill the ensemble into a serving model")
+    parser.add_argument('--student', choices=sorted(STUDENTS), default='gbm')
+    parser.add_argument('--holdout-from', type=int, nargs=2, default=(2025, 20),
+                        metavar=('SEASON', 'ROUND'),
+                        help="rows after this round are only used for the report")
+    parser.add_argument('--no-augment', action='store_true',
+                        help="train on the original rows only (no grid sweep transfer set)")
+    parser.add_argument('--no-export', action='store_true',
+                        help="don't copy the student into BoxMachiBox-API/models")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("🧪 F1 MODEL DISTILLATION")
+    print("=" * 70)
+
+    teacher = registry.load('podium-ensemble')
+    df = load_dataset(default_dataset_path())
+    X_all = df.reindex(columns=teacher.features, fill_value=0).fillna(0)
+
+    train_mask = df.index.isin(select_rounds(df, until=tuple(args.holdout_from)).index)
+    X_train, X_hold = X_all[train_mask], X_all[~train_mask]
+    y_hold = df.loc[~train_mask, 'podium'].to_numpy()
+
+    print(f"\n📊 Teacher: {', '.join(teacher.names)} ({len(teacher.features)} features)")
+    print(f"   Train rows: {len(X_train):,}  Holdout rows: {len(X_hold):,}")
+
+    X_transfer = X_train if args.no_augment else grid_transfer_set(X_train)
+    print(f"\n🤖 Training '{args.student}' student on {len(X_transfer):,} teacher soft labels...",
+          end=" ")
+    soft = teacher.predict_proba(X_transfer)[:, 1]
+    student = STUDENTS[args.student](teacher.features, threshold=teacher.threshold)
+    student.fit(X_transfer, soft)
+    print("✅")
+
+    report = compare(teacher, student, X_hold, y_hold)
+    report['student'] = args.student
+
+    print("\n📋 STUDENT vs TEACHER (holdout):")
+    print(f"   Accuracy:           {report['student_accuracy']*100:.2f}% vs {report['teacher_accuracy']*100:.2f}%")
+    print(f"   Decision agreement: {report['decision_agreement']*100:.2f}%")
+    print(f"   Probability MAE:    {report['prob_mae']:.4f} (max {report['prob_max_abs_diff']:.4f})")
+    print(f"   Single-row latency: {report['student_single_row_ms']:.3f} ms vs {report['teacher_single_row_ms']:.3f} ms")
+    print(f"   Batch latency:      {report['student_batch_ms']:.3f} ms vs {report['teacher_batch_ms']:.3f} ms")
+    print(f"   Artifact size:      {report['student_bytes']/1024:.1f} KB vs {report['teacher_bytes']/1024:.1f} KB")
+
+    STUDENT_DIR.mkdir(parents=True, exist_ok=True)
+    with open(STUDENT_DIR / 'f1_student.pkl', 'wb') as f:
+        pickle.dump(student, f)
+    with open(STUDENT_DIR / 'distill_report.json', 'w') as f:
+        json.dump(report, f, indent=2)
+    registry.register('podium-student', STUDENT_DIR / 'f1_student.pkl')
+    print(f"\n💾 Saved: {STUDENT_DIR / 'f1_student.pkl'}")
+
+    if not args.no_export:
+        API_MODEL_DIR.mkdir(parents=True, exist_ok=True)
+        shutil.copy(STUDENT_DIR / 'f1_student.pkl', API_MODEL_DIR / 'f1_student.pkl')
+        shutil.copy(registry.path('podium-ensemble'), API_MODEL_DIR / 'f1_ensemble.pkl')
+        # Same content, so the copies join the existing registry artifacts
+        registry.register('podium-student', API_MODEL_DIR / 'f1_student.pkl')
+        registry.register('podium-ensemble', API_MODEL_DIR / 'f1_ensemble.pkl')
+        print(f"💾 Exported student + ensemble to {API_MODEL_DIR}")
+
+    print("\n" + "=" * 70)
+
+
+if __name__ == '__main__':
+    main()
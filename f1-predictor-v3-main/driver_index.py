@@ -0,0 +1,143 @@
+"""
+Driver Stats Index
+Per-driver comparison stats built once from the processed features, stored
+column-wise in one float32 matrix keyed by driverId, with every pairwise
+delta precomputed. Lookups and head-to-heads are array indexing, not
+DataFrame scans.
+
+    index = DriverStatsIndex.build()
+    index.stats('norris')                      # {stat: value}
+    index.compare('norris', 'max_verstappen')  # rows: stat, columns: both drivers + delta
+"""
+
+import numpy as np
+import pandas as pd
+
+from training_data import FEATURES_PATH
+
+# Section -> [(stat, label)]; every stat is computed per driver in build()
+SECTIONS = {
+    'Season': [
+        ('season_points', 'Points'),
+        ('season_wins', 'Wins'),
+        ('season_podiums', 'Podiums'),
+        ('season_avg_finish', 'Avg Finish'),
+        ('season_dnf_rate', 'DNF Rate'),
+    ],
+    'Circuit': [
+        ('circuit_win_rate', 'Venue Win Rate'),
+        ('circuit_podium_rate', 'Venue Podium Rate'),
+        ('circuit_points_per_race', 'Venue Points / Race'),
+        ('circuit_avg_finish', 'Venue Avg Finish'),
+    ],
+    'Momentum': [
+        ('momentum', 'Momentum'),
+        ('last5_avg_points', 'Last 5 Avg Points'),
+        ('last5_podiums', 'Last 5 Podiums'),
+    ],
+    'Quali vs Race': [
+        ('avg_grid', 'Avg Grid'),
+        ('avg_positions_gained', 'Avg Positions Gained'),
+    ],
+    'Teammate': [
+        ('teammate_gap', 'Points Behind Teammate'),
+        ('teammate_h2h', 'Finished Ahead of Teammate'),
+    ],
+}
+STATS = [stat for stats in SECTIONS.values() for stat, _ in stats]
+LOWER_IS_BETTER = {'season_avg_finish', 'season_dnf_rate', 'circuit_avg_finish', 'avg_grid',
+                   'teammate_gap'}
+
+
+def _driver_stats(df):
+    """One row per driver with every stat in STATS, from the latest season's races."""
+    season = df[df['season'] == df['season'].max()].sort_values(['round'])
+    by_driver = season.groupby('driverId')
+    latest = by_driver.tail(1).set_index('driverId')
+
+    # Teammate head-to-head: share of shared races finished ahead
+    group = season.groupby(['round', 'constructorId'])['position']
+    shared = group.transform('size') == 2
+    ahead = season['position'] < group.transform('max')
+
+    stats = pd.DataFrame({
+        'season_points': by_driver['points'].sum(),
+        'season_wins': by_driver['is_win'].sum(),
+        'season_podiums': by_driver['is_podium'].sum(),
+        'season_avg_finish': by_driver['position'].mean(),
+        'season_dnf_rate': by_driver['is_dnf'].mean(),
+        'circuit_win_rate': by_driver['circuit_driver_win_rate'].mean(),
+        'circuit_podium_rate': by_driver['circuit_driver_podium_rate'].mean(),
+        'circuit_points_per_race': by_driver['circuit_driver_points_per_race'].mean(),
+        'circuit_avg_finish': by_driver['circuit_driver_avg_finish'].mean(),
+        'momentum': latest['driver_momentum'],
+        'last5_avg_points': latest['driver_last5_avg_points'],
+        'last5_podiums': latest['driver_last5_podiums'],
+        'avg_grid': by_driver['grid_position'].mean(),
+        # quali_race_delta is position - grid_position, i.e. places lost
+        'avg_positions_gained': -by_driver['quali_race_delta'].mean(),
+        'teammate_gap': latest['teammate_gap'],
+        'teammate_h2h': (ahead & shared).groupby(season['driverId']).sum()
+                        / shared.groupby(season['driverId']).sum().clip(lower=1),
+    })
+    stats['name'] = latest['givenName'] + ' ' + latest['familyName']
+    stats['team'] = latest['constructorName']
+    return stats
+
+
+class DriverStatsIndex:
+    """
+    drivers -- driverIds, row order of `values`
+    values  -- (drivers, stats) float32 matrix, columns in STATS order
+    deltas  -- (drivers, drivers, stats) values[a] - values[b]
+    """
+
+    def __init__(self, drivers, names, teams, values):
+        self.drivers = list(drivers)
+        self.names = list(names)
+        self.teams = list(teams)
+        self.values = np.asarray(values, dtype=np.float32)
+        self.position = {driver_id: i for i, driver_id in enumerate(self.drivers)}
+        self.by_name = {name: driver_id for driver_id, name in zip(self.drivers, self.names)}
+        self.deltas = self.values[:, None, :] - self.values[None, :, :]
+        # +1 where the first driver of the pair is better on that stat
+        sign = np.where(np.isin(STATS, list(LOWER_IS_BETTER)), -1, 1).astype(np.float32)
+        self.edges = np.sign(self.deltas * sign).astype(np.int8)
+
+    @classmethod
+    def build(cls, features_path=FEATURES_PATH):
+        stats = _driver_stats(pd.read_csv(features_path)).sort_values('season_points',
+                                                                      ascending=False)
+        return cls(stats.index, stats['name'], stats['team'], stats[STATS].fillna(0).to_numpy())
+
+    def __contains__(self, driver_id):
+        return driver_id in self.position
+
+    def __len__(self):
+        return len(self.drivers)
+
+    def name(self, driver_id):
+        return self.names[self.position[driver_id]]
+
+    def team(self, driver_id):
+        return self.teams[self.position[driver_id]]
+
+    def stats(self, driver_id):
+        return dict(zip(STATS, self.values[self.position[driver_id]].tolist()))
+
+    def compare(self, a, b):
+        """Head-to-head table of two drivers; `edge` is 1 where `a` is better, -1 where `b` is."""
+        i, j = self.position[a], self.position[b]
+        return pd.DataFrame({
+            'section': [section for section, stats in SECTIONS.items() for _ in stats],
+            'stat': [label for stats in SECTIONS.values() for _, label in stats],
+            self.names[i]: self.values[i],
+            self.names[j]: self.values[j],
+            'delta': self.deltas[i, j],
+            'edge': self.edges[i, j],
+        })
+
+    def edge_counts(self, driver_id):
+        """Stats on which `driver_id` beats each other driver, as a Series over driverIds."""
+        wins = (self.edges[self.position[driver_id]] > 0).sum(axis=1)
+        return pd.Series(wins, index=self.drivers)
@@ -0,0 +1,156 @@
+"""
+F1 Ensemble Artifact
+Weighted average of calibrated member probabilities, shipped as one pickle.
+
+    ensemble = F1Ensemble([('CatBoost', cat_model, 1.0), ('XGBoost', xgb_model, 1.0)],
+                          features=feature_cols, threshold=0.5)
+    ensemble.fit_calibration(X_cal, y_cal)
+    proba = ensemble.predict_proba(X)                  # all members, batched
+    proba = ensemble.predict_proba(X, cascade=True)    # first member only when confident
+"""
+
+import numpy as np
+import pandas as pd
+
+from preprocessing import F1Preprocessor
+
+_EPS = 1e-6
+
+
+def _logit(p):
+    p = np.clip(p, _EPS, 1 - _EPS)
+    return np.log(p / (1 - p))
+
+
+def _take(X, rows):
+    return X.iloc[rows] if isinstance(X, pd.DataFrame) else X[rows]
+
+
+class Calibrator:
+    """
+    Monotone map from raw member score to calibrated probability.
+    Stores plain arrays so inference needs numpy only.
+    """
+
+    def __init__(self, method='sigmoid'):
+        if method not in ('sigmoid', 'isotonic'):
+            raise ValueError(f"Unknown calibration method: {method}")
+        self.method = method
+        self.coef_ = (1.0, 0.0)
+        self.x_ = self.y_ = None
+
+    def fit(self, p, y):
+        p = np.asarray(p, dtype=float)
+        y = np.asarray(y, dtype=int)
+        if self.method == 'sigmoid':
+            from sklearn.linear_model import LogisticRegression
+            lr = LogisticRegression(C=1e4).fit(_logit(p).reshape(-1, 1), y)
+            self.coef_ = (float(lr.coef_[0, 0]), float(lr.intercept_[0]))
+        else:
+            from sklearn.isotonic import IsotonicRegression
+            iso = IsotonicRegression(out_of_bounds='clip', y_min=0, y_max=1).fit(p, y)
+            self.x_, self.y_ = iso.X_thresholds_, iso.y_thresholds_
+        return self
+
+    def transform(self, p):
+        p = np.asarray(p, dtype=float)
+        if self.method == 'sigmoid':
+            a, b = self.coef_
+            return 1.0 / (1.0 + np.exp(-(a * _logit(p) + b)))
+        return np.interp(p, self.x_, self.y_)
+
+
+class F1Ensemble:
+    """
+    Podium classifier built from several fitted boosters.
+
+    members        -- list of (name, model, weight); order matters for the
+                      cascade, the first member should be the cheapest
+    features       -- column order the members were trained on
+    threshold      -- decision threshold on the ensemble probability
+    cascade_margin -- in cascade mode, rows whose first-member probability is
+                      at least this far from the threshold skip the others
+    preprocessor   -- F1Preprocessor turning raw driver rows into `features`
+    """
+
+    def __init__(self, members, features, threshold=0.5, cascade_margin=0.25,
+                 calibrators=None, metadata=None, preprocessor=None):
+        self.members = [(name, model, float(weight)) for name, model, weight in members]
+        self.features = list(features)
+        self.threshold = float(threshold)
+        self.cascade_margin = float(cascade_margin)
+        self.calibrators = calibrators or {}
+        self.metadata = metadata or {}
+        self.preprocessor = preprocessor or F1Preprocessor(self.features)
+
+    @classmethod
+    def from_package(cls, package):
+        """Wrap a legacy dict package ({'models': [(name, model, w)], 'weights': ...})."""
+        models = package['models']
+        weights = package.get('weights') or [weight for _, _, weight in models]
+        members = [(name, model, w) for (name, model, _), w in zip(models, weights)]
+        return cls(members, package['features'],
+                   threshold=package.get('threshold', 0.5),
+                   metadata={'accuracy': package.get('accuracy')},
+                   preprocessor=F1Preprocessor.from_package(package))
+
+    @property
+    def names(self):
+        return [name for name, _, _ in self.members]
+
+    @property
+    def weights(self):
+        return np.array([weight for _, _, weight in self.members])
+
+    def _prepare(self, X):
+        if isinstance(X, pd.DataFrame):
+            return X.reindex(columns=self.features, fill_value=0)
+        return X
+
+    def _member_proba(self, i, X):
+        name, model, _ = self.members[i]
+        p = model.predict_proba(X)[:, 1]
+        calibrator = self.calibrators.get(name)
+        return calibrator.transform(p) if calibrator is not None else p
+
+    def member_probas(self, X):
+        """Calibrated positive-class probability of every member, shape (n_members, n_rows)."""
+        X = self._prepare(X)
+        return np.vstack([self._member_proba(i, X) for i in range(len(self.members))])
+
+    def fit_calibration(self, X, y, method='sigmoid', reference_models=None):
+        """
+        Fit one calibrator per member on a calibration set.
+
+        reference_models -- optional {name: model} trained without the
+                            calibration rows; their scores are used to fit the
+                            maps so in-sample overconfidence is not baked in.
+        """
+        X = self._prepare(X)
+        self.calibrators = {}
+        for name, model, _ in self.members:
+            scorer = (reference_models or {}).get(name, model)
+            p = scorer.predict_proba(X)[:, 1]
+            self.calibrators[name] = Calibrator(method).fit(p, y)
+        return self
+
+    def predict_proba(self, X, cascade=False):
+        X = self._prepare(X)
+        weights = self.weights
+
+        if not cascade or len(self.members) == 1:
+            p = weights @ self.member_probas(X) / weights.sum()
+            return np.column_stack([1 - p, p])
+
+        p = self._member_proba(0, X)
+        unsure = np.flatnonzero(np.abs(p - self.threshold) < self.cascade_margin)
+        if len(unsure):
+            X_unsure = _take(X, unsure)
+            rest = np.vstack([self._member_proba(i, X_unsure)
+                              for i in range(1, len(self.members))])
+            p = p.copy()
+            p[unsure] = (weights[0] * p[unsure] + weights[1:] @ rest) / weights.sum()
+        return np.column_stack([1 - p, p])
+
+    def predict(self, X, cascade=False):
+        return (self.predict_proba(X, cascade=cascade)[:, 1] >= self.threshold).astype(int)
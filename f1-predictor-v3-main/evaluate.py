@@ -0,0 +1,221 @@
+"""
+Race-Level Model Evaluation
+Scores the whole test set with one predict_proba call per model, then
+computes per-race metrics with grouped array operations (no per-race loop):
+
+  winner_hit      -- the top-ranked driver won the race
+  podium_overlap  -- share of the predicted top 3 that finished on the podium
+  top{k}_recall   -- share of the actual podium ranked within the top k
+  log_loss, brier -- row-level podium probability quality
+  ece             -- expected calibration error over probability bins
+
+Several registered artifacts are compared side by side.
+
+    per_race = race_metrics(races, positions, proba)
+    summary = evaluate(model, test_df)
+
+Usage:
+    python evaluate.py                                    # every podium model on disk
+    python evaluate.py --models podium-xgb podium-catboost --from 2025 10
+    python evaluate.py --per-race --output models/evaluation.csv
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from ensemble import F1Ensemble
+from model_registry import registry
+from preprocessing import F1Preprocessor
+from training_data import (
+    MODEL_FEATURES, default_dataset_path, load_dataset, model_features, select_rounds,
+)
+
+DEFAULT_MODELS = ['podium-xgb', 'podium-catboost', 'podium-lightgbm', 'podium-ensemble',
+                  'podium-student', 'ultimate']
+TEST_FROM = (2025, 1)
+TOP_K = (5, 10)
+CALIBRATION_BINS = 10
+_EPS = 1e-15
+
+
+def scorer(obj):
+    """
+    Probability function for a registered artifact: fitted booster, F1Ensemble /
+    student (own preprocessor) or legacy dict package ({'model'} / {'models'}).
+    """
+    if isinstance(obj, dict):
+        if 'models' in obj:
+            obj = F1Ensemble.from_package(obj)
+        else:
+            preprocessor = F1Preprocessor.from_package(obj)
+            model = obj['model']
+            return lambda df: model.predict_proba(preprocessor.transform_frame(df))[:, 1]
+
+    preprocessor = getattr(obj, 'preprocessor', None)
+    if preprocessor is None:
+        features = model_features(obj)
+        if features is None:
+            # Unnamed columns are assumed to be the 47 production features
+            expected = getattr(obj, 'n_features_in_', len(MODEL_FEATURES))
+            if expected != len(MODEL_FEATURES):
+                raise ValueError(f"model expects {expected} unnamed features")
+            features = MODEL_FEATURES
+        preprocessor = F1Preprocessor(features)
+    return lambda df: obj.predict_proba(preprocessor.transform_frame(df))[:, 1]
+
+
+def race_ranks(races, proba):
+    """0-based rank of every row within its race by descending probability."""
+    order = np.lexsort((-proba, races))
+    sorted_races = races[order]
+    starts = np.r_[0, np.flatnonzero(np.diff(sorted_races)) + 1]
+    sizes = np.diff(np.r_[starts, len(order)])
+    ranks = np.empty(len(order), dtype=int)
+    ranks[order] = np.arange(len(order)) - np.repeat(starts, sizes)
+    return ranks
+
+
+def race_metrics(races, positions, proba, top_k=TOP_K):
+    """
+    One row per race. `races` are integer race ids (0..n-1), `positions`
+    the finishing positions, `proba` the podium probabilities, all per row.
+    """
+    races, positions = np.asarray(races), np.asarray(positions)
+    proba = np.asarray(proba, dtype=float)
+    n_races = races.max() + 1
+    ranks = race_ranks(races, proba)
+    podium = positions <= 3
+
+    def per_race(values):
+        return np.bincount(races, weights=values, minlength=n_races)
+
+    podium_count = np.maximum(per_race(podium), 1)
+    p = np.clip(proba, _EPS, 1 - _EPS)
+    row_loss = -(podium * np.log(p) + (~podium) * np.log(1 - p))
+
+    metrics = {
+        'winner_hit': per_race((ranks == 0) & (positions == 1)),
+        'podium_overlap': per_race((ranks < 3) & podium) / 3,
+        **{f'top{k}_recall': per_race((ranks < k) & podium) / podium_count for k in top_k},
+        'log_loss': per_race(row_loss) / np.bincount(races, minlength=n_races),
+    }
+    return pd.DataFrame(metrics)
+
+
+def calibration_table(y, proba, bins=CALIBRATION_BINS):
+    """Mean predicted vs observed podium rate per equal-width probability bin."""
+    y, proba = np.asarray(y, dtype=float), np.asarray(proba, dtype=float)
+    bin_ids = np.clip((proba * bins).astype(int), 0, bins - 1)
+    count = np.bincount(bin_ids, minlength=bins)
+    safe = np.maximum(count, 1)
+    return pd.DataFrame({
+        'bin': [f"{i / bins:.1f}-{(i + 1) / bins:.1f}" for i in range(bins)],
+        'count': count,
+        'predicted': np.bincount(bin_ids, weights=proba, minlength=bins) / safe,
+        'observed': np.bincount(bin_ids, weights=y, minlength=bins) / safe,
+    })
+
+
+def evaluate(model, df, threshold=0.5):
+    """
+    Summary metrics and per-race table for one model on `df` (rows with
+    season, round, position and the model's raw feature columns).
+    """
+    predict = model if callable(model) and not hasattr(model, 'predict_proba') else scorer(model)
+    start = time.perf_counter()
+    proba = np.asarray(predict(df), dtype=float)
+    score_s = time.perf_counter() - start
+
+    races = df.groupby(['season', 'round'], sort=True).ngroup().to_numpy()
+    positions = df['position'].to_numpy()
+    y = (positions <= 3).astype(float)
+
+    per_race = race_metrics(races, positions, proba)
+    keys = df[['season', 'round']].drop_duplicates().sort_values(['season', 'round'])
+    per_race.insert(0, 'season', keys['season'].to_numpy())
+    per_race.insert(1, 'round', keys['round'].to_numpy())
+
+    calibration = calibration_table(y, proba)
+    p = np.clip(proba, _EPS, 1 - _EPS)
+    summary = {
+        'races': len(per_race),
+        'rows': len(df),
+        'accuracy': float(((proba >= threshold) == y).mean()),
+        **per_race.drop(columns=['season', 'round', 'log_loss']).mean().to_dict(),
+        'log_loss': float(-(y * np.log(p) + (1 - y) * np.log(1 - p)).mean()),
+        'brier': float(((proba - y) ** 2).mean()),
+        'ece': float((calibration['count'] * (calibration['predicted'] - calibration['observed']).abs())
+                     .sum() / len(df)),
+        'score_s': score_s,
+        'eval_s': time.perf_counter() - start,
+    }
+    return summary, per_race
+
+
+def compare(refs, df):
+    """Summary row per registry artifact; artifacts that cannot score are reported, not fatal."""
+    rows, per_race = [], {}
+    for ref in refs:
+        if not registry.exists(ref):
+            print(f"   ⏭️  {ref}: not on disk, skipped")
+            continue
+        try:
+            summary, per_race[ref] = evaluate(registry.load(ref), df)
+        except Exception as e:
+            print(f"   ❌ {ref}: {e}")
+            continue
+        rows.append({'model': registry.version_key(ref), **summary})
+    return pd.DataFrame(rows), per_race
+
+
+def load_test_set(path=None, test_from=TEST_FROM):
+    """Rows from `test_from` (season, round) on; the processed feature store by default."""
+    df = load_dataset(path or default_dataset_path())
+    season, race_round = test_from
+    return select_rounds(df, after=(season, race_round - 1)).reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Race-level evaluation of podium models")
+    parser.add_argument('--models', nargs='+', default=DEFAULT_MODELS, help="registry names")
+    parser.add_argument('--data', help="feature CSV (default: complete dataset or feature store)")
+    parser.add_argument('--from', dest='test_from', nargs=2, type=int, default=list(TEST_FROM),
+                        metavar=('SEASON', 'ROUND'), help="first test race")
+    parser.add_argument('--per-race', action='store_true', help="print the per-race table too")
+    parser.add_argument('--output', help="save the comparison as CSV")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("🧪 RACE-LEVEL MODEL EVALUATION")
+    print("=" * 70)
+
+    df = load_test_set(args.data, tuple(args.test_from))
+    print(f"\n📊 Test set: {len(df):,} rows, "
+          f"{df[['season', 'round']].drop_duplicates().shape[0]} races from "
+          f"{args.test_from[0]} R{args.test_from[1]}")
+
+    results, per_race = compare(args.models, df)
+    if results.empty:
+        raise SystemExit("❌ No model could be evaluated")
+
+    columns = ['model', 'winner_hit', 'podium_overlap', 'top5_recall', 'log_loss', 'brier',
+               'ece', 'accuracy', 'eval_s']
+    print("\n🏁 COMPARISON:")
+    print(results[columns].to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+
+    if args.per_race:
+        for ref, table in per_race.items():
+            print(f"\n📋 {ref} per race:")
+            print(table.to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+
+    if args.output:
+        results.to_csv(args.output, index=False)
+        print(f"\n💾 Saved: {args.output}")
+    print("=" * 70)
+
+
+if __name__ == '__main__':
+    main()
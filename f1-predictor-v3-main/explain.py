@@ -0,0 +1,230 @@
+"""
+Model-Derived Contributing Factors
+Per-feature contributions from the boosters' native tree SHAP output
+(XGBoost pred_contribs, LightGBM pred_contrib, CatBoost approximate
+ShapValues), summed into human-readable factor groups. One call explains a whole grid: the
+contributions come out of the same batched tree traversal as the
+prediction, so explaining costs a small multiple of inference. CatBoost's
+exact SHAP runs 60-200x its predict; the approximate (path-based) values are
+3-8x on a race grid and still sum to the prediction, but single factors can
+differ from the exact split by a few points.
+
+Contributions are in log-odds. Impacts are reported in probability points
+by scaling them with the logistic secant between the model's base rate and
+its prediction, so a row's impacts sum to (prediction - base rate).
+Ensembles average calibrated member probabilities, so each member's impacts
+are also carried through its calibrator (secant between the calibrated base
+rate and calibrated prediction) before the weighted average; the impacts
+then sum to the served ensemble probability minus the ensemble's base rate.
+
+    explainer = Explainer(model)
+    impacts = explainer.explain(X)          # (rows, groups) DataFrame
+    explainer.factors_for(impacts.iloc[0])  # [{'factor', 'impact', 'icon'}, ...]
+
+Usage:
+    python explain.py                       # explain podium-xgb on the 2026 R1 grid
+    python explain.py --model podium-lightgbm --round 5
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from distill import DistilledGBM
+from ensemble import F1Ensemble
+from training_data import MODEL_FEATURES, model_features
+
+# Factor -> (icon, model features); every production feature is in exactly one
+FACTOR_GROUPS = {
+    'Qualifying Position': ('🏁', [
+        'quali_best_time', 'quali_gap_to_pole', 'quali_gap_to_pole_pct',
+        'quali_performance_score', 'quali_made_q3', 'quali_made_q2',
+        'quali_q1_q2_improvement', 'quali_q2_q3_improvement', 'grid_position',
+        'front_row_start',
+    ]),
+    'Recent Form': ('📈', [
+        'driver_last3_avg_points', 'driver_last3_avg_position', 'driver_last5_avg_points',
+        'driver_last5_avg_position', 'driver_last5_podiums', 'driver_momentum',
+        'driver_consistency_score', 'avg_quali_race_delta', 'teammate_gap',
+    ]),
+    'Championship': ('🏆', [
+        'driver_season_points', 'driver_season_races', 'driver_championship_position',
+        'points_gap_to_leader', 'must_win_pressure', 'season_progress',
+    ]),
+    'Team Strength': ('🏎️', [
+        'constructor_last3_avg_points', 'constructor_last5_avg_points',
+        'constructor_season_points', 'constructor_championship_position',
+        'constructor_avg_quali_position', 'constructor_points_per_race',
+        'constructor_is_top_team',
+    ]),
+    'Circuit Mastery': ('🏟️', [
+        'circuit_driver_wins', 'circuit_driver_podiums', 'circuit_driver_avg_finish',
+        'circuit_driver_experience', 'circuit_constructor_wins', 'circuit_constructor_podiums',
+        'circuit_driver_best_grid', 'circuit_driver_win_rate', 'circuit_driver_podium_rate',
+        'circuit_driver_points_per_race', 'circuit_avg_position_change',
+    ]),
+    'Reliability & Experience': ('🛠️', [
+        'driver_dnf_rate', 'constructor_dnf_rate', 'driver_avg_finish_position',
+        'driver_career_races',
+    ]),
+}
+OTHER_FACTOR = ('Other', '🔧')
+FEATURE_FACTOR = {feature: factor for factor, (_, features) in FACTOR_GROUPS.items()
+                  for feature in features}
+
+
+def native_contributions(model, X):
+    """
+    (rows, features + 1) log-odds contributions of every feature for the
+    rows of X; the last column is the model's base value (expected margin).
+    """
+    if isinstance(model, DistilledGBM):
+        if isinstance(X, pd.DataFrame):
+            X = X.reindex(columns=model.features, fill_value=0)
+        return native_contributions(model.model, X)
+
+    library = type(model).__module__.split('.')[0]
+    if library == 'xgboost':
+        import xgboost as xgb
+        booster = model.get_booster()
+        data = xgb.DMatrix(X, feature_names=booster.feature_names) \
+            if not isinstance(X, pd.DataFrame) else xgb.DMatrix(X)
+        return booster.predict(data, pred_contribs=True)
+    if library == 'lightgbm':
+        return model.booster_.predict(X, pred_contrib=True)
+    if library == 'catboost':
+        from catboost import Pool
+        return model.get_feature_importance(Pool(X), type='ShapValues',
+                                            shap_calc_type='Approximate')
+    raise TypeError(f"{type(model).__name__} has no native contribution output")
+
+
+def _sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+def _secant(f, x0, dx, h=1e-4):
+    """
+    (f(x0 + dx) - f(x0)) / dx per row; where dx vanishes, the central
+    difference at x0 (the secant's limit).
+    """
+    small = np.abs(dx) < 1e-9
+    step = np.where(small, h, dx)
+    slope = (f(x0 + step) - f(x0)) / step
+    return np.where(small, (f(x0 + h) - f(x0 - h)) / (2 * h), slope)
+
+
+def probability_contributions(model, X):
+    """
+    (rows, features) contributions in probability points and the (rows,)
+    base probability; each row sums to (prediction - base probability).
+    """
+    if isinstance(model, F1Ensemble):
+        X = model._prepare(X)
+        weights = model.weights / model.weights.sum()
+        total, base = 0.0, 0.0
+        for w, (name, member, _) in zip(weights, model.members):
+            contribs, p_base = probability_contributions(member, X)
+            calibrator = model.calibrators.get(name)
+            if calibrator is not None:
+                # The ensemble averages calibrated probabilities: map the
+                # member's raw impacts through its calibrator
+                slope = _secant(calibrator.transform, p_base, contribs.sum(axis=1))
+                contribs = contribs * slope[:, None]
+                p_base = calibrator.transform(p_base)
+            total = total + w * contribs
+            base = base + w * p_base
+        return total, base
+
+    contribs = np.asarray(native_contributions(model, X), dtype=float)
+    logits, base = contribs[:, :-1], contribs[:, -1]
+    slope = _secant(_sigmoid, base, logits.sum(axis=1))
+    return logits * slope[:, None], _sigmoid(base)
+
+
+class Explainer:
+    """
+    Factor-group explanations for one model. `features` is the model's
+    column order (its preprocessor's, stored names, or the 47 production
+    features); columns outside FACTOR_GROUPS are summed into 'Other'.
+    """
+
+    def __init__(self, model, features=None):
+        self.model = model
+        preprocessor = getattr(model, 'preprocessor', None)
+        self.features = list(features or (preprocessor.features if preprocessor is not None
+                                          else model_features(model, default=MODEL_FEATURES)))
+        factors = [FEATURE_FACTOR.get(feature, OTHER_FACTOR[0]) for feature in self.features]
+        self.factors = [f for f in list(FACTOR_GROUPS) + [OTHER_FACTOR[0]] if f in factors]
+        self.icons = {factor: icon for factor, (icon, _) in FACTOR_GROUPS.items()}
+        self.icons[OTHER_FACTOR[0]] = OTHER_FACTOR[1]
+        # (features, factors) 0/1 matrix: group sums are one matmul
+        self.membership = np.zeros((len(self.features), len(self.factors)))
+        self.membership[np.arange(len(self.features)),
+                        [self.factors.index(f) for f in factors]] = 1.0
+
+    def contributions(self, X):
+        """(rows, factors) impacts in probability points and the (rows,) base probability."""
+        contribs, base = probability_contributions(self.model, X)
+        return contribs @ self.membership, base
+
+    def explain(self, X):
+        """(rows, factors) impacts in probability points; each row sums to p - base rate."""
+        groups, _ = self.contributions(X)
+        return pd.DataFrame(groups, columns=self.factors,
+                            index=X.index if isinstance(X, pd.DataFrame) else None)
+
+    def factors_for(self, impacts, top=None):
+        """API-style factor list for one row of `explain`, largest impact first."""
+        ranked = impacts.reindex(impacts.abs().sort_values(ascending=False).index)
+        return [{"factor": factor, "impact": f"{100 * value:+.1f}%", "icon": self.icons[factor]}
+                for factor, value in ranked.head(top).items()]
+
+
+def main():
+    from batch_score import load_grid_rows
+    from model_registry import registry
+    from preprocessing import F1Preprocessor, grid_overrides
+    from training_data import load_latest_driver_features
+
+    parser = argparse.ArgumentParser(description="Explain podium predictions by factor group")
+    parser.add_argument('--model', default='podium-xgb', help="registry name")
+    parser.add_argument('--round', type=int, default=1, dest='round_number')
+    parser.add_argument('--top', type=int, default=10, help="drivers to show")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print(f"🔍 CONTRIBUTING FACTORS: {args.model}, 2026 ROUND {args.round_number}")
+    print("=" * 70)
+
+    model = registry.load(args.model)
+    explainer = Explainer(model)
+    grid = load_grid_rows()
+    grid = grid[grid['round'] == args.round_number].reset_index(drop=True)
+    rows = load_latest_driver_features().reindex(grid['driverId'])
+    X = F1Preprocessor(explainer.features).transform_frame(
+        rows, grid_overrides(grid['estimated_grid_position'].to_numpy()))
+
+    # Timed warm, as served: the first call of each pays one-off setup
+    model.predict_proba(X)
+    explainer.explain(X)
+    start = time.perf_counter()
+    proba = model.predict_proba(X)[:, 1]
+    predict_s = time.perf_counter() - start
+    start = time.perf_counter()
+    impacts = explainer.explain(X)
+    explain_s = time.perf_counter() - start
+    print(f"\n⚡ {len(X)} rows: predict {1000 * predict_s:.1f}ms, explain {1000 * explain_s:.1f}ms "
+          f"({explain_s / predict_s:.1f}x)")
+
+    table = impacts.mul(100).round(1)
+    table.insert(0, 'p', proba.round(3))
+    table.insert(0, 'driver', grid['familyName'])
+    print(table.sort_values('p', ascending=False).head(args.top).to_string(index=False))
+    print("=" * 70)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+"""
+F1 Feature Selection
+Ranks the production model's features by native tree SHAP (or gain)
+importance, retrains on top-k subsets and keeps the smallest subset within
+a tolerance of the best validation accuracy. Selection only uses the
+training rounds (validation = their last VALIDATION_ROUNDS rounds), so the
+2025 R21-R24 test rounds retrain_model.py reports on stay unseen.
+retrain_model.py picks the result up from models/selected_features.pkl.
+
+Usage:
+    python feature_selection.py
+    python feature_selection.py --method gain --tolerance 0.01
+    python feature_selection.py --write-store   # also write a pruned feature CSV
+"""
+
+import argparse
+import pickle
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from training_data import (
+    ROOT, EXCLUDE_COLS, MODEL_FEATURES, SELECTED_FEATURES_PATH, default_dataset_path,
+    load_dataset, rounds_in_order, select_rounds, to_xy, new_models,
+)
+
+warnings.filterwarnings('ignore')
+
+REPORT_PATH = ROOT / 'models/feature_selection_report.csv'
+PRUNED_STORE_PATH = ROOT / 'data/processed/f1_v3_selected_features.csv'
+HOLDOUT_FROM = (2025, 20)   # test rounds of retrain_model.py: never used here
+VALIDATION_ROUNDS = 6       # last training rounds used to score the subsets
+K_GRID = [5, 10, 15, 20, 25, 30, 35, 40]
+
+
+def rank_features(model, X, method='shap'):
+    """Features sorted by mean |SHAP| (native pred_contribs) or total gain."""
+    booster = model.get_booster()
+    if method == 'shap':
+        import xgboost as xgb
+        contribs = booster.predict(xgb.DMatrix(X), pred_contribs=True)[:, :-1]  # drop bias
+        scores = np.abs(contribs).mean(axis=0)
+    else:
+        gain = booster.get_score(importance_type='total_gain')
+        scores = np.array([gain.get(col, 0.0) for col in X.columns])
+    ranking = pd.Series(scores, index=X.columns).sort_values(ascending=False)
+    return ranking
+
+
+def validation_score(cols, train_df, test_df):
+    from sklearn.metrics import accuracy_score
+
+    model = new_models()['XGBoost']
+    X_train, y_train = to_xy(train_df, cols)
+    X_test, y_test = to_xy(test_df, cols)
+    model.fit(X_train, y_train)
+    return accuracy_score(y_test, model.predict(X_test))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Importance-driven feature pruning")
+    parser.add_argument('--method', choices=['shap', 'gain'], default='shap')
+    parser.add_argument('--tolerance', type=float, default=0.005,
+                        help="max accuracy drop vs the best subset")
+    parser.add_argument('--write-store', action='store_true',
+                        help=f"write metadata + selected columns to {PRUNED_STORE_PATH.name}")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("✂️  F1 FEATURE SELECTION")
+    print("=" * 70)
+
+    df = load_dataset(default_dataset_path())
+    feature_cols = [col for col in MODEL_FEATURES if col in df.columns]
+    train_rounds = rounds_in_order(select_rounds(df, until=HOLDOUT_FROM))
+    validation_start = train_rounds[-VALIDATION_ROUNDS - 1]
+    fit_df = select_rounds(df, until=validation_start)
+    val_df = select_rounds(df, after=validation_start, until=HOLDOUT_FROM)
+
+    # STEP 1: Rank
+    print(f"\n📊 STEP 1: Ranking {len(feature_cols)} features by {args.method}...")
+    print("-" * 70)
+    print(f"   Fit rows: {len(fit_df):,}  Validation rows: {len(val_df):,} "
+          f"({train_rounds[-VALIDATION_ROUNDS]} → {train_rounds[-1]})")
+    ranker = new_models()['XGBoost']
+    X_fit, y_fit = to_xy(fit_df, feature_cols)
+    ranker.fit(X_fit, y_fit)
+    ranking = rank_features(ranker, X_fit, args.method)
+    for name, score in ranking.head(10).items():
+        print(f"   {name:35s} {score:.4f}")
+
+    # STEP 2: Evaluate subsets
+    print("\n🤖 STEP 2: Retraining on top-k subsets...")
+    print("-" * 70)
+    candidates = {f"top{k}": list(ranking.index[:k]) for k in K_GRID if k < len(feature_cols)}
+    candidates['all'] = feature_cols
+
+    rows = []
+    for label, cols in candidates.items():
+        acc = validation_score(cols, fit_df, val_df)
+        rows.append({'subset': label, 'n_features': len(cols), 'accuracy': acc})
+        print(f"   {label:25s} {len(cols):3d} features  {acc*100:.2f}%")
+    report = pd.DataFrame(rows)
+
+    # STEP 3: Pick the smallest subset within tolerance of the best
+    best_acc = report['accuracy'].max()
+    eligible = report[report['accuracy'] >= best_acc - args.tolerance]
+    chosen = eligible.sort_values(['n_features', 'accuracy'], ascending=[True, False]).iloc[0]
+    selected = candidates[chosen['subset']]
+    report['selected'] = report['subset'] == chosen['subset']
+
+    print(f"\n⭐ Selected: {chosen['subset']} ({len(selected)} features, "
+          f"{chosen['accuracy']*100:.2f}% vs best {best_acc*100:.2f}%)")
+
+    # STEP 4: Save schema
+    SELECTED_FEATURES_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with open(SELECTED_FEATURES_PATH, 'wb') as f:
+        pickle.dump(selected, f)
+    report.to_csv(REPORT_PATH, index=False)
+    print(f"\n💾 Saved: {SELECTED_FEATURES_PATH}")
+    print(f"💾 Saved: {REPORT_PATH}")
+
+    if args.write_store:
+        keep = [c for c in EXCLUDE_COLS if c in df.columns] + selected
+        df[keep].to_csv(PRUNED_STORE_PATH, index=False)
+        print(f"💾 Saved: {PRUNED_STORE_PATH} ({len(keep)} of {len(df.columns)} columns)")
+
+    print("\n📋 NEXT STEP: run retrain_model.py to train the ensemble on the selected schema")
+    print("=" * 70)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,257 @@
+"""
+Incremental F1 Model Update (post-race weekend)
+Warm-starts the production CatBoost / XGBoost / LightGBM models on the rounds
+added since the last training run instead of retraining from scratch.
+
+Usage:
+    python incremental_retrain.py                       # +50 trees per model
+    python incremental_retrain.py --mode refit --decay 0.9
+    python incremental_retrain.py --extra-trees 100 --tolerance 0.01
+
+The candidate is trained on the new rounds (plus a few replayed ones) and
+validated on a --holdout-fraction share of the drivers of each of the most
+recent --holdout-rounds rounds, so the new rounds are both learned from and
+checked. It is compared with a full retrain on the same split and is only
+written to models/ensemble/ when it is within --tolerance of it.
+"""
+
+import argparse
+import copy
+import time
+import warnings
+
+from training_data import (
+    MODEL_FEATURES, default_dataset_path, load_dataset, model_features, rounds_in_order,
+    select_rounds, to_xy, new_models, load_models, save_models, load_training_state,
+    save_training_state,
+)
+
+warnings.filterwarnings('ignore')
+
+
+# ========================================
+# Warm-start helpers (one per booster)
+# ========================================
+
+def _continue_xgboost(base, X, y, extra_trees, mode):
+    from xgboost import XGBClassifier
+
+    params = base.get_params()
+    if mode == 'refit':
+        # Keep the tree structure, recompute leaf values on the new rows
+        params.update(n_estimators=base.get_booster().num_boosted_rounds(),
+                      process_type='update', updater='refresh', refresh_leaf=True)
+    else:
+        params.update(n_estimators=extra_trees)
+    model = XGBClassifier(**params)
+    model.fit(X, y, xgb_model=base.get_booster())
+    return model
+
+
+def _continue_lightgbm(base, X, y, extra_trees, mode, decay):
+    from lightgbm import LGBMClassifier
+
+    if mode == 'refit':
+        model = copy.deepcopy(base)
+        model._Booster = base.booster_.refit(X, y, decay_rate=decay)
+        return model
+    params = base.get_params()
+    params.update(n_estimators=extra_trees)
+    model = LGBMClassifier(**params)
+    model.fit(X, y, init_model=base.booster_)
+    return model
+
+
+def _continue_catboost(base, X, y, extra_trees, mode):
+    from catboost import CatBoostClassifier
+
+    if mode == 'refit':
+        # CatBoost has no leaf-refresh API; fall back to extra trees
+        print("     (CatBoost: refit not supported, adding trees)", end=" ")
+    params = base.get_params()
+    params.update(iterations=extra_trees)
+    model = CatBoostClassifier(**params)
+    model.fit(X, y, init_model=base)
+    return model
+
+
+def continue_training(name, base, X, y, extra_trees=50, mode='boost', decay=0.9):
+    """
+    Warm-start one production model on new rows.
+
+    mode='boost' appends `extra_trees` trees; mode='refit' keeps the existing
+    trees and refreshes their leaf values (XGBoost / LightGBM only).
+    """
+    if name == 'XGBoost':
+        return _continue_xgboost(base, X, y, extra_trees, mode)
+    if name == 'LightGBM':
+        return _continue_lightgbm(base, X, y, extra_trees, mode, decay)
+    if name == 'CatBoost':
+        return _continue_catboost(base, X, y, extra_trees, mode)
+    raise ValueError(f"Unknown model: {name}")
+
+
+def update_all(base_models, X, y, extra_trees, mode, decay):
+    updated, timings = {}, {}
+    for name, base in base_models.items():
+        start = time.perf_counter()
+        updated[name] = continue_training(name, base, X, y, extra_trees, mode, decay)
+        timings[name] = time.perf_counter() - start
+    return updated, timings
+
+
+def split_validation(df, rounds, fraction, seed=42):
+    """
+    (train, validation) rows: `fraction` of the drivers of each of `rounds`
+    are held out for validation, the rest of those rounds stays in training.
+    """
+    keys = list(zip(df['season'].astype(int), df['round'].astype(int)))
+    in_rounds = df[[key in set(rounds) for key in keys]]
+    validation = in_rounds.groupby(['season', 'round']).sample(frac=fraction, random_state=seed)
+    return df.drop(index=validation.index), validation
+
+
+def holdout_accuracy(models, X, y):
+    from sklearn.metrics import accuracy_score
+    return {name: accuracy_score(y, model.predict(X)) for name, model in models.items()}
+
+
+# ========================================
+# Main
+# ========================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Warm-start retraining on new rounds")
+    parser.add_argument('--mode', choices=['boost', 'refit'], default='boost',
+                        help="boost: add trees; refit: refresh leaf values")
+    parser.add_argument('--extra-trees', type=int, default=50,
+                        help="trees appended per model in boost mode")
+    parser.add_argument('--decay', type=float, default=0.9,
+                        help="LightGBM refit decay rate (weight kept by old leaves)")
+    parser.add_argument('--replay-rounds', type=int, default=3,
+                        help="already-seen rounds replayed with the new ones for stability")
+    parser.add_argument('--holdout-rounds', type=int, default=4,
+                        help="most recent rounds (new ones included) the validation rows come from")
+    parser.add_argument('--holdout-fraction', type=float, default=0.5,
+                        help="share of each holdout round's drivers held out for validation")
+    parser.add_argument('--tolerance', type=float, default=0.005,
+                        help="max accuracy drop allowed vs the reference")
+    parser.add_argument('--since', type=int, nargs=2, metavar=('SEASON', 'ROUND'),
+                        help="override the watermark (last round the models have seen)")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("⚡ F1 INCREMENTAL MODEL UPDATE")
+    print("=" * 70)
+
+    # STEP 1: Work out what is new
+    print("\n📊 STEP 1: Loading data and watermark...")
+    print("-" * 70)
+
+    df = load_dataset(default_dataset_path())
+    state = load_training_state() or {}
+    base_models = load_models()
+    feature_cols = state.get('feature_cols') \
+        or model_features(base_models['XGBoost'], default=MODEL_FEATURES)
+    all_rounds = rounds_in_order(df)
+
+    watermark = tuple(args.since) if args.since else state.get('last_trained_round')
+    if watermark is None:
+        print("❌ No training watermark found. Run retrain_model.py once first,")
+        print("   or pass --since SEASON ROUND.")
+        return 1
+
+    new_rounds = [r for r in all_rounds if r > watermark]
+    if not new_rounds:
+        print(f"✅ Models already up to date (last round: {watermark[0]} R{watermark[1]})")
+        return 0
+
+    seen_rounds = [r for r in all_rounds if r <= watermark]
+    replay_from = seen_rounds[-args.replay_rounds - 1] if len(seen_rounds) > args.replay_rounds else None
+    holdout = all_rounds[-args.holdout_rounds:]
+
+    print(f"✅ Dataset: {len(df):,} rows, {len(feature_cols)} features")
+    print(f"   Watermark: {watermark[0]} R{watermark[1]}")
+    print(f"   New rounds: {len(new_rounds)} ({new_rounds[0]} → {new_rounds[-1]})")
+    print(f"   Holdout: {args.holdout_fraction:.0%} of the drivers of {holdout[0]} → {holdout[-1]}")
+    if holdout[0] <= watermark:
+        print("   ⚠️  Production models have already seen part of the holdout;")
+        print("      the comparison will be optimistic for the incremental candidate.")
+
+    train_df, hold_df = split_validation(df, holdout, args.holdout_fraction)
+    X_hold, y_hold = to_xy(hold_df, feature_cols)
+
+    # STEP 2: Candidate = warm start on the new rounds, validation rows excluded
+    print("\n🤖 STEP 2: Warm-starting production models...")
+    print("-" * 70)
+
+    X_upd, y_upd = to_xy(select_rounds(train_df, after=replay_from), feature_cols)
+    if X_upd.empty or y_upd.nunique() < 2:
+        print(f"❌ Update set has {len(X_upd)} rows with {y_upd.nunique()} class(es);")
+        print("   nothing to warm-start on. Lower --holdout-fraction or raise --replay-rounds.")
+        return 1
+    print(f"   Update rows (validation excluded): {len(X_upd)}, validation rows: {len(X_hold)}")
+
+    candidate, timings = update_all(base_models, X_upd, y_upd,
+                                    args.extra_trees, args.mode, args.decay)
+    cand_acc = holdout_accuracy(candidate, X_hold, y_hold)
+    for name in candidate:
+        print(f"   {name:9s} {timings[name]:6.2f}s  holdout acc {cand_acc[name]*100:.2f}%")
+
+    # STEP 3: Reference accuracy
+    print("\n📏 STEP 3: Reference accuracy (full retrain, same split)...")
+    print("-" * 70)
+
+    X_full, y_full = to_xy(train_df, feature_cols)
+    full_models = new_models()
+    start = time.perf_counter()
+    for model in full_models.values():
+        model.fit(X_full, y_full)
+    print(f"   Full retrain on {len(X_full):,} rows: {time.perf_counter() - start:.1f}s")
+    ref_acc = holdout_accuracy(full_models, X_hold, y_hold)
+
+    # STEP 4: Accept / reject
+    print("\n🔍 STEP 4: Acceptance check (tolerance "
+          f"{args.tolerance*100:.2f} pts)...")
+    print("-" * 70)
+
+    accepted = True
+    for name in candidate:
+        ref = ref_acc.get(name)
+        ok = ref is None or cand_acc[name] >= ref - args.tolerance
+        accepted &= ok
+        ref_str = f"{ref*100:.2f}%" if ref is not None else "n/a"
+        print(f"   {'✅' if ok else '❌'} {name:9s} incremental {cand_acc[name]*100:.2f}%"
+              f"  vs reference {ref_str}")
+
+    if not accepted:
+        print("\n❌ Incremental update rejected - production models unchanged.")
+        print("   Run retrain_model.py for a full retrain.")
+        return 1
+
+    # STEP 5: Re-apply the accepted update including the validation rows and save
+    print("\n💾 STEP 5: Saving updated models...")
+    print("-" * 70)
+
+    final_df = select_rounds(df, after=replay_from)
+    X_fin, y_fin = to_xy(final_df, feature_cols)
+    final_models, timings = update_all(base_models, X_fin, y_fin,
+                                       args.extra_trees, args.mode, args.decay)
+    save_models(final_models)
+
+    state.update(
+        last_trained_round=all_rounds[-1],
+        feature_cols=feature_cols,
+        incremental_holdout_accuracy=cand_acc,
+        last_update='incremental',
+    )
+    save_training_state(state)
+
+    print(f"✅ Saved models/ensemble/*.pkl ({sum(timings.values()):.2f}s total update)")
+    print(f"   Watermark: {all_rounds[-1][0]} R{all_rounds[-1][1]}")
+    print("\n" + "=" * 70)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,249 @@
+"""
+Live Race Weekend
+Keeps one round's predictions live while qualifying results arrive. A grid
+update rewrites the grid-derived feature columns (grid_position,
+front_row_start, quali_made_q3, quali_made_q2) of only the drivers it moves
+and rescores just those rows with every podium model; the rest of the grid
+keeps its probabilities. Race odds (win / podium / expected points) come
+from the Monte Carlo simulator on the current grid.
+
+A replay file stands in for the live feed, one JSON object per line:
+
+    {"t": 512.0, "session": "Q1", "driver": "stroll", "grid_position": 18}
+
+(t = seconds since the start of qualifying).
+
+    session = LiveSession(1)
+    session.update({'norris': 1, 'piastri': 2})   # -> driverIds rescored
+    session.rows()                                # podium probabilities, best first
+    session.simulate()                            # race odds on the current grid
+
+Usage:
+    python live_session.py --round 1 --replay data/live/2026_r01_qualifying.jsonl
+    python live_session.py --round 1 --replay ... --speed 60      # 60x real time
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from batch_score import SCORING_MODELS, load_grid_rows
+from model_registry import registry
+from preprocessing import F1Preprocessor, grid_overrides
+from simulator import SeasonSimulator
+from training_data import MODEL_FEATURES, ROOT, load_latest_driver_features, model_features
+
+REPLAY_DIR = ROOT / 'data/live'
+STANDINGS_2025_PATH = ROOT.parent / '2025_final_standings.csv'
+SIM_DRAWS = 10_000
+RANDOMNESS = 0.15
+# Boosters fitted on frames score arrays in the same column order without
+# the frame overhead (~3x faster on one row); wrappers such as F1Ensemble or
+# the distilled students select columns by name and get a DataFrame
+ARRAY_LIBRARIES = ('xgboost', 'lightgbm', 'catboost')
+
+
+def load_scoring_models():
+    """{table suffix: model} of the batch scoring models on disk."""
+    return {suffix: registry.load(name) for suffix, name in SCORING_MODELS.items()
+            if registry.exists(name)}
+
+
+def read_replay(path):
+    """Replay events in time order."""
+    with open(path) as f:
+        events = [json.loads(line) for line in f if line.strip()]
+    return sorted(events, key=lambda e: e.get('t', 0))
+
+
+class LiveSession:
+    """
+    One round's grid and podium probabilities, updated a driver at a time.
+    Not thread-safe: apply updates from one thread (simulate() only reads
+    the grid it is given).
+    """
+
+    def __init__(self, round_number, models=None):
+        grids = load_grid_rows()
+        grids = grids[grids['round'] == round_number].reset_index(drop=True)
+        if grids.empty:
+            raise ValueError(f"Unknown round {round_number}")
+        models = load_scoring_models() if models is None else models
+        if not models:
+            raise ValueError("No podium model available to score with")
+
+        self.round = round_number
+        self.circuit = grids['circuit_name'].iloc[0]
+        self.drivers = grids['driverId'].tolist()
+        self.names = (grids['givenName'] + ' ' + grids['familyName']).tolist()
+        self.teams = grids['constructorName'].tolist()
+        self.index = {driver: i for i, driver in enumerate(self.drivers)}
+        self.estimated_grid = grids['estimated_grid_position'].to_numpy(dtype=int)
+        self.grid = self.estimated_grid.copy()
+        self.version = 0
+
+        # One matrix per feature list, as in batch_score.score(); updates
+        # rewrite the grid columns of the rows they touch
+        latest = load_latest_driver_features().reindex(grids['driverId'])
+        overrides = grid_overrides(self.grid)
+        self._matrices = {}
+        self._models = []
+        self.scores = {}
+        for suffix, model in models.items():
+            preprocessor = getattr(model, 'preprocessor', None) \
+                or F1Preprocessor(model_features(model, default=MODEL_FEATURES))
+            key = tuple(preprocessor.features)
+            if key not in self._matrices:
+                self._matrices[key] = preprocessor.transform(latest, overrides)
+            self._models.append((suffix, model, key))
+            self.scores[suffix] = self._predict(model, key, slice(None))
+
+        # Race simulation: the round's drivers with a momentum score
+        standings = pd.read_csv(STANDINGS_2025_PATH)
+        season = SeasonSimulator.from_csv(dnf_rates=dict(zip(standings['driverId'],
+                                                             standings['dnf_rate'])))
+        keep = [i for i, driver in enumerate(season.drivers) if driver in self.index]
+        self.sim_drivers = [season.drivers[i] for i in keep]
+        self._sim_rows = np.array([self.index[d] for d in self.sim_drivers], dtype=int)
+        self._sim_strength = season.strength[keep]
+        self._sim_dnf = season.dnf_rate[keep]
+
+    def _predict(self, model, key, rows):
+        X = self._matrices[key][rows]
+        if type(model).__module__.split('.')[0] not in ARRAY_LIBRARIES:
+            X = pd.DataFrame(X, columns=list(key))
+        return model.predict_proba(X)[:, 1]
+
+    def update(self, grid):
+        """
+        Apply {driverId: grid position}; returns the driverIds whose rows
+        changed (and were rescored). Unknown drivers raise KeyError.
+        """
+        for driver, position in grid.items():
+            if driver not in self.index:
+                raise KeyError(driver)
+            if not 1 <= int(position) <= len(self.drivers):
+                raise ValueError(f"Grid position {position} out of range for {driver}")
+        rows = [self.index[d] for d, p in grid.items() if self.grid[self.index[d]] != int(p)]
+        if not rows:
+            return []
+
+        rows = np.array(rows)
+        self.grid[rows] = [int(grid[self.drivers[i]]) for i in rows]
+        overrides = grid_overrides(self.grid[rows])
+        for key, X in self._matrices.items():
+            for col, values in overrides.items():
+                if col in key:
+                    X[rows, key.index(col)] = values
+        for suffix, model, key in self._models:
+            self.scores[suffix][rows] = self._predict(model, key, rows)
+        self.version += 1
+        return [self.drivers[i] for i in rows]
+
+    def reset(self):
+        """Back to the estimated grid."""
+        changed = {d: int(p) for d, p, now in zip(self.drivers, self.estimated_grid, self.grid)
+                   if p != now}
+        return self.update(changed)
+
+    @property
+    def podium_probability(self):
+        return np.mean(list(self.scores.values()), axis=0)
+
+    def rows(self):
+        """The round's drivers, best first, with the prediction table's columns."""
+        consensus = self.podium_probability
+        order = np.argsort(-consensus, kind='stable')
+        return [{
+            'round_rank': rank,
+            'driverId': self.drivers[i],
+            'driver': self.names[i],
+            'team': self.teams[i],
+            'grid_position': int(self.grid[i]),
+            'podium_probability': round(float(consensus[i]), 4),
+            **{f'p_{suffix}': round(float(proba[i]), 4) for suffix, proba in self.scores.items()},
+            'predicted_podium': rank <= 3,
+        } for rank, i in enumerate(order, 1)]
+
+    def simulate(self, n_draws=SIM_DRAWS, randomness=RANDOMNESS, seed=None, grid=None):
+        """
+        Race odds on `grid` (default: the current grid) from `n_draws`
+        simulated races, best first.
+        """
+        grid = (self.grid if grid is None else np.asarray(grid))[self._sim_rows]
+        simulator = SeasonSimulator(self.sim_drivers, [self.names[i] for i in self._sim_rows],
+                                    self._sim_strength, grid[None, :], self._sim_dnf,
+                                    rounds=[self.round])
+        tally = simulator.simulate(n_draws, randomness, seed)
+        counts = tally.position_counts[0] / n_draws
+        odds = [{
+            'driverId': driver,
+            'grid_position': int(grid[j]),
+            'win_probability': round(float(counts[j, 0]), 4),
+            'podium_probability': round(float(counts[j, :3].sum()), 4),
+            'points_probability': round(float(counts[j, :10].sum()), 4),
+            'expected_points': round(float(tally.points[j] / n_draws), 2),
+        } for j, driver in enumerate(self.sim_drivers)]
+        return sorted(odds, key=lambda o: -o['win_probability'])
+
+
+def replay(session, events, speed=None):
+    """
+    Feed replay events into `session`, sleeping between them at `speed`x
+    real time (None: as fast as possible); yields (event, changed driverIds,
+    rescoring seconds).
+    """
+    previous = None
+    for event in events:
+        if speed and previous is not None:
+            time.sleep(max(event.get('t', 0) - previous, 0) / speed)
+        previous = event.get('t', 0)
+        start = time.perf_counter()
+        changed = session.update({event['driver']: event['grid_position']})
+        yield event, changed, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a qualifying session into live predictions")
+    parser.add_argument('--round', type=int, required=True)
+    parser.add_argument('--replay', required=True, help="JSONL file of grid updates")
+    parser.add_argument('--speed', type=float, help="x real time (default: no waiting)")
+    parser.add_argument('--draws', type=int, default=SIM_DRAWS, help="simulated races per update")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print(f"📡 LIVE RACE WEEKEND - ROUND {args.round}")
+    print("=" * 70)
+
+    start = time.perf_counter()
+    session = LiveSession(args.round)
+    print(f"\n✅ {session.circuit}: {len(session.drivers)} drivers x {len(session.scores)} models "
+          f"ready in {time.perf_counter() - start:.2f}s")
+
+    events = read_replay(args.replay)
+    timings = []
+    for event, changed, seconds in replay(session, events, args.speed):
+        timings.append(seconds)
+        leaders = ', '.join(r['driverId'] for r in session.rows()[:3])
+        print(f"   {event.get('session', ''):3s} P{event['grid_position']:<2d} {event['driver']:18s} "
+              f"rescored {len(changed)} row(s) in {1000 * seconds:6.2f}ms  podium: {leaders}")
+
+    start = time.perf_counter()
+    odds = session.simulate(args.draws, seed=0)
+    sim_ms = 1000 * (time.perf_counter() - start)
+    print(f"\n🏁 PREDICTED PODIUM (final grid):")
+    print(pd.DataFrame(session.rows()[:5])[['round_rank', 'driver', 'grid_position',
+                                            'podium_probability']].to_string(index=False))
+    print(f"\n🎲 RACE ODDS ({args.draws:,} simulated races, {sim_ms:.0f}ms):")
+    print(pd.DataFrame(odds[:5])[['driverId', 'grid_position', 'win_probability',
+                                  'podium_probability']].to_string(index=False))
+    print(f"\n⚡ {len(timings)} updates, rescoring p50 {1000 * np.median(timings):.2f}ms, "
+          f"max {1000 * max(timings):.2f}ms")
+    print("=" * 70)
+
+
+if __name__ == '__main__':
+    main()
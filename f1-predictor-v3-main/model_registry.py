@@ -0,0 +1,266 @@
+"""
+Model & Data Registry
+One manifest (models/registry.json) naming every model / data artifact the
+apps, scripts and API use. Artifacts are stored content-addressed (sha256),
+so byte-identical copies at several paths are one artifact and are
+unpickled at most once per process, whichever name or path asks for them.
+
+    from model_registry import registry
+    model = registry.load('production')          # latest version
+    model = registry.load('podium-xgb:1')        # pinned version, while on disk
+    registry.register('podium-ensemble', path)   # after saving a new artifact
+
+Usage:
+    python model_registry.py list
+    python model_registry.py verify
+    python model_registry.py register podium-student models/student/f1_student.pkl
+"""
+
+import argparse
+import hashlib
+import json
+import pickle
+import threading
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+REGISTRY_PATH = REPO_ROOT / 'f1-predictor-v3-main/models/registry.json'
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _load_file(path):
+    if path.suffix == '.csv':
+        import pandas as pd
+        return pd.read_csv(path)
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+
+class ArtifactNotFound(LookupError):
+    pass
+
+
+class Registry:
+    """
+    Manifest layout:
+        artifacts -- {sha256: {'paths': [repo-relative paths], 'bytes': n}}
+        models    -- {name: {'path': canonical path the producer writes,
+                             'description': str,
+                             'versions': {version: sha256}}}
+
+    A name with no versions yet (an artifact a script has not produced /
+    registered) resolves to its canonical path, unhashed.
+
+    The registry records hashes, not copies: a producer overwriting its
+    canonical path leaves the older versions listed (sha256, size) but with
+    no file, and loading them raises ArtifactNotFound. Register a copy at
+    another path to keep a version loadable.
+    """
+
+    def __init__(self, manifest_path=REGISTRY_PATH):
+        self.manifest_path = Path(manifest_path)
+        self._manifest = None
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    # ----- manifest -----
+
+    @property
+    def manifest(self):
+        if self._manifest is None:
+            try:
+                with open(self.manifest_path) as f:
+                    self._manifest = json.load(f)
+            except FileNotFoundError:
+                self._manifest = {'artifacts': {}, 'models': {}}
+        return self._manifest
+
+    def save(self):
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.manifest_path, 'w') as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+            f.write('\n')
+
+    @staticmethod
+    def _relative(path):
+        path = Path(path).resolve()
+        try:
+            return path.relative_to(REPO_ROOT).as_posix()
+        except ValueError:
+            return str(path)
+
+    # ----- resolution -----
+
+    def names(self):
+        return sorted(self.manifest['models'])
+
+    def resolve(self, ref):
+        """
+        'name' or 'name:version' -> {'name', 'version', 'sha256', 'paths'}.
+        `version` and `sha256` are None for names with nothing registered yet.
+        """
+        name, _, version = ref.partition(':')
+        entry = self.manifest['models'].get(name)
+        if entry is None:
+            raise ArtifactNotFound(f"Unknown artifact '{name}' (known: {', '.join(self.names())})")
+
+        versions = entry.get('versions', {})
+        if not versions:
+            if version:
+                raise ArtifactNotFound(f"'{name}' has no registered versions")
+            return {'name': name, 'version': None, 'sha256': None, 'paths': [entry['path']]}
+
+        version = version or max(versions, key=int)
+        if version not in versions:
+            raise ArtifactNotFound(f"'{name}' has no version {version} (have {', '.join(versions)})")
+        sha = versions[version]
+        paths = list(self.manifest['artifacts'][sha]['paths'])
+        return {'name': name, 'version': int(version), 'sha256': sha, 'paths': paths}
+
+    def path(self, ref):
+        """First existing file holding the artifact."""
+        info = self.resolve(ref)
+        if not info['paths']:
+            raise ArtifactNotFound(f"'{info['name']}' version {info['version']} is no longer on disk "
+                                   f"(its files now hold a later version)")
+        for rel in info['paths']:
+            candidate = REPO_ROOT / rel
+            if candidate.exists():
+                return candidate
+        raise ArtifactNotFound(f"No file found for '{ref}' (tried {', '.join(info['paths'])})")
+
+    def exists(self, ref):
+        try:
+            self.path(ref)
+            return True
+        except ArtifactNotFound:
+            return False
+
+    def is_loaded(self, ref):
+        """True once `ref` has been loaded in this process (never triggers a load)."""
+        try:
+            info = self.resolve(ref)
+            key = info['sha256'] or f"path:{self.path(ref)}"
+        except ArtifactNotFound:
+            return False
+        return key in self._cache
+
+    def version_key(self, ref):
+        """Short, stable identifier of what `ref` currently resolves to (for cache keys)."""
+        info = self.resolve(ref)
+        if info['sha256']:
+            return f"{info['name']}:{info['version']}:{info['sha256'][:12]}"
+        stat = self.path(ref).stat()
+        return f"{info['name']}:{stat.st_mtime_ns}-{stat.st_size}"
+
+    # ----- loading -----
+
+    def load(self, ref):
+        """Load an artifact, at most once per process per distinct content."""
+        info = self.resolve(ref)
+        path = self.path(ref)
+        key = info['sha256'] or f"path:{path}"
+        with self._lock:
+            if key not in self._cache:
+                self._cache[key] = _load_file(path)
+            return self._cache[key]
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+        self._manifest = None
+
+    # ----- registration -----
+
+    def register(self, name, path, description=None, save=True):
+        """
+        Record the file at `path` as the latest version of `name` (no new
+        version if its content matches the current latest). A path whose
+        content changed is detached from the artifact it used to hold.
+        """
+        path = Path(path)
+        rel, sha = self._relative(path), file_sha256(path)
+        artifacts, models = self.manifest['artifacts'], self.manifest['models']
+
+        for other_sha, artifact in artifacts.items():
+            if other_sha != sha and rel in artifact['paths']:
+                artifact['paths'].remove(rel)
+        artifact = artifacts.setdefault(sha, {'paths': [], 'bytes': path.stat().st_size})
+        if rel not in artifact['paths']:
+            artifact['paths'].append(rel)
+
+        entry = models.setdefault(name, {'path': rel, 'versions': {}})
+        if description:
+            entry['description'] = description
+        versions = entry.setdefault('versions', {})
+        latest = max(versions, key=int) if versions else None
+        if latest is None or versions[latest] != sha:
+            versions[str(int(latest or 0) + 1)] = sha
+
+        with self._lock:
+            self._cache.pop(f"path:{path.resolve()}", None)
+        if save:
+            self.save()
+        return self.resolve(name)
+
+    def verify(self):
+        """(path, problem) pairs for registered files that are missing or changed."""
+        problems = []
+        for sha, artifact in self.manifest['artifacts'].items():
+            for rel in artifact['paths']:
+                path = REPO_ROOT / rel
+                if not path.exists():
+                    problems.append((rel, 'missing'))
+                elif file_sha256(path) != sha:
+                    problems.append((rel, 'content changed since registration'))
+        return problems
+
+
+registry = Registry()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Model & data artifact registry")
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('list')
+    sub.add_parser('verify')
+    reg = sub.add_parser('register')
+    reg.add_argument('name')
+    reg.add_argument('path')
+    reg.add_argument('--description')
+    args = parser.parse_args()
+
+    if args.command == 'register':
+        info = registry.register(args.name, args.path, args.description)
+        print(f"✅ {info['name']}:{info['version']} -> {info['sha256'][:12]} ({', '.join(info['paths'])})")
+
+    elif args.command == 'list':
+        print("=" * 70)
+        print("📦 REGISTERED ARTIFACTS")
+        print("=" * 70)
+        for name in registry.names():
+            info = registry.resolve(name)
+            version = f"v{info['version']} {info['sha256'][:12]}" if info['sha256'] else "unregistered"
+            print(f"   {name:22s} {version:20s} {', '.join(info['paths'])}")
+        artifacts = registry.manifest['artifacts']
+        copies = sum(len(a['paths']) for a in artifacts.values())
+        print(f"\n   {len(artifacts)} unique artifacts, {copies} files on disk")
+
+    elif args.command == 'verify':
+        problems = registry.verify()
+        for rel, problem in problems:
+            print(f"❌ {rel}: {problem}")
+        if problems:
+            raise SystemExit(1)
+        print("✅ All registered files match their content hash")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,361 @@
+"""
+Prediction Store
+Embedded SQLite history of every prediction batch: the 2026 batch scoring
+run, API predictions and Streamlit grids. Each batch records its source,
+model version, a hash of its inputs and when it was made; its rows are
+indexed by driver and (season, round) for paginated history queries.
+
+Reads go through the store: a batch whose (source, model version, inputs)
+was already recorded is answered from it instead of being recomputed.
+
+    store = PredictionStore.open()
+    rows = store.get_or_compute('batch_score', model_version, inputs, compute)
+    page = store.history(driver='norris', season=2026, limit=20)
+    page = store.history(driver='norris', cursor=page['next_cursor'])
+
+Rows keep every column of the producer (JSON); the indexed columns are
+taken from the first column present of COLUMN_ALIASES, and drivers are
+stored as driverIds whatever the producer called them (name, code, id).
+
+    F1_PREDICTION_STORE=models/predictions.sqlite   database (0 disables the store)
+
+Usage:
+    python prediction_store.py history --driver norris --round 3
+    python prediction_store.py batches --source api:predict
+    python prediction_store.py import-legacy    # 2025_top3 / 2026_season CSVs as batches
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import unicodedata
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+
+import pandas as pd
+
+from training_data import FEATURES_PATH, ROOT
+
+STORE_PATH = os.getenv('F1_PREDICTION_STORE', str(ROOT / 'models/predictions.sqlite'))
+LINEUP_PATH = ROOT / '2026_driver_lineup.csv'
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+SCHEMA_VERSION = 1
+
+# Indexed column -> producer columns it is read from, first present wins
+COLUMN_ALIASES = {
+    'driver_id': ('driverId', 'driver_id', 'Driver', 'driver'),
+    'season': ('season',),
+    'round': ('round',),
+    'circuit': ('circuit_name', 'circuit', 'race'),
+    'podium_probability': ('podium_probability', 'Podium_Probability'),
+}
+
+# Hand-maintained top-3 tables: file -> (season, [(driver column, probability column)])
+LEGACY_FILES = {
+    '2025_top3_predictions.csv': (2025, [('favorite', 'favorite_prob'), ('second', 'second_prob'),
+                                         ('third', 'third_prob')]),
+    '2026_season_predictions.csv': (2026, [('predicted_winner', 'winner_probability'),
+                                           ('second_choice', 'second_probability'),
+                                           ('third_choice', 'third_probability')]),
+    '2026_season_predictions_FIXED.csv': (2026, [('predicted_winner', 'winner_probability'),
+                                                 ('second_choice', 'second_probability'),
+                                                 ('third_choice', 'third_probability')]),
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS batches (
+    id INTEGER PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    source TEXT NOT NULL,
+    model_version TEXT NOT NULL,
+    inputs_hash TEXT NOT NULL,
+    inputs TEXT NOT NULL,
+    n_rows INTEGER NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS batches_inputs ON batches (source, model_version, inputs_hash);
+CREATE INDEX IF NOT EXISTS batches_model ON batches (model_version);
+
+CREATE TABLE IF NOT EXISTS predictions (
+    id INTEGER PRIMARY KEY,
+    batch_id INTEGER NOT NULL REFERENCES batches (id),
+    driver_id TEXT,
+    season INTEGER,
+    round INTEGER,
+    circuit TEXT,
+    podium_probability REAL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS predictions_batch ON predictions (batch_id);
+CREATE INDEX IF NOT EXISTS predictions_driver ON predictions (driver_id);
+CREATE INDEX IF NOT EXISTS predictions_round ON predictions (season, round);
+"""
+
+
+def _json_default(value):
+    # numpy scalars / arrays, pandas timestamps
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    return str(value)
+
+
+def inputs_hash(inputs):
+    """Stable hash of a JSON-able description of a batch's inputs."""
+    canonical = json.dumps(inputs, sort_keys=True, separators=(',', ':'), default=_json_default)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def _normalize(name):
+    name = unicodedata.normalize('NFKD', str(name)).encode('ascii', 'ignore').decode()
+    return name.lower().strip()
+
+
+@lru_cache(maxsize=None)
+def driver_aliases():
+    """{normalized full name / code / id: driverId} of every known driver."""
+    drivers = pd.read_csv(FEATURES_PATH, usecols=['driverId', 'driverCode', 'givenName', 'familyName'])
+    if LINEUP_PATH.exists():
+        drivers = pd.concat([drivers, pd.read_csv(LINEUP_PATH, usecols=['driverId', 'givenName',
+                                                                        'familyName'])])
+    aliases = {}
+    for row in drivers.drop_duplicates('driverId').itertuples():
+        aliases[_normalize(f"{row.givenName} {row.familyName}")] = row.driverId
+        if isinstance(row.driverCode, str) and row.driverCode != '\\N':
+            aliases.setdefault(_normalize(row.driverCode), row.driverId)
+        aliases[_normalize(row.driverId)] = row.driverId
+    return aliases
+
+
+def driver_id(value):
+    """driverId of a driver name, code or id (unknown names become a lower_snake id)."""
+    if value is None:
+        return None
+    key = _normalize(value)
+    return driver_aliases().get(key, key.replace(' ', '_'))
+
+
+def _records(rows):
+    if isinstance(rows, pd.DataFrame):
+        return rows.to_dict('records')
+    return list(rows)
+
+
+def _indexed(row, defaults):
+    values = dict(defaults)
+    for column, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in row and row[alias] is not None:
+                values[column] = row[alias]
+                break
+    values['driver_id'] = driver_id(values.get('driver_id'))
+    for column in ('season', 'round'):
+        if values.get(column) is not None:
+            values[column] = int(values[column])
+    if values.get('podium_probability') is not None:
+        values['podium_probability'] = float(values['podium_probability'])
+    return values
+
+
+class PredictionStore:
+    """SQLite prediction history; one connection per thread, WAL so readers never block."""
+
+    def __init__(self, path=STORE_PATH):
+        self.path = Path(path)
+        self._local = threading.local()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connection() as db:
+            db.executescript(SCHEMA)
+            db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    @classmethod
+    def open(cls, path=STORE_PATH):
+        """The store at `path`, or None when F1_PREDICTION_STORE=0."""
+        return None if str(path) == '0' else cls(path)
+
+    def _connection(self):
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=10)
+            db.row_factory = sqlite3.Row
+            db.execute("PRAGMA journal_mode = WAL")
+            db.execute("PRAGMA synchronous = NORMAL")
+            db.execute("PRAGMA foreign_keys = ON")
+            self._local.db = db
+        return db
+
+    # ----- writing -----
+
+    def record(self, source, model_version, inputs, rows, season=None, round_number=None,
+               circuit=None):
+        """
+        Store a batch; returns its id. A batch with the same source, model
+        version and inputs is kept as it is (its id is returned).
+        """
+        rows = _records(rows)
+        digest = inputs_hash(inputs)
+        defaults = {'season': season, 'round': round_number, 'circuit': circuit}
+        db = self._connection()
+        with db:
+            cursor = db.execute(
+                "INSERT OR IGNORE INTO batches (created_at, source, model_version, inputs_hash, "
+                "inputs, n_rows) VALUES (?, ?, ?, ?, ?, ?)",
+                (datetime.now(timezone.utc).isoformat(timespec='milliseconds'), source,
+                 model_version, digest, json.dumps(inputs, sort_keys=True, default=_json_default),
+                 len(rows)))
+            if not cursor.rowcount:
+                return self._batch_id(source, model_version, digest)
+            batch_id = cursor.lastrowid
+            indexed = [_indexed(row, defaults) for row in rows]
+            db.executemany(
+                "INSERT INTO predictions (batch_id, driver_id, season, round, circuit, "
+                "podium_probability, data) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(batch_id, values.get('driver_id'), values.get('season'), values.get('round'),
+                  values.get('circuit'), values.get('podium_probability'),
+                  json.dumps(row, default=_json_default))
+                 for row, values in zip(rows, indexed)])
+        return batch_id
+
+    # ----- reading -----
+
+    def _batch_id(self, source, model_version, digest):
+        row = self._connection().execute(
+            "SELECT id FROM batches WHERE source = ? AND model_version = ? AND inputs_hash = ?",
+            (source, model_version, digest)).fetchone()
+        return row['id'] if row else None
+
+    def rows(self, batch_id):
+        """A batch's rows as recorded (list of dicts, in insertion order)."""
+        return [json.loads(r['data']) for r in self._connection().execute(
+            "SELECT data FROM predictions WHERE batch_id = ? ORDER BY id", (batch_id,))]
+
+    def lookup(self, source, model_version, inputs):
+        """Rows of the recorded batch for these inputs, or None."""
+        batch_id = self._batch_id(source, model_version, inputs_hash(inputs))
+        return None if batch_id is None else self.rows(batch_id)
+
+    def get_or_compute(self, source, model_version, inputs, compute, **batch_values):
+        """
+        Read-through: the recorded rows for (source, model_version, inputs),
+        else compute() (a DataFrame or list of dicts) recorded and returned
+        as a list of dicts.
+        """
+        rows = self.lookup(source, model_version, inputs)
+        if rows is None:
+            rows = json.loads(json.dumps(_records(compute()), default=_json_default))
+            self.record(source, model_version, inputs, rows, **batch_values)
+        return rows
+
+    def history(self, driver=None, season=None, round_number=None, model_version=None,
+                source=None, limit=PAGE_SIZE, cursor=None):
+        """
+        Recorded predictions, newest first, filtered by any of driver
+        (name, code or id), season, round, model version and source.
+        Keyset-paginated: pass the returned `next_cursor` for the next page.
+        """
+        where, params = [], []
+        for clause, value in (("p.driver_id = ?", driver_id(driver) if driver else None),
+                              ("p.season = ?", season), ("p.round = ?", round_number),
+                              ("b.model_version = ?", model_version), ("b.source = ?", source),
+                              ("p.id < ?", cursor)):
+            if value is not None:
+                where.append(clause)
+                params.append(value)
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+        query = ("SELECT p.id, p.batch_id, b.created_at, b.source, b.model_version, p.data "
+                 "FROM predictions p JOIN batches b ON b.id = p.batch_id"
+                 + (" WHERE " + " AND ".join(where) if where else "")
+                 + " ORDER BY p.id DESC LIMIT ?")
+        found = self._connection().execute(query, (*params, limit + 1)).fetchall()
+        items = [{'prediction_id': r['id'], 'batch_id': r['batch_id'], 'created_at': r['created_at'],
+                  'source': r['source'], 'model_version': r['model_version'],
+                  **json.loads(r['data'])} for r in found[:limit]]
+        return {'items': items, 'next_cursor': found[limit - 1]['id'] if len(found) > limit else None}
+
+    def batches(self, source=None, model_version=None, limit=PAGE_SIZE, cursor=None):
+        """Recorded batches, newest first, keyset-paginated like history()."""
+        where, params = [], []
+        for clause, value in (("source = ?", source), ("model_version = ?", model_version),
+                              ("id < ?", cursor)):
+            if value is not None:
+                where.append(clause)
+                params.append(value)
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+        found = self._connection().execute(
+            "SELECT id, created_at, source, model_version, inputs_hash, inputs, n_rows FROM batches"
+            + (" WHERE " + " AND ".join(where) if where else "")
+            + " ORDER BY id DESC LIMIT ?", (*params, limit + 1)).fetchall()
+        items = [{**dict(r), 'inputs': json.loads(r['inputs'])} for r in found[:limit]]
+        return {'items': items, 'next_cursor': found[limit - 1]['id'] if len(found) > limit else None}
+
+    def import_legacy(self, name):
+        """Record a hand-maintained top-3 CSV (LEGACY_FILES) as a batch; returns its id."""
+        from model_registry import file_sha256
+        season, picks = LEGACY_FILES[name]
+        path = ROOT / name
+        table = pd.read_csv(path)
+        circuit = 'circuit' if 'circuit' in table.columns else None
+        rows = [{'season': season, 'round': int(r['round']),
+                 'circuit': r[circuit] if circuit else None,
+                 'driver': r[driver_col], 'podium_probability': float(r[proba_col]),
+                 'round_rank': rank}
+                for r in table.to_dict('records')
+                for rank, (driver_col, proba_col) in enumerate(picks, 1)]
+        return self.record('legacy', f'legacy:{name}', {'file': name, 'sha256': file_sha256(path)},
+                           rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prediction history store")
+    parser.add_argument('--db', default=STORE_PATH)
+    sub = parser.add_subparsers(dest='command', required=True)
+    hist = sub.add_parser('history')
+    hist.add_argument('--driver')
+    hist.add_argument('--season', type=int)
+    hist.add_argument('--round', type=int)
+    hist.add_argument('--model-version')
+    hist.add_argument('--source')
+    hist.add_argument('--limit', type=int, default=20)
+    bat = sub.add_parser('batches')
+    bat.add_argument('--source')
+    bat.add_argument('--limit', type=int, default=20)
+    sub.add_parser('import-legacy')
+    args = parser.parse_args()
+
+    store = PredictionStore(args.db)
+    if args.command == 'history':
+        page = store.history(args.driver, args.season, args.round, args.model_version,
+                             args.source, args.limit)
+        if not page['items']:
+            print("No recorded predictions match")
+            return
+        columns = ['prediction_id', 'created_at', 'source', 'model_version', 'season', 'round',
+                   'driver', 'podium_probability']
+        frame = pd.DataFrame(page['items'])
+        print(frame[[c for c in columns if c in frame.columns]].to_string(index=False))
+
+    elif args.command == 'batches':
+        page = store.batches(args.source, limit=args.limit)
+        for b in page['items']:
+            print(f"   #{b['id']:<5d} {b['created_at']}  {b['source']:12s} {b['n_rows']:5d} rows  "
+                  f"{b['model_version']}")
+
+    elif args.command == 'import-legacy':
+        print("=" * 70)
+        print("🗄️  IMPORTING LEGACY PREDICTION FILES")
+        print("=" * 70)
+        for name in LEGACY_FILES:
+            if not (ROOT / name).exists():
+                print(f"   ⏭️  {name}: not found, skipped")
+                continue
+            batch_id = store.import_legacy(name)
+            print(f"   ✅ {name} -> batch #{batch_id}")
+        print(f"\n💾 Store: {store.path}")
+        print("=" * 70)
+
+
+if __name__ == '__main__':
+    main()
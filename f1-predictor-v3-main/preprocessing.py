@@ -0,0 +1,111 @@
+"""
+F1 Preprocessing Pipeline
+Turns raw driver rows into the model's float32 feature matrix in one call:
+fixed column order, categorical lookups with an unknown code, default fills.
+
+    pre = F1Preprocessor.from_package(model_package)        # legacy dict packages
+    pre = F1Preprocessor.fit(train_df, feature_cols)         # from training data
+    X = pre.transform(rows, overrides={'grid_position': 5})  # np.float32 (n, k)
+"""
+
+import numpy as np
+import pandas as pd
+
+UNKNOWN_CODE = -1
+
+
+def grid_overrides(grid_position):
+    """Grid-derived feature columns for a start position (scalar or array)."""
+    grid = np.asarray(grid_position)
+    return {
+        'grid_position': grid,
+        'front_row_start': (grid <= 2).astype(int),
+        'quali_made_q3': (grid <= 10).astype(int),
+        'quali_made_q2': (grid <= 15).astype(int),
+    }
+
+
+class F1Preprocessor:
+    """
+    features         -- output column order
+    categorical_maps -- {column: {category_str: code}}; unseen values get
+                        `unknown_code`
+    defaults         -- {column: fill value} for missing columns / NaNs
+                        (columns not listed fill with 0, as in training)
+    """
+
+    def __init__(self, features, categorical_maps=None, defaults=None,
+                 unknown_code=UNKNOWN_CODE):
+        self.features = list(features)
+        self.categorical_maps = {col: dict(m) for col, m in (categorical_maps or {}).items()
+                                 if col in self.features}
+        self.defaults = {col: float(v) for col, v in (defaults or {}).items()}
+        self.unknown_code = unknown_code
+
+        self._numeric = [c for c in self.features if c not in self.categorical_maps]
+        self._numeric_idx = np.array([self.features.index(c) for c in self._numeric], dtype=int)
+        self._default_row = np.array([self.defaults.get(c, 0.0) for c in self.features],
+                                     dtype=np.float32)
+
+    @classmethod
+    def from_label_encoders(cls, features, label_encoders, categorical_cols=None,
+                            defaults=None):
+        cols = categorical_cols if categorical_cols is not None else list(label_encoders)
+        maps = {col: {str(c): i for i, c in enumerate(label_encoders[col].classes_)}
+                for col in cols if label_encoders.get(col) is not None}
+        return cls(features, maps, defaults)
+
+    @classmethod
+    def from_package(cls, package):
+        """Build from a legacy dict package with 'features' and 'label_encoders'."""
+        return cls.from_label_encoders(package['features'],
+                                       package.get('label_encoders') or {},
+                                       package.get('categorical_cols'))
+
+    @classmethod
+    def fit(cls, df, features, categorical_cols=None, defaults=None):
+        """Learn category codes from training rows (object columns if not given)."""
+        if categorical_cols is None:
+            categorical_cols = [c for c in features
+                                if c in df.columns and df[c].dtype == object]
+        maps = {col: {v: i for i, v in enumerate(sorted(df[col].dropna().astype(str).unique()))}
+                for col in categorical_cols}
+        return cls(features, maps, defaults)
+
+    def _frame(self, rows):
+        if isinstance(rows, pd.DataFrame):
+            return rows
+        if isinstance(rows, (dict, pd.Series)):
+            rows = [dict(rows)]
+        return pd.DataFrame(list(rows))
+
+    def transform(self, rows, overrides=None):
+        """
+        Raw rows (DataFrame, dict/Series or list of dicts) -> float32 matrix.
+        `overrides` sets whole columns (scalar or per-row array) after lookup.
+        """
+        df = self._frame(rows)
+        n = len(df)
+        X = np.tile(self._default_row, (n, 1))
+
+        present = [c for c in self._numeric if c in df.columns]
+        if present:
+            idx = self._numeric_idx[[self._numeric.index(c) for c in present]]
+            block = df[present].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float32)
+            missing = np.isnan(block)
+            block[missing] = np.broadcast_to(self._default_row[idx], block.shape)[missing]
+            X[:, idx] = block
+
+        for col, mapping in self.categorical_maps.items():
+            if col in df.columns:
+                codes = df[col].astype(str).map(mapping)
+                X[:, self.features.index(col)] = codes.fillna(self.unknown_code).to_numpy(np.float32)
+
+        for col, value in (overrides or {}).items():
+            if col in self.features:
+                X[:, self.features.index(col)] = value
+        return X
+
+    def transform_frame(self, rows, overrides=None):
+        """Same as transform, wrapped in a DataFrame with the model's column names."""
+        return pd.DataFrame(self.transform(rows, overrides), columns=self.features)
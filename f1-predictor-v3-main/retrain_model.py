@@ -6,14 +6,18 @@ Uses existing feature engineering, trains ensemble, exports production model
 import pandas as pd
 import numpy as np
 import pickle
-from sklearn.model_selection import train_test_split
-from catboost import CatBoostClassifier
-from xgboost import XGBClassifier
-from lightgbm import LGBMClassifier
-from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
 import warnings
+from ensemble import F1Ensemble
+from model_registry import registry
+from preprocessing import F1Preprocessor
+from training_data import (
+    new_models, save_training_state, rounds_in_order, select_rounds, to_xy,
+    load_selected_features,
+)
 warnings.filterwarnings('ignore')
 
+CALIBRATION_ROUNDS = 3
+
 print("=" * 70)
 print("🤖 F1 MODEL RETRAINING - COMPLETE 2025 SEASON")
 print("=" * 70)
@@ -90,6 +94,12 @@ if not use_simplified:
                     'fastestLap', 'fastestLapTime']
     
     feature_cols = [col for col in df.columns if col not in exclude_cols]
+
+    # Restrict to the schema chosen by feature_selection.py, if it has been run
+    selected_features = load_selected_features()
+    if selected_features:
+        feature_cols = [col for col in selected_features if col in df.columns]
+        print(f"✂️  Using selected feature schema ({len(feature_cols)} features)")
     
     print(f"✅ Dataset loaded: {len(df):,} samples")
     print(f"   Features: {len(feature_cols)}")
@@ -118,15 +128,14 @@ if not use_simplified:
 print("\n🤖 STEP 3: Training Ensemble Models...")
 print("-" * 70)
 
+# Imported here so the early exits above don't pay for scikit-learn
+from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
+
+models = new_models()
+
 # CatBoost
 print("\n  Training CatBoost...", end=" ")
-cat_model = CatBoostClassifier(
-    iterations=1000,
-    learning_rate=0.05,
-    depth=6,
-    verbose=False,
-    random_state=42
-)
+cat_model = models['CatBoost']
 cat_model.fit(X_train, y_train)
 cat_pred = cat_model.predict(X_test)
 cat_acc = accuracy_score(y_test, cat_pred)
@@ -134,13 +143,7 @@ print(f"✅ Accuracy: {cat_acc:.4f} ({cat_acc*100:.2f}%)")
 
 # XGBoost
 print("  Training XGBoost...", end=" ")
-xgb_model = XGBClassifier(
-    n_estimators=1000,
-    learning_rate=0.05,
-    max_depth=6,
-    random_state=42,
-    eval_metric='logloss'
-)
+xgb_model = models['XGBoost']
 xgb_model.fit(X_train, y_train)
 xgb_pred = xgb_model.predict(X_test)
 xgb_acc = accuracy_score(y_test, xgb_pred)
@@ -148,22 +151,33 @@ print(f"✅ Accuracy: {xgb_acc:.4f} ({xgb_acc*100:.2f}%)")
 
 # LightGBM
 print("  Training LightGBM...", end=" ")
-lgb_model = LGBMClassifier(
-    n_estimators=1000,
-    learning_rate=0.05,
-    max_depth=6,
-    random_state=42,
-    verbose=-1
-)
+lgb_model = models['LightGBM']
 lgb_model.fit(X_train, y_train)
 lgb_pred = lgb_model.predict(X_test)
 lgb_acc = accuracy_score(y_test, lgb_pred)
 print(f"✅ Accuracy: {lgb_acc:.4f} ({lgb_acc*100:.2f}%)")
 
-# Ensemble (voting)
-print("\n  Creating ensemble prediction...", end=" ")
-ensemble_pred = (cat_pred + xgb_pred + lgb_pred) / 3
-ensemble_pred_class = (ensemble_pred > 0.5).astype(int)
+# Ensemble (calibrated probability average)
+# Calibration maps are fit on the last training rounds, scored by models
+# trained without them, so the boosters' in-sample confidence is not reused.
+print("\n  Calibrating ensemble members...", end=" ")
+train_rounds = rounds_in_order(train_df)
+cal_start = train_rounds[-CALIBRATION_ROUNDS - 1]
+X_fit, y_fit = to_xy(select_rounds(train_df, until=cal_start), feature_cols)
+X_cal, y_cal = to_xy(select_rounds(train_df, after=cal_start), feature_cols)
+reference_models = new_models()
+for model in reference_models.values():
+    model.fit(X_fit, y_fit)
+print(f"✅ {len(X_cal)} rows")
+
+print("  Creating ensemble prediction...", end=" ")
+ensemble = F1Ensemble(
+    [('CatBoost', cat_model, 1.0), ('XGBoost', xgb_model, 1.0), ('LightGBM', lgb_model, 1.0)],
+    features=feature_cols,
+    threshold=0.5
+)
+ensemble.fit_calibration(X_cal, y_cal, method='sigmoid', reference_models=reference_models)
+ensemble_pred_class = ensemble.predict(X_test)
 ensemble_acc = accuracy_score(y_test, ensemble_pred_class)
 print(f"✅ Accuracy: {ensemble_acc:.4f} ({ensemble_acc*100:.2f}%)")
 
@@ -199,7 +213,7 @@ elif best_model_name == 'LightGBM':
     production_model = lgb_model
 else:
     best_pred = ensemble_pred_class
-    production_model = cat_model  # Use CatBoost as base for ensemble
+    production_model = ensemble
 
 print(f"\n📋 Classification Report ({best_model_name}):")
 print(classification_report(y_test, best_pred, 
@@ -235,6 +249,16 @@ with open('models/ensemble/lgb_model.pkl', 'wb') as f:
     pickle.dump(lgb_model, f)
 print("✅ Saved: models/ensemble/lgb_model.pkl")
 
+ensemble.metadata.update(accuracy=ensemble_acc)
+ensemble.preprocessor = F1Preprocessor.fit(train_df, feature_cols)
+with open('models/preprocessor.pkl', 'wb') as f:
+    pickle.dump(ensemble.preprocessor, f)
+print("✅ Saved: models/preprocessor.pkl")
+
+with open('models/ensemble/f1_ensemble.pkl', 'wb') as f:
+    pickle.dump(ensemble, f)
+print("✅ Saved: models/ensemble/f1_ensemble.pkl")
+
 # Save production model (best performer)
 production_path = '../f1_PRODUCTION_READY.pkl'
 with open(production_path, 'wb') as f:
@@ -246,6 +270,28 @@ with open('models/feature_columns.pkl', 'wb') as f:
     pickle.dump(feature_cols, f)
 print("✅ Saved: models/feature_columns.pkl")
 
+# Register the new files so apps / API resolve them by name
+for name, path in [
+    ('podium-catboost', 'models/ensemble/cat_model.pkl'),
+    ('podium-xgb', 'models/ensemble/xgb_model.pkl'),
+    ('podium-lightgbm', 'models/ensemble/lgb_model.pkl'),
+    ('preprocessor', 'models/preprocessor.pkl'),
+    ('podium-ensemble', 'models/ensemble/f1_ensemble.pkl'),
+    ('production', production_path),
+]:
+    info = registry.register(name, path)
+    print(f"✅ Registered: {name} v{info['version']}")
+
+# Save training watermark for incremental_retrain.py
+last_round = train_df[['season', 'round']].sort_values(['season', 'round']).iloc[-1]
+save_training_state({
+    'last_trained_round': (int(last_round['season']), int(last_round['round'])),
+    'feature_cols': feature_cols,
+    'holdout_accuracy': {'CatBoost': cat_acc, 'XGBoost': xgb_acc, 'LightGBM': lgb_acc},
+    'last_update': 'full',
+})
+print("✅ Saved: models/ensemble/training_state.pkl")
+
 # ========================================
 # STEP 6: Summary
 # ========================================
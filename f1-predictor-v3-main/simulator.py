@@ -0,0 +1,335 @@
+"""
+2026 Season Monte Carlo Simulator
+Vectorized version of the notebook's F1RaceSimulator: every race of a chunk
+of seasons is drawn in one numpy pass, so results can be accumulated and
+shown chunk by chunk while they converge.
+
+Per race, each driver's score is strength x N(1, randomness) x grid
+advantage, zeroed on a DNF; the finishing order is a Plackett-Luce draw on
+those scores (the winner is picked proportionally to score, as in the
+notebook, then P2 from the rest, ...) and scored with the 2025 points system.
+
+The full outcome distributions (finishing position per round and driver,
+race and season head-to-heads) are saved to models/simulation/ so they can
+be queried without simulating again.
+
+Usage:
+    python simulator.py                                  # 1,000 seasons
+    python simulator.py --n-seasons 10000 --randomness 0.25
+    python simulator.py --after-round 8     # remaining rounds, from the standings
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from standings_index import StandingsIndex
+from training_data import ROOT
+
+GRIDS_PATH = ROOT / '2026_race_grids.csv'
+MOMENTUM_PATH = ROOT.parent / '2026_driver_momentum.csv'
+OUTPUT_PATH = ROOT / '2026_championship_probabilities.csv'
+SEASON = 2026
+DISTRIBUTIONS_DIR = ROOT / 'models/simulation'
+
+POINTS = np.array([25, 18, 15, 12, 10, 8, 6, 4, 2, 1])
+DEFAULT_DNF_RATE = 0.1
+MIN_STRENGTH = 1.0  # floor for negative / zero momentum scores
+
+
+class SeasonTally:
+    """
+    Aggregated results of `n` simulated seasons; tallies add up, so chunks
+    can be merged as they finish.
+
+    titles              -- (drivers,) championships won
+    points              -- (drivers,) total points over all seasons
+    position_counts     -- (rounds, drivers, positions) finishing-position
+                           counts; the last position column counts DNFs
+    head_to_head        -- (rounds, drivers, drivers) races where the row
+                           driver finished ahead of the column driver
+    season_head_to_head -- (drivers, drivers) seasons where the row driver
+                           scored more points than the column driver
+    """
+
+    def __init__(self, n, titles, points, position_counts, head_to_head, season_head_to_head):
+        self.n = int(n)
+        self.titles = titles
+        self.points = points
+        self.position_counts = position_counts
+        self.head_to_head = head_to_head
+        self.season_head_to_head = season_head_to_head
+
+    @classmethod
+    def empty(cls, n_rounds, n_drivers):
+        return cls(0, np.zeros(n_drivers, dtype=np.int64), np.zeros(n_drivers),
+                   np.zeros((n_rounds, n_drivers, n_drivers + 1), dtype=np.int64),
+                   np.zeros((n_rounds, n_drivers, n_drivers), dtype=np.int64),
+                   np.zeros((n_drivers, n_drivers), dtype=np.int64))
+
+    def __add__(self, other):
+        return SeasonTally(self.n + other.n, self.titles + other.titles,
+                           self.points + other.points,
+                           self.position_counts + other.position_counts,
+                           self.head_to_head + other.head_to_head,
+                           self.season_head_to_head + other.season_head_to_head)
+
+    @property
+    def wins(self):
+        return self.position_counts[:, :, 0].sum(axis=0)
+
+    @property
+    def podiums(self):
+        return self.position_counts[:, :, :3].sum(axis=(0, 2))
+
+
+class SeasonSimulator:
+    """
+    drivers      -- driverIds, column order of every (rounds, drivers) array
+    names        -- display names, same order
+    strength     -- (drivers,) base strength (momentum score, floored)
+    grid         -- (rounds, drivers) estimated grid positions
+    dnf_rate     -- (drivers,) per-race retirement probability
+    start_points -- (drivers,) championship points scored before the first
+                    simulated round
+    """
+
+    def __init__(self, drivers, names, strength, grid, dnf_rate, rounds=None, start_points=None):
+        self.drivers = list(drivers)
+        self.names = list(names)
+        self.strength = np.maximum(np.asarray(strength, dtype=float), MIN_STRENGTH)
+        self.grid = np.asarray(grid, dtype=float)
+        self.dnf_rate = np.asarray(dnf_rate, dtype=float)
+        self.rounds = list(rounds) if rounds is not None else list(range(1, len(self.grid) + 1))
+        self.start_points = np.zeros(len(self.drivers)) if start_points is None \
+            else np.asarray(start_points, dtype=float)
+        # Grid advantage is fixed per (round, driver), fold it into the strength once
+        self._log_base = np.log(self.strength[None, :] / (1.0 + self.grid * 0.05))
+
+    @classmethod
+    def from_csv(cls, grids_path=GRIDS_PATH, momentum_path=MOMENTUM_PATH, dnf_rates=None,
+                 after_round=0, start_points=None):
+        """
+        Build from 2026_race_grids.csv + 2026_driver_momentum.csv.
+        `dnf_rates` is an optional {driverId: rate} mapping (e.g. the 2025
+        standings' dnf_rate); drivers without one use DEFAULT_DNF_RATE.
+        To simulate the rest of a season, pass the last completed round as
+        `after_round` and the {driverId: points} standings after it.
+        """
+        # Mid-season team switches list a driver once per team; keep one row
+        grids = pd.read_csv(grids_path).drop_duplicates(['round', 'driverId'])
+        grids = grids[grids['round'] > after_round]
+        momentum = pd.read_csv(momentum_path).drop_duplicates('driverId').set_index('driverId')
+
+        drivers = list(momentum.index.intersection(grids['driverId'].unique()))
+        grid = (grids.pivot(index='round', columns='driverId', values='estimated_grid_position')
+                .reindex(columns=drivers).fillna(20).sort_index())
+        names = (momentum.loc[drivers, 'givenName'] + ' ' + momentum.loc[drivers, 'familyName'])
+        dnf = pd.Series(dnf_rates or {}, dtype=float).reindex(drivers).fillna(DEFAULT_DNF_RATE)
+        points = pd.Series(start_points or {}, dtype=float).reindex(drivers).fillna(0)
+        return cls(drivers, names, momentum.loc[drivers, 'momentum_score'].to_numpy(),
+                   grid.to_numpy(), dnf.to_numpy(), rounds=grid.index,
+                   start_points=points.to_numpy())
+
+    @property
+    def n_rounds(self):
+        return len(self.rounds)
+
+    def simulate(self, n_seasons, randomness=0.15, seed=None):
+        """Simulate `n_seasons` full seasons in one pass and return a SeasonTally."""
+        rng = np.random.default_rng(seed)
+        n_rounds, n_drivers = self.grid.shape
+        shape = (n_seasons, n_rounds, n_drivers)
+
+        form = np.clip(rng.normal(1.0, randomness, shape), 1e-6, None)
+        finishes = rng.random(shape) >= self.dnf_rate
+        # Gumbel-max trick: sorting log-score + Gumbel noise samples a
+        # Plackett-Luce order, i.e. repeated score-proportional picks
+        keys = self._log_base + np.log(form) + rng.gumbel(size=shape)
+        keys[~finishes] = -np.inf
+
+        order = np.argsort(-keys, axis=-1, kind='stable')
+        positions = np.empty_like(order)
+        np.put_along_axis(positions, order, np.arange(n_drivers), axis=-1)
+        positions[~finishes] = n_drivers  # DNF column
+
+        points_table = np.zeros(n_drivers + 1)
+        points_table[:min(len(POINTS), n_drivers)] = POINTS[:n_drivers]
+        season_points = points_table[positions].sum(axis=1) + self.start_points  # (seasons, drivers)
+        season_wins = (positions == 0).sum(axis=1)
+        champions = np.argmax(season_points + season_wins * 1e-3, axis=1)
+
+        cell = (np.arange(n_rounds)[:, None] * n_drivers + np.arange(n_drivers)) * (n_drivers + 1)
+        position_counts = np.bincount((cell + positions).ravel(),
+                                      minlength=n_rounds * n_drivers * (n_drivers + 1))
+        position_counts = position_counts.reshape(n_rounds, n_drivers, n_drivers + 1)
+
+        # Two DNFs share the DNF "position", so neither counts as ahead
+        head_to_head = (positions[..., :, None] < positions[..., None, :]).sum(axis=0)
+        season_head_to_head = (season_points[:, :, None] > season_points[:, None, :]).sum(axis=0)
+
+        return SeasonTally(n_seasons, np.bincount(champions, minlength=n_drivers),
+                           season_points.sum(axis=0), position_counts,
+                           head_to_head, season_head_to_head)
+
+    def run(self, n_seasons, randomness=0.15, seed=0, chunk_size=500):
+        """
+        Yield the running SeasonTally after every chunk of `chunk_size`
+        seasons. Chunk i uses seed + i, so a run is reproducible and any
+        prefix of it matches a shorter run with the same seed.
+        """
+        total = SeasonTally.empty(self.n_rounds, len(self.drivers))
+        for i, start in enumerate(range(0, n_seasons, chunk_size)):
+            total = total + self.simulate(min(chunk_size, n_seasons - start), randomness, seed + i)
+            yield total
+
+    def summary(self, tally):
+        """Per-driver championship table for a tally, best first."""
+        n_races = max(tally.n, 1) * self.n_rounds
+        table = pd.DataFrame({
+            'driverId': self.drivers,
+            'driver': self.names,
+            'championship_probability': tally.titles / max(tally.n, 1),
+            'simulated_titles': tally.titles,
+            'expected_points': tally.points / max(tally.n, 1),
+            'win_rate': tally.wins / n_races,
+            'podium_rate': tally.podiums / n_races,
+        })
+        table = table.sort_values(['championship_probability', 'expected_points'],
+                                  ascending=False).reset_index(drop=True)
+        table['position'] = range(1, len(table) + 1)
+        return table
+
+
+class SimulationDistributions:
+    """
+    Outcome distributions of one simulation run, stored as .npy files that
+    load memory-mapped (a query reads only the cells it touches):
+
+    position_counts     -- (rounds, drivers, positions) counts, last column
+                           DNF; uint16, or uint32 beyond 65,535 seasons
+    head_to_head        -- (rounds, drivers, drivers) float16 P(row driver
+                           finishes ahead of column driver)
+    season_head_to_head -- (drivers, drivers) float16 P(row driver scores
+                           more points than column driver)
+    metadata.json       -- run parameters, driver and round order
+    """
+
+    ARRAYS = ('position_counts', 'head_to_head', 'season_head_to_head')
+
+    def __init__(self, metadata, position_counts, head_to_head, season_head_to_head):
+        self.metadata = metadata
+        self.position_counts = position_counts
+        self.head_to_head = head_to_head
+        self.season_head_to_head = season_head_to_head
+        self.n_seasons = metadata['n_seasons']
+        self.drivers = metadata['drivers']
+        self.names = dict(zip(self.drivers, metadata['names']))
+        self.rounds = metadata['rounds']
+        self.position = {driver_id: i for i, driver_id in enumerate(self.drivers)}
+        self.round_index = {round_number: i for i, round_number in enumerate(self.rounds)}
+
+    @classmethod
+    def from_tally(cls, simulator, tally, randomness, seed):
+        count_dtype = np.uint16 if tally.n <= np.iinfo(np.uint16).max else np.uint32
+        metadata = {
+            'n_seasons': tally.n,
+            'randomness': randomness,
+            'seed': seed,
+            'drivers': simulator.drivers,
+            'names': simulator.names,
+            'rounds': [int(r) for r in simulator.rounds],
+        }
+        n = max(tally.n, 1)
+        return cls(metadata,
+                   tally.position_counts.astype(count_dtype),
+                   (tally.head_to_head / n).astype(np.float16),
+                   (tally.season_head_to_head / n).astype(np.float16))
+
+    def save(self, directory=DISTRIBUTIONS_DIR):
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for name in self.ARRAYS:
+            np.save(directory / f'{name}.npy', getattr(self, name))
+        with open(directory / 'metadata.json', 'w') as f:
+            json.dump(self.metadata, f, indent=2)
+
+    @classmethod
+    def load(cls, directory=DISTRIBUTIONS_DIR):
+        directory = Path(directory)
+        with open(directory / 'metadata.json') as f:
+            metadata = json.load(f)
+        arrays = [np.load(directory / f'{name}.npy', mmap_mode='r') for name in cls.ARRAYS]
+        return cls(metadata, *arrays)
+
+    def position_distribution(self, driver_id, round_number):
+        """P(P1), ..., P(P{drivers}), P(DNF) for one driver at one round."""
+        counts = self.position_counts[self.round_index[round_number], self.position[driver_id]]
+        return np.asarray(counts, dtype=float) / self.n_seasons
+
+    def finish_probability(self, driver_id, round_number, top=1):
+        """P(driver finishes in the top `top` at the round)."""
+        return float(self.position_distribution(driver_id, round_number)[:top].sum())
+
+    def beat_probability(self, a, b, round_number=None):
+        """P(a finishes ahead of b) at a round, or P(a outscores b) over the season."""
+        i, j = self.position[a], self.position[b]
+        if round_number is None:
+            return float(self.season_head_to_head[i, j])
+        return float(self.head_to_head[self.round_index[round_number], i, j])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo 2026 championship simulation")
+    parser.add_argument('--n-seasons', type=int, default=1000)
+    parser.add_argument('--randomness', type=float, default=0.15)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--after-round', type=int, default=0,
+                        help="simulate only the rounds after this one, starting from its standings")
+    parser.add_argument('--output', default=str(OUTPUT_PATH))
+    parser.add_argument('--distributions', default=str(DISTRIBUTIONS_DIR),
+                        help="directory for the position / head-to-head tensors")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("🎲 2026 CHAMPIONSHIP SIMULATION")
+    print("=" * 70)
+
+    start_points = None
+    if args.after_round:
+        index = StandingsIndex.build()
+        if SEASON not in index.seasons['driver']:
+            raise SystemExit(f"❌ No {SEASON} results in the race results yet")
+        table = index.season(SEASON)
+        start_points = dict(zip(table.ids, table.points[min(args.after_round, table.n_rounds)]))
+
+    standings = pd.read_csv(ROOT.parent / '2025_final_standings.csv')
+    simulator = SeasonSimulator.from_csv(
+        dnf_rates=dict(zip(standings['driverId'], standings['dnf_rate'])),
+        after_round=args.after_round, start_points=start_points)
+    print(f"\n📊 {len(simulator.drivers)} drivers, {simulator.n_rounds} rounds, "
+          f"{args.n_seasons:,} seasons (randomness {args.randomness})")
+
+    for tally in simulator.run(args.n_seasons, args.randomness, args.seed):
+        print(f"   Simulated {tally.n:,}/{args.n_seasons:,} seasons...")
+
+    table = simulator.summary(tally)
+    print("\n🏆 2026 CHAMPIONSHIP PROBABILITIES:")
+    print(table.head(10)[['position', 'driver', 'championship_probability',
+                          'expected_points', 'win_rate']].to_string(index=False))
+
+    table[['driver', 'championship_probability', 'simulated_titles', 'position']].to_csv(
+        args.output, index=False)
+    print(f"\n💾 Saved: {args.output}")
+
+    SimulationDistributions.from_tally(simulator, tally, args.randomness, args.seed).save(
+        args.distributions)
+    print(f"💾 Saved: {args.distributions}/ (position and head-to-head distributions)")
+    print("=" * 70)
+
+
+if __name__ == '__main__':
+    main()
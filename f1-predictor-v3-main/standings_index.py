@@ -0,0 +1,263 @@
+"""
+Championship Standings Index
+Cumulative driver / constructor points, wins and championship positions for
+every (season, round) of race_results_2022_2025_COMPLETE.csv, built once
+with cumsums into per-season arrays. Standings, gaps and positions as of any
+round are then array lookups instead of groupby passes.
+
+    index = StandingsIndex.build()
+    index.points(2025, 20, 'norris')               # after round 20
+    index.position(2025, 20, 'mclaren', kind='constructor')
+    index.standings(2025, 20).head()               # table after round 20
+    index.championship_features(rows)              # pre-race features for rows
+
+Usage:
+    python standings_index.py                      # latest standings
+    python standings_index.py --season 2024 --round 10 --kind constructor
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from training_data import ROOT
+
+RESULTS_PATH = ROOT / 'data/raw/race_results_2022_2025_COMPLETE.csv'
+KINDS = ('driver', 'constructor')
+
+# Constructor ids used by the appended 2025 R20-R24 results -> ids of the
+# earlier rows
+CONSTRUCTOR_ALIASES = {
+    'red_bull_racing': 'red_bull',
+    'haas_f1_team': 'haas',
+    'kick_sauber': 'sauber',
+    'racing_bulls': 'rb',
+}
+
+# Points a driver can still make up per remaining race before it is
+# "must win" (as in the feature-engineering notebook)
+MUST_WIN_POINTS_PER_RACE = 18
+
+
+def load_results(path=RESULTS_PATH):
+    """
+    Race results with one id per driver / constructor: the appended R20-R24
+    rows use short driverIds ('nor') and renamed teams, so both are mapped
+    back onto the ids (and names) of each driver's / team's first rows.
+    """
+    results = pd.read_csv(path).sort_values(['season', 'round'], kind='stable')
+    results['driverId'] = results.groupby('driverCode')['driverId'].transform('first')
+    for col in ('givenName', 'familyName'):
+        results[col] = results.groupby('driverId')[col].transform('first')
+    results['constructorId'] = results['constructorId'].replace(CONSTRUCTOR_ALIASES)
+    results['constructorName'] = results.groupby('constructorId')['constructorName'].transform('first')
+    return results
+
+
+def _last_occurrence(keys):
+    """Positions of the last row of every distinct key, in key order."""
+    _, first_from_end = np.unique(keys[::-1], return_index=True)
+    return len(keys) - 1 - first_from_end
+
+
+class SeasonStandings:
+    """
+    One season's standings for drivers or constructors. Row r of every
+    (rounds + 1, entrants) array is the state after round r; row 0 is
+    before the first race.
+
+    ids      -- driverIds / constructorIds, column order
+    points   -- cumulative points
+    wins     -- cumulative wins
+    races    -- cumulative race entries
+    rank     -- championship position by points (ties share the best rank)
+    leader   -- (rounds + 1,) leader's points
+    teams    -- (rounds + 1, entrants) constructor of the latest race entered
+    """
+
+    def __init__(self, ids, names, codes, points, wins, races, teams):
+        self.ids = list(ids)
+        self.names = list(names)
+        self.codes = list(codes)
+        self.points = points
+        self.wins = wins
+        self.races = races
+        self.teams = teams
+        self.column = {entrant: i for i, entrant in enumerate(self.ids)}
+        self.rank = (points[:, None, :] > points[:, :, None]).sum(axis=-1) + 1
+        self.leader = points.max(axis=1)
+
+    @classmethod
+    def from_results(cls, results, key, name_col, code_col, n_rounds):
+        """Accumulate one season's result rows, grouped by the `key` column."""
+        ids, cols = np.unique(results[key], return_inverse=True)
+        rows = results['round'].to_numpy()
+        shape = (n_rounds + 1, len(ids))
+
+        per_round = {}
+        for name, values in (('points', results['points'].fillna(0).to_numpy()),
+                             ('wins', (results['position'] == 1).to_numpy(int)),
+                             ('races', np.ones(len(results), dtype=int))):
+            per_round[name] = np.zeros(shape)
+            np.add.at(per_round[name], (rows, cols), values)
+
+        # Latest constructor per (round, entrant), carried forward to later rounds
+        last = _last_occurrence(rows * len(ids) + cols)
+        teams = np.full(shape, None, dtype=object)
+        teams[rows[last], cols[last]] = results['constructorName'].to_numpy()[last]
+        teams = pd.DataFrame(teams).ffill().bfill().to_numpy()
+
+        labels = _last_occurrence(cols)
+        return cls(ids, results[name_col].to_numpy()[labels], results[code_col].to_numpy()[labels],
+                   per_round['points'].cumsum(axis=0), per_round['wins'].cumsum(axis=0).astype(int),
+                   per_round['races'].cumsum(axis=0).astype(int), teams)
+
+    @property
+    def n_rounds(self):
+        return len(self.points) - 1
+
+    def table(self, round_number):
+        """Standings after `round_number`, leader first."""
+        r = round_number
+        table = pd.DataFrame({
+            'position': self.rank[r],
+            'id': self.ids,
+            'name': self.names,
+            'code': self.codes,
+            'team': self.teams[r],
+            'points': self.points[r],
+            'wins': self.wins[r],
+            'races': self.races[r],
+            'gap_to_leader': self.leader[r] - self.points[r],
+        })
+        table = table[table['races'] > 0] if r > 0 else table
+        return table.sort_values(['position', 'wins'], ascending=[True, False]).reset_index(drop=True)
+
+
+class StandingsIndex:
+    """{kind: {season: SeasonStandings}} for every season in the race results."""
+
+    def __init__(self, seasons):
+        self.seasons = seasons
+
+    @classmethod
+    def build(cls, results_path=RESULTS_PATH):
+        results = load_results(results_path)
+        results['name'] = results['givenName'] + ' ' + results['familyName']
+        seasons = {kind: {} for kind in KINDS}
+        for season, rows in results.groupby('season'):
+            n_rounds = int(rows['round'].max())
+            seasons['driver'][int(season)] = SeasonStandings.from_results(
+                rows, 'driverId', 'name', 'driverCode', n_rounds)
+            seasons['constructor'][int(season)] = SeasonStandings.from_results(
+                rows, 'constructorId', 'constructorName', 'constructorName', n_rounds)
+        return cls(seasons)
+
+    @property
+    def latest_season(self):
+        return max(self.seasons['driver'])
+
+    def season(self, season, kind='driver'):
+        return self.seasons[kind][season]
+
+    def _cell(self, season, round_number, entrant, kind):
+        table = self.seasons[kind][season]
+        return table, min(round_number, table.n_rounds), table.column[entrant]
+
+    def points(self, season, round_number, entrant, kind='driver'):
+        """Points after `round_number`."""
+        table, r, c = self._cell(season, round_number, entrant, kind)
+        return float(table.points[r, c])
+
+    def position(self, season, round_number, entrant, kind='driver'):
+        table, r, c = self._cell(season, round_number, entrant, kind)
+        return int(table.rank[r, c])
+
+    def gap_to_leader(self, season, round_number, entrant, kind='driver'):
+        table, r, c = self._cell(season, round_number, entrant, kind)
+        return float(table.leader[r] - table.points[r, c])
+
+    def standings(self, season=None, round_number=None, kind='driver'):
+        """Standings table after `round_number` (default: the season's last round)."""
+        table = self.seasons[kind][season or self.latest_season]
+        return table.table(table.n_rounds if round_number is None
+                           else min(round_number, table.n_rounds))
+
+    def championship_features(self, rows, season_rounds=None):
+        """
+        Pre-race championship features for rows with season, round, driverId
+        and constructorId, i.e. the standings after the previous round, with
+        the feature-engineering definitions:
+
+          driver_championship_position -- rank by points among the drivers
+                                          of the same (season, round) in
+                                          `rows` (ties share the best rank)
+          must_win_pressure            -- gap to the leader above 18 points
+                                          per remaining race, where races
+                                          remaining = season_rounds[season]
+                                          - round (default: the season's
+                                          last round present in `rows`)
+
+        Entrants the index has not seen get zero points and the last position.
+        """
+        columns = ['driver_season_points', 'driver_championship_position', 'points_gap_to_leader',
+                   'must_win_pressure', 'constructor_season_points',
+                   'constructor_championship_position']
+        values = {col: np.full(len(rows), np.nan) for col in columns}
+        if season_rounds is None:
+            season_rounds = rows.groupby('season')['round'].max().to_dict()
+        seasons = rows['season'].to_numpy(int)
+        rounds = rows['round'].to_numpy(int)
+        for season in np.unique(seasons):
+            drivers = self.seasons['driver'].get(int(season))
+            constructors = self.seasons['constructor'].get(int(season))
+            if drivers is None:
+                continue
+            at = np.flatnonzero(seasons == season)
+            before = np.clip(rounds[at] - 1, 0, drivers.n_rounds)
+            for prefix, table, key in (('driver', drivers, 'driverId'),
+                                       ('constructor', constructors, 'constructorId')):
+                cols = rows[key].iloc[at].map(table.column)
+                known = cols.notna().to_numpy()
+                cols = cols.fillna(0).to_numpy(int)
+                points = np.where(known, table.points[before, cols], 0.0)
+                values[f'{prefix}_season_points'][at] = points
+                values[f'{prefix}_championship_position'][at] = \
+                    np.where(known, table.rank[before, cols], len(table.ids))
+                if prefix == 'driver':
+                    gap = drivers.leader[before] - points
+                    remaining = season_rounds[season] - rounds[at]
+                    values['points_gap_to_leader'][at] = gap
+                    values['must_win_pressure'][at] = gap > remaining * MUST_WIN_POINTS_PER_RACE
+        out = pd.DataFrame(values, index=rows.index)
+
+        # Drivers are ranked within the field of each race, not against
+        # every entrant of the season so far
+        out['driver_championship_position'] = out.groupby(
+            [seasons, rounds])['driver_season_points'].rank(ascending=False, method='min')
+        return out
+
+def main():
+    parser = argparse.ArgumentParser(description="Championship standings as of any round")
+    parser.add_argument('--season', type=int)
+    parser.add_argument('--round', type=int, dest='round_number')
+    parser.add_argument('--kind', choices=KINDS, default='driver')
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+
+    index = StandingsIndex.build()
+    season = args.season or index.latest_season
+    table = index.season(season, args.kind)
+    round_number = table.n_rounds if args.round_number is None else args.round_number
+
+    print("=" * 70)
+    print(f"🏆 {season} {args.kind.upper()} STANDINGS AFTER ROUND {round_number}/{table.n_rounds}")
+    print("=" * 70)
+    print(index.standings(season, round_number, args.kind).head(args.top)[
+        ['position', 'name', 'team', 'points', 'wins', 'gap_to_leader']].to_string(index=False))
+    print("=" * 70)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,236 @@
+"""
+Cold-Start Benchmark
+Times every entry point in a fresh interpreter:
+  import_s         -- the imports in the module's header
+  first_response_s -- cold process to first response (first Streamlit render,
+                      first API reply, or a script's --help exit)
+  first_predict_s  -- API only: cold process to first /api/predict reply
+                      answered by a model (a grid-heuristic reply is an error)
+and fails (exit code 1) when any measurement exceeds its budget or an entry
+point errors, so it can gate CI. Entry points whose required registry
+artifacts are not in the checkout are skipped and reported as such.
+
+Usage:
+    python startup_benchmark.py
+    python startup_benchmark.py --only api app_production --repeat 3
+    python startup_benchmark.py --budget-scale 2     # slower CI runners
+"""
+
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent
+REPO_ROOT = ROOT.parent
+REPORT_PATH = ROOT / 'models/startup_benchmark.json'
+MARKER = 'BENCHMARK_RESULT:'
+
+# name -> (kind, script, working directory)
+ENTRY_POINTS = {
+    'app_production': ('streamlit', REPO_ROOT / 'app_production.py', REPO_ROOT),
+    'app_v3': ('streamlit', ROOT / 'app_v3.py', ROOT),
+    'app_2026_predictor': ('streamlit', ROOT / 'app_2026_predictor.py', ROOT),
+    'api': ('api', REPO_ROOT / 'BoxMachiBox-API/main.py', REPO_ROOT / 'BoxMachiBox-API'),
+    'retrain_model': ('script', ROOT / 'retrain_model.py', ROOT),
+    'incremental_retrain': ('script', ROOT / 'incremental_retrain.py', ROOT),
+    'feature_selection': ('script', ROOT / 'feature_selection.py', ROOT),
+    'distill': ('script', ROOT / 'distill.py', ROOT),
+    'simulator': ('script', ROOT / 'simulator.py', ROOT),
+}
+
+# Registry artifacts an entry point cannot start without
+REQUIRED_ARTIFACTS = {
+    'app_production': ['production'],
+    'app_v3': ['podium-catboost'],
+    'app_2026_predictor': ['ensemble-optimized', 'standings-2025'],
+    'api': ['production'],
+}
+
+# Seconds; a missing key means that measurement is reported but not gated
+BUDGETS = {
+    'app_production': {'import_s': 1.5, 'first_response_s': 8.0},
+    'app_v3': {'import_s': 1.5, 'first_response_s': 6.0},
+    'app_2026_predictor': {'import_s': 1.5, 'first_response_s': 8.0},
+    'api': {'import_s': 1.0, 'first_response_s': 1.5, 'first_predict_s': 6.0},
+    'retrain_model': {'import_s': 1.0},
+    'incremental_retrain': {'import_s': 1.0, 'first_response_s': 1.5},
+    'feature_selection': {'import_s': 1.0, 'first_response_s': 1.5},
+    'distill': {'import_s': 1.0, 'first_response_s': 1.5},
+    'simulator': {'import_s': 1.0, 'first_response_s': 1.5},
+}
+
+_IMPORTS_CHILD = """
+import json, sys, time
+sys.path[:0] = [{dir!r}, {predictor_dir!r}]
+start = time.perf_counter()
+exec(compile({code!r}, {script!r}, 'exec'))
+print({marker!r} + json.dumps({{'import_s': time.perf_counter() - start}}))
+"""
+
+_STREAMLIT_CHILD = """
+import json, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {dir!r})
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({script!r}, default_timeout=600).run()
+error = at.exception[0].message if len(at.exception) else None
+print({marker!r} + json.dumps({{'first_response_s': time.perf_counter() - start, 'error': error}}))
+"""
+
+_API_CHILD = """
+import json, os, sys, time
+os.environ['F1_API_WARMUP'] = '0'
+start = time.perf_counter()
+sys.path.insert(0, {dir!r})
+import main
+from fastapi.testclient import TestClient
+client = TestClient(main.app)
+status = client.get('/').status_code
+first_response = time.perf_counter() - start
+reply = client.post('/api/predict', json={{
+    'driver': main.DRIVERS[0], 'circuit': main.CIRCUITS[0], 'grid_position': 3,
+    'recent_form': 'Good', 'weather': 'Dry'}})
+first_predict = time.perf_counter() - start
+model = reply.json().get('model') if reply.status_code == 200 else None
+error = None if status == 200 and reply.status_code == 200 else f"HTTP {{status}} / {{reply.status_code}}"
+if error is None and model == 'heuristic':
+    error = "/api/predict answered with the grid heuristic, not a model"
+print({marker!r} + json.dumps({{'first_response_s': first_response,
+                                'first_predict_s': first_predict, 'predict_model': model,
+                                'error': error}}))
+"""
+
+_SCRIPT_CHILD = """
+import json, subprocess, sys, time
+start = time.perf_counter()
+proc = subprocess.run([sys.executable, {script!r}, '--help'], cwd={dir!r},
+                      capture_output=True, text=True)
+error = None if proc.returncode == 0 else (proc.stderr.strip().splitlines() or ['exit ' + str(proc.returncode)])[-1]
+print({marker!r} + json.dumps({{'first_response_s': time.perf_counter() - start, 'error': error}}))
+"""
+
+
+def _is_setup(node):
+    """Statements that may sit between a module's imports without ending its header."""
+    if isinstance(node, (ast.Import, ast.ImportFrom, ast.Assign)):
+        return True
+    if isinstance(node, ast.Expr):
+        source = ast.unparse(node)
+        return isinstance(node.value, ast.Constant) or source.startswith(('st.', 'sys.path'))
+    return False
+
+
+def header_imports(script):
+    """
+    Source of the import statements in the script's header, i.e. before its
+    first real work. Imports a script defers until after an early exit (like
+    retrain_model.py's scikit-learn import) are not counted.
+    """
+    tree = ast.parse(Path(script).read_text(encoding='utf-8'))
+    imports = []
+    for node in tree.body:
+        if not _is_setup(node):
+            break
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            imports.append(ast.unparse(node))
+    return '\n'.join(imports)
+
+
+def run_child(code, cwd):
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+    proc = subprocess.run([sys.executable, '-c', code], cwd=cwd, env=env,
+                          capture_output=True, text=True)
+    for line in reversed(proc.stdout.splitlines()):
+        if line.startswith(MARKER):
+            return json.loads(line[len(MARKER):])
+    tail = (proc.stderr.strip().splitlines() or ['no output'])[-1]
+    return {'error': tail}
+
+
+def measure(name):
+    kind, script, cwd = ENTRY_POINTS[name]
+    fmt = dict(dir=str(script.parent), predictor_dir=str(ROOT), script=str(script), marker=MARKER)
+    result = run_child(_IMPORTS_CHILD.format(code=header_imports(script), **fmt), cwd)
+    if kind == 'script' and name == 'retrain_model':
+        return result  # no argument parsing: running it starts a retrain
+    child = {'streamlit': _STREAMLIT_CHILD, 'api': _API_CHILD, 'script': _SCRIPT_CHILD}[kind]
+    response = run_child(child.format(**fmt), cwd)
+    error = result.get('error') or response.get('error')
+    result.update(response, error=error)
+    return result
+
+
+def check(name, result, scale):
+    """List of human-readable failures for one entry point."""
+    failures = [f"{name}: {result['error']}"] if result.get('error') else []
+    for metric, budget in BUDGETS.get(name, {}).items():
+        value = result.get(metric)
+        if value is not None and value > budget * scale:
+            failures.append(f"{name}: {metric} {value:.2f}s > budget {budget * scale:.2f}s")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start import / first-response benchmark")
+    parser.add_argument('--only', nargs='+', choices=sorted(ENTRY_POINTS), metavar='NAME',
+                        help=f"entry points to run (default: all of {', '.join(ENTRY_POINTS)})")
+    parser.add_argument('--repeat', type=int, default=1, help="runs per entry point (median kept)")
+    parser.add_argument('--budget-scale', type=float, default=1.0,
+                        help="multiply every budget, e.g. 2 on slow CI runners")
+    parser.add_argument('--output', default=str(REPORT_PATH))
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("⏱️  COLD-START BENCHMARK")
+    print("=" * 70)
+
+    from model_registry import registry
+
+    report, failures = {}, []
+    for name in args.only or ENTRY_POINTS:
+        missing = [a for a in REQUIRED_ARTIFACTS.get(name, []) if not registry.exists(a)]
+        if missing:
+            report[name] = {'skipped': f"missing {', '.join(missing)}"}
+            print(f"⏭️  {name:21s} skipped ({report[name]['skipped']})")
+            continue
+        runs = [measure(name) for _ in range(args.repeat)]
+        result = {metric: statistics.median(run[metric] for run in runs)
+                  for metric in ('import_s', 'first_response_s', 'first_predict_s')
+                  if all(metric in run for run in runs)}
+        if 'predict_model' in runs[0]:
+            result['predict_model'] = runs[0]['predict_model']
+        errors = [run['error'] for run in runs if run.get('error')]
+        if errors:
+            result['error'] = errors[0]
+        report[name] = result
+        failures += check(name, result, args.budget_scale)
+
+        timings = "  ".join(f"{metric} {result[metric]:6.2f}s" for metric in
+                            ('import_s', 'first_response_s', 'first_predict_s') if metric in result)
+        status = "❌" if check(name, result, args.budget_scale) else "✅"
+        print(f"{status} {name:22s} {timings}")
+
+    Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump({'budget_scale': args.budget_scale, 'budgets': BUDGETS, 'results': report},
+                  f, indent=2)
+    print(f"\n💾 Saved: {args.output}")
+
+    if failures:
+        print("\n❌ BUDGET CHECK FAILED:")
+        for failure in failures:
+            print(f"   {failure}")
+        sys.exit(1)
+    skipped = [name for name, result in report.items() if 'skipped' in result]
+    print(f"\n✅ All entry points within budget"
+          + (f" ({len(skipped)} skipped: {', '.join(skipped)})" if skipped else ""))
+    print("=" * 70)
+
+
+if __name__ == '__main__':
+    main()
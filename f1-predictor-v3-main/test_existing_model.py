@@ -1,20 +1,20 @@
 """
-Test Existing CatBoost Model with Complete 2025 Data
+Test Existing Production XGBoost Model with Complete 2025 Data
 """
 
 import pandas as pd
-import pickle
 import numpy as np
-from sklearn.metrics import accuracy_score
+
+from evaluate import evaluate
+from model_registry import registry
 
 print("=" * 70)
 print("🧪 TESTING EXISTING MODEL WITH COMPLETE 2025 DATA")
 print("=" * 70)
 
-# Load existing CatBoost model
-print("\n📦 Loading existing CatBoost model...")
-with open('models/ensemble/xgb_model.pkl', 'rb') as f:
-    cat_model = pickle.load(f)  # Keep variable name same
+# Load existing production XGBoost model
+print("\n📦 Loading existing XGBoost model...")
+xgb_model = registry.load('podium-xgb')
 
 print("✅ Model loaded successfully")
 
@@ -47,11 +47,18 @@ print(f"\n🎯 Testing on 2025 R20-R24...")
 print(f"   Test samples: {len(X_test)}")
 
 # Predict
-y_pred = cat_model.predict(X_test)
+from sklearn.metrics import accuracy_score
+
+y_pred = xgb_model.predict(X_test)
 accuracy = accuracy_score(y_test, y_pred)
 
+# Race-level view of the same predictions
+race_summary, _ = evaluate(xgb_model, test_df)
+
 print(f"\n📊 RESULTS:")
 print(f"   Accuracy: {accuracy*100:.2f}%")
+print(f"   Winner hit rate: {race_summary['winner_hit']*100:.1f}% "
+      f"| Podium overlap: {race_summary['podium_overlap']*100:.1f}%")
 print(f"   Model is {'✅ READY' if accuracy > 0.85 else '⚠️  NEEDS RETRAINING'}")
 
 print("\n" + "=" * 70)
\ No newline at end of file
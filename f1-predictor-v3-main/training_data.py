@@ -0,0 +1,201 @@
+"""
+Shared Training Data Helpers
+Dataset loading, feature columns, time-based splits and model factories
+used by the retraining scripts
+"""
+
+import pickle
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).parent
+
+DATASET_PATH = ROOT / 'data/processed/f1_v3_complete_dataset.csv'
+FEATURES_PATH = ROOT / 'data/processed/f1_v3_complete_features.csv'
+TRAINING_STATE_PATH = ROOT / 'models/ensemble/training_state.pkl'
+SELECTED_FEATURES_PATH = ROOT / 'models/selected_features.pkl'
+
+# Column order of the 47-feature production models (models/ensemble/*.pkl);
+# used for pickles that don't record their own feature names
+MODEL_FEATURES = [
+    'quali_best_time', 'quali_gap_to_pole', 'quali_gap_to_pole_pct',
+    'quali_performance_score', 'quali_made_q3', 'quali_made_q2',
+    'quali_q1_q2_improvement', 'quali_q2_q3_improvement', 'grid_position',
+    'front_row_start', 'driver_last3_avg_points', 'driver_last3_avg_position',
+    'driver_last5_avg_points', 'driver_last5_avg_position', 'driver_season_points',
+    'driver_season_races', 'driver_last5_podiums', 'driver_dnf_rate',
+    'driver_avg_finish_position', 'driver_championship_position',
+    'constructor_last3_avg_points', 'constructor_last5_avg_points',
+    'constructor_season_points', 'constructor_championship_position',
+    'constructor_dnf_rate', 'constructor_avg_quali_position',
+    'constructor_points_per_race', 'constructor_is_top_team',
+    'circuit_driver_wins', 'circuit_driver_podiums', 'circuit_driver_avg_finish',
+    'circuit_driver_experience', 'circuit_constructor_wins',
+    'circuit_constructor_podiums', 'circuit_driver_best_grid',
+    'circuit_driver_win_rate', 'circuit_driver_podium_rate',
+    'circuit_driver_points_per_race', 'circuit_avg_position_change',
+    'driver_momentum', 'points_gap_to_leader', 'must_win_pressure', 'teammate_gap',
+    'driver_consistency_score', 'avg_quali_race_delta', 'season_progress',
+    'driver_career_races',
+]
+
+# Metadata / leakage columns never used as model inputs
+EXCLUDE_COLS = ['season', 'round', 'driverId', 'driverCode', 'driverName',
+                'constructorId', 'constructorName', 'circuitId', 'circuitName',
+                'date', 'position', 'points', 'status', 'podium', 'laps',
+                'fastestLap', 'fastestLapTime']
+
+MODEL_FILES = {
+    'CatBoost': ROOT / 'models/ensemble/cat_model.pkl',
+    'XGBoost': ROOT / 'models/ensemble/xgb_model.pkl',
+    'LightGBM': ROOT / 'models/ensemble/lgb_model.pkl',
+}
+
+# Names of the ensemble members in models/registry.json
+REGISTRY_NAMES = {
+    'CatBoost': 'podium-catboost',
+    'XGBoost': 'podium-xgb',
+    'LightGBM': 'podium-lightgbm',
+}
+
+
+def default_dataset_path():
+    """The complete training dataset, or the processed feature store when it is absent."""
+    return DATASET_PATH if DATASET_PATH.exists() else FEATURES_PATH
+
+
+def load_dataset(path=DATASET_PATH):
+    """Load the feature-engineered dataset and derive the podium target."""
+    df = pd.read_csv(path)
+    if 'podium' not in df.columns and 'position' in df.columns:
+        df['podium'] = (df['position'] <= 3).astype(int)
+    return df
+
+
+def get_feature_columns(df):
+    """All non-metadata columns, in dataset order."""
+    return [col for col in df.columns if col not in EXCLUDE_COLS]
+
+
+def round_key(season, race_round):
+    """Single sortable integer for a (season, round) pair."""
+    return int(season) * 100 + int(race_round)
+
+
+def rounds_in_order(df):
+    """Sorted list of (season, round) pairs present in the dataset."""
+    pairs = df[['season', 'round']].drop_duplicates().sort_values(['season', 'round'])
+    return [(int(s), int(r)) for s, r in pairs.itertuples(index=False)]
+
+
+def select_rounds(df, after=None, until=None):
+    """Rows with after < (season, round) <= until; either bound may be None."""
+    keys = df['season'].astype(int) * 100 + df['round'].astype(int)
+    mask = pd.Series(True, index=df.index)
+    if after is not None:
+        mask &= keys > round_key(*after)
+    if until is not None:
+        mask &= keys <= round_key(*until)
+    return df[mask]
+
+
+def to_xy(df, feature_cols):
+    return df[feature_cols].fillna(0), df['podium']
+
+
+def new_models():
+    """Fresh, untrained CatBoost / XGBoost / LightGBM with production params."""
+    from catboost import CatBoostClassifier
+    from xgboost import XGBClassifier
+    from lightgbm import LGBMClassifier
+
+    return {
+        'CatBoost': CatBoostClassifier(
+            iterations=1000,
+            learning_rate=0.05,
+            depth=6,
+            verbose=False,
+            random_state=42
+        ),
+        'XGBoost': XGBClassifier(
+            n_estimators=1000,
+            learning_rate=0.05,
+            max_depth=6,
+            random_state=42,
+            eval_metric='logloss'
+        ),
+        'LightGBM': LGBMClassifier(
+            n_estimators=1000,
+            learning_rate=0.05,
+            max_depth=6,
+            random_state=42,
+            verbose=-1
+        ),
+    }
+
+
+def load_models(files=MODEL_FILES):
+    models = {}
+    for name, path in files.items():
+        with open(path, 'rb') as f:
+            models[name] = pickle.load(f)
+    return models
+
+
+def save_models(models, files=MODEL_FILES):
+    """Write each model and register the new file as its latest version."""
+    from model_registry import registry
+
+    for name, model in models.items():
+        Path(files[name]).parent.mkdir(parents=True, exist_ok=True)
+        with open(files[name], 'wb') as f:
+            pickle.dump(model, f)
+        registry.register(REGISTRY_NAMES[name], files[name])
+
+
+def load_training_state(path=TRAINING_STATE_PATH):
+    """
+    Watermark written after every (full or incremental) training run:
+    last (season, round) the production models have seen, feature columns
+    and holdout accuracies. Returns None if no run has recorded one yet.
+    """
+    try:
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def save_training_state(state, path=TRAINING_STATE_PATH):
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'wb') as f:
+        pickle.dump(state, f)
+
+
+def load_selected_features(path=SELECTED_FEATURES_PATH):
+    """Feature subset chosen by feature_selection.py, or None if not run."""
+    try:
+        with open(path, 'rb') as f:
+            return list(pickle.load(f))
+    except FileNotFoundError:
+        return None
+
+
+def model_features(model, default=None):
+    """Input columns a fitted model (or F1Ensemble) expects, in training order."""
+    for attr in ('features', 'feature_names_in_', 'feature_names_'):
+        cols = getattr(model, attr, None)
+        if cols is not None and len(cols):
+            return list(cols)
+    if hasattr(model, 'get_booster'):
+        cols = model.get_booster().feature_names
+        if cols:
+            return list(cols)
+    return default
+
+
+def load_latest_driver_features(path=FEATURES_PATH):
+    """Most recent engineered feature row per driver, indexed by driverId."""
+    df = pd.read_csv(path)
+    return df.sort_values(['season', 'round']).groupby('driverId').tail(1).set_index('driverId')